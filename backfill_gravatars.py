@@ -0,0 +1,39 @@
+"""Gravatar backfill job for the Contacts API.
+
+New users get a Gravatar avatar URL at registration. This job gives one to
+the users registered before that, in batches. It is safe to run more than
+once: ``python backfill_gravatars.py [batch size]``.
+"""
+
+import asyncio
+import logging
+import sys
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.services.gravatar import GravatarService
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger("backfill_gravatars")
+
+
+async def main(batch_size: int) -> None:
+    """Backfill Gravatar URLs and close the connections.
+
+    Args:
+        batch_size (int): Number of users updated per transaction
+    """
+    try:
+        updated = await GravatarService.backfill(batch_size)
+        logger.info(f"Gravatar backfill finished: {updated} users updated")
+    finally:
+        await RedisService.close()
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    batch_size = (
+        int(sys.argv[1]) if len(sys.argv) > 1 else settings.GRAVATAR_BACKFILL_BATCH_SIZE
+    )
+    asyncio.run(main(batch_size))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark for response compression.
+
+Measures compressed size and CPU time of each encoding and level offered by
+``CompressionMiddleware``, on the payloads the API typically sends:
+
+- contact list pages of 10 and 100 rows, as encoded by orjson
+- the OpenAPI schema
+- an NDJSON export of 5000 contacts, streamed in chunks of 100 rows with a
+  flush after every chunk, the way the middleware compresses streams
+
+The last column adds the compression time to the time the compressed body
+takes on a slow mobile link, to help pick ``COMPRESSION_*_LEVEL``: past a
+point, extra CPU no longer pays for the bytes it saves.
+
+Run with:
+    python benchmarks/compression.py
+"""
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import app  # noqa: E402
+from src.middleware.compression import COMPRESSORS  # noqa: E402
+
+ROUNDS = 20
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 6, 11], "zstd": [1, 3, 6, 12]}
+# Downlink of a congested 3G/4G connection, in bytes per second
+LINK_BYTES_PER_SECOND = 2_000_000 / 8
+EXPORT_CHUNK_ROWS = 100
+
+
+def make_contacts(count: int) -> list[dict]:
+    """Build a list of contact dicts resembling ``ContactResponse`` data."""
+    rnd = random.Random(42)
+    first_names = ["John", "Jane", "Oleksii", "Maria", "Petro", "Anna", "Ivan"]
+    last_names = ["Doe", "Smith", "Shevchenko", "Kovalenko", "Bondarenko"]
+    contacts = []
+    for i in range(count):
+        first = rnd.choice(first_names)
+        last = rnd.choice(last_names)
+        contacts.append(
+            {
+                "id": i + 1,
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                "phone": f"+380{rnd.randint(100000000, 999999999)}",
+                "birthday": date(1970, 1, 1) + timedelta(days=rnd.randint(0, 15000)),
+                "additional_data": rnd.choice(
+                    [None, "Met at the conference", "Colleague from the old job"]
+                ),
+            }
+        )
+    return contacts
+
+
+def make_payloads() -> list[tuple[str, list[bytes]]]:
+    """Build the benchmarked bodies, each as the chunks it is sent in."""
+    export = [orjson.dumps(row) + b"\n" for row in make_contacts(5000)]
+    return [
+        ("page 10", [orjson.dumps(make_contacts(10))]),
+        ("page 100", [orjson.dumps(make_contacts(100))]),
+        ("openapi", [orjson.dumps(app.openapi())]),
+        (
+            "ndjson 5000",
+            [
+                b"".join(export[i : i + EXPORT_CHUNK_ROWS])
+                for i in range(0, len(export), EXPORT_CHUNK_ROWS)
+            ],
+        ),
+    ]
+
+
+def compress(encoding: str, level: int, chunks: list[bytes]) -> bytes:
+    """Compress a body the way the middleware does."""
+    compressor = COMPRESSORS[encoding](level)
+    output = []
+    for chunk in chunks[:-1]:
+        output.append(compressor.compress(chunk) + compressor.flush())
+    output.append(compressor.compress(chunks[-1]) + compressor.finish())
+    return b"".join(output)
+
+
+def compress_us(encoding: str, level: int, chunks: list[bytes]) -> float:
+    """Return the average compression time of a body in microseconds."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        compress(encoding, level, chunks)
+    return (time.perf_counter() - start) / ROUNDS * 1_000_000
+
+
+def main():
+    """Print size, ratio and CPU time per payload, encoding and level."""
+    print(f"link {LINK_BYTES_PER_SECOND * 8 / 1_000_000:.0f} Mbit/s")
+    print(
+        f"{'payload':>12} {'codec':>8} {'bytes':>9} {'ratio':>6} "
+        f"{'cpu us':>9} {'MB/s':>7} {'cpu+link ms':>12}"
+    )
+    for name, chunks in make_payloads():
+        size = sum(len(chunk) for chunk in chunks)
+        link_ms = size / LINK_BYTES_PER_SECOND * 1000
+        print(
+            f"{name:>12} {'identity':>8} {size:>9} {1.0:>6.2f} "
+            f"{0.0:>9.1f} {'':>7} {link_ms:>12.1f}"
+        )
+        for encoding, levels in LEVELS.items():
+            for level in levels:
+                compressed = len(compress(encoding, level, chunks))
+                cpu_us = compress_us(encoding, level, chunks)
+                total_ms = cpu_us / 1000 + compressed / LINK_BYTES_PER_SECOND * 1000
+                print(
+                    f"{name:>12} {f'{encoding}-{level}':>8} {compressed:>9} "
+                    f"{size / compressed:>6.2f} {cpu_us:>9.1f} "
+                    f"{size / cpu_us:>7.1f} {total_ms:>12.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
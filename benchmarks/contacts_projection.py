@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Benchmark for projection-only contact list queries.
+
+Compares loading 10k contacts as ORM ``Contact`` objects (with the joined
+``User`` load) and validating them through ``ContactResponse`` with
+``from_attributes``, against selecting only the response columns as Core
+rows and building the responses from dicts. It then compares encoding
+all response columns against the lean ``fields=id,first_name,last_name,phone``
+selection that list clients use, as ``TrustedJSONResponse`` sends them.
+
+Run with:
+    python benchmarks/contacts_projection.py
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import orjson
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.models.base import Base, Contact, User
+from src.repository.contacts import CONTACT_RESPONSE_COLUMNS, CONTACT_RESPONSE_FIELDS
+from src.schemas.contact import ContactResponse
+
+ROWS = 10_000
+ROUNDS = 5
+LEAN_FIELDS = ["id", "first_name", "last_name", "phone"]
+
+
+async def seed(session_maker: async_sessionmaker) -> int:
+    """Create a user with ``ROWS`` contacts and return the user id."""
+    async with session_maker() as session:
+        user = User(username="bench", email="bench@example.com", password="x")
+        session.add(user)
+        await session.flush()
+        await session.execute(
+            insert(Contact),
+            [
+                {
+                    "first_name": f"First{i}",
+                    "last_name": f"Last{i}",
+                    "email": f"contact{i}@example.com",
+                    "phone": f"+380{i:09d}",
+                    "birthday": date(1970, 1, 1) + timedelta(days=i % 15000),
+                    "additional_data": "Met at the conference" if i % 3 else None,
+                    "user_id": user.id,
+                }
+                for i in range(ROWS)
+            ],
+        )
+        await session.commit()
+        return user.id
+
+
+async def orm_path(session_maker: async_sessionmaker, user_id: int) -> list:
+    """Load ORM objects and validate them with ``from_attributes``."""
+    async with session_maker() as session:
+        result = await session.execute(
+            select(Contact).where(Contact.user_id == user_id)
+        )
+        return [ContactResponse.model_validate(c) for c in result.scalars().all()]
+
+
+async def projection_path(session_maker: async_sessionmaker, user_id: int) -> list:
+    """Select the response columns and validate the resulting dicts."""
+    async with session_maker() as session:
+        result = await session.execute(
+            select(*CONTACT_RESPONSE_COLUMNS).where(Contact.user_id == user_id)
+        )
+        return [ContactResponse.model_validate(dict(row)) for row in result.mappings()]
+
+
+async def encoded_rows(
+    session_maker: async_sessionmaker, user_id: int, columns
+) -> list:
+    """Select ``columns`` and encode the rows the way the list route does."""
+    async with session_maker() as session:
+        result = await session.execute(
+            select(*columns).where(Contact.user_id == user_id)
+        )
+        rows = [dict(row) for row in result.mappings()]
+        orjson.dumps(rows)
+        return rows
+
+
+async def all_fields_path(session_maker: async_sessionmaker, user_id: int) -> list:
+    """Select and encode every response column."""
+    return await encoded_rows(session_maker, user_id, CONTACT_RESPONSE_COLUMNS)
+
+
+async def lean_fields_path(session_maker: async_sessionmaker, user_id: int) -> list:
+    """Select and encode only the ``LEAN_FIELDS`` columns."""
+    columns = [CONTACT_RESPONSE_FIELDS[field] for field in LEAN_FIELDS]
+    return await encoded_rows(session_maker, user_id, columns)
+
+
+async def measure(fn, session_maker: async_sessionmaker, user_id: int) -> float:
+    """Return the best rows/sec of ``fn`` over ``ROUNDS`` runs."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        rows = await fn(session_maker, user_id)
+        best = min(best, time.perf_counter() - start)
+        assert len(rows) == ROWS
+    return ROWS / best
+
+
+async def main():
+    """Seed a temporary SQLite database and print rows/sec for both paths."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        user_id = await seed(session_maker)
+
+        orm = await measure(orm_path, session_maker, user_id)
+        projection = await measure(projection_path, session_maker, user_id)
+        print(f"{'path':>12} {'rows/sec':>12}")
+        print(f"{'orm':>12} {orm:>12.0f}")
+        print(f"{'projection':>12} {projection:>12.0f}")
+        print(f"speedup: {projection / orm:.2f}x")
+
+        print(f"{'fields':>12} {'rows/sec':>12} {'bytes/row':>10}")
+        for name, path in (("all", all_fields_path), ("lean", lean_fields_path)):
+            rate = await measure(path, session_maker, user_id)
+            size = len(orjson.dumps(await path(session_maker, user_id)))
+            print(f"{name:>12} {rate:>12.0f} {size / ROWS:>10.1f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark for email template rendering.
+
+Measures the cost per message of building emails from the cached, compiled
+templates in ``EmailTemplates``, against compiling the template sources for
+every message. Two paths are measured: the birthday digest (a loop over the
+user's contacts) and a bulk send of single-link emails, e.g. inviting or
+re-verifying many users at once.
+
+Run with:
+    python benchmarks/email_templates.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.email import EmailService  # noqa: E402
+from src.services.email_templates import (  # noqa: E402
+    TEMPLATES_DIR,
+    EmailTemplates,
+    format_birthday,
+)
+
+ROUNDS = 2000
+DIGEST_CONTACTS = [5, 50]
+
+
+def make_contacts(count: int) -> list[dict]:
+    """Build digest entries like those produced by the birthday digest job."""
+    return [
+        {
+            "first_name": f"John{i}",
+            "last_name": "Doe",
+            "birthday": f"1990-12-{i % 28 + 1:02d}",
+        }
+        for i in range(count)
+    ]
+
+
+def render_uncached(name: str, **context) -> tuple[str, str]:
+    """Render a template pair with a fresh environment, compiling each time."""
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(["html"]),
+        cache_size=0,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    environment.globals.update(base_url="http://localhost:8000", app_name="Bench")
+    environment.filters["birthday"] = format_birthday
+    return (
+        environment.get_template(f"{name}.txt").render(context),
+        environment.get_template(f"{name}.html").render(context),
+    )
+
+
+def per_message_us(fn, *args, rounds: int = ROUNDS, **kwargs) -> float:
+    """Return the average run time of ``fn`` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(*args, **kwargs)
+    return (time.perf_counter() - start) / rounds * 1_000_000
+
+
+def main():
+    """Print render cost per message for each path."""
+    start = time.perf_counter()
+    count = EmailTemplates.preload()
+    print(
+        f"compiled {count} templates in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+    print(f"{'path':>24} {'cached us':>10} {'uncached us':>12} {'+MIME us':>9}")
+
+    for size in DIGEST_CONTACTS:
+        contacts = make_contacts(size)
+        context = {"username": "test_user", "contacts": contacts}
+        cached = per_message_us(EmailTemplates.render, "birthday_digest", **context)
+        uncached = per_message_us(
+            render_uncached, "birthday_digest", rounds=ROUNDS // 20, **context
+        )
+        full = per_message_us(
+            EmailService.render_message,
+            "user@example.com",
+            "Upcoming birthdays",
+            "birthday_digest",
+            **context,
+        )
+        print(
+            f"{f'digest ({size} contacts)':>24} {cached:>10.1f} {uncached:>12.1f} "
+            f"{full:>9.1f}"
+        )
+
+    context = {"username": "test_user", "token": "0" * 32}
+    cached = per_message_us(EmailTemplates.render, "verification", **context)
+    uncached = per_message_us(
+        render_uncached, "verification", rounds=ROUNDS // 20, **context
+    )
+    full = per_message_us(
+        EmailService.render_message,
+        "user@example.com",
+        "Verify your email",
+        "verification",
+        **context,
+    )
+    print(f"{'bulk link email':>24} {cached:>10.1f} {uncached:>12.1f} {full:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark for avatar thumbnail processing.
+
+Measures how many avatars per second ``make_thumbnails`` turns into the
+configured WebP thumbnails, for typical phone-camera JPEGs and screenshot
+PNGs. Each source is processed in a single process first (the throughput of
+one core), then through process pools of increasing size to show how the
+throughput scales with workers.
+
+Run with:
+    python benchmarks/image_processing.py
+"""
+
+import io
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.conf.config import settings  # noqa: E402
+from src.services.image_processing import (  # noqa: E402
+    THUMBNAIL_SIZES,
+    make_thumbnails,
+)
+
+ROUNDS = 40
+SOURCES = [
+    ("jpeg 4032x3024", "JPEG", (4032, 3024)),
+    ("jpeg 1280x960", "JPEG", (1280, 960)),
+    ("png 1170x2532", "PNG", (1170, 2532)),
+]
+
+
+def make_source(format: str, size: tuple[int, int]) -> bytes:
+    """Build an image with enough detail to not compress trivially."""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(0, size[0], 16):
+        draw.line([(i, 0), (size[0] - i, size[1])], fill=(i % 256, 80, 160), width=3)
+    output = io.BytesIO()
+    image.save(output, format, quality=90)
+    return output.getvalue()
+
+
+def process(data: bytes) -> dict[int, bytes]:
+    """Build the thumbnails of an image with the configured settings."""
+    return make_thumbnails(
+        data,
+        THUMBNAIL_SIZES,
+        settings.AVATAR_WEBP_QUALITY,
+        settings.AVATAR_MAX_PIXELS,
+    )
+
+
+def single_process_rate(data: bytes) -> float:
+    """Return the images per second processed in this process."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        process(data)
+    return ROUNDS / (time.perf_counter() - start)
+
+
+def pool_rate(data: bytes, workers: int) -> float:
+    """Return the images per second processed by a pool of ``workers``."""
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        # Start the workers before timing
+        list(executor.map(process, [data] * workers))
+        start = time.perf_counter()
+        list(executor.map(process, [data] * ROUNDS))
+        return ROUNDS / (time.perf_counter() - start)
+
+
+def main():
+    """Print thumbnail throughput per source image and pool size."""
+    cores = os.cpu_count() or 1
+    pool_sizes = sorted({1, max(cores // 2, 1), cores})
+    print(f"thumbnails {THUMBNAIL_SIZES} px, {cores} cores")
+    header = f"{'source':>16} {'KB':>6} {'1 proc/s':>9}"
+    for workers in pool_sizes:
+        header += f" {f'pool {workers}/s':>10} {'per core':>9}"
+    print(header)
+
+    for name, format, size in SOURCES:
+        data = make_source(format, size)
+        line = f"{name:>16} {len(data) // 1024:>6} {single_process_rate(data):>9.1f}"
+        for workers in pool_sizes:
+            rate = pool_rate(data, workers)
+            line += f" {rate:>10.1f} {rate / min(workers, cores):>9.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
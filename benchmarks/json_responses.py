@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark for contact list response serialization.
+
+Measures the time to turn one page of contact rows, as returned by
+``ContactsRepository.get_contacts``, into response bytes along three paths:
+
+- ``default``: FastAPI's path for a route with ``response_model``: validate
+  the rows into ``ContactResponse`` models, serialize them back to JSON-able
+  data and encode with ``JSONResponse`` (the stdlib ``json`` module)
+- ``orjson``: the same validation, encoded with ``ORJSONResponse``, the
+  application's default response class
+- ``trusted``: ``TrustedJSONResponse``, which encodes the rows with orjson
+  without validating them
+
+Run with:
+    python benchmarks/json_responses.py
+"""
+
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.routes.responses import TrustedJSONResponse  # noqa: E402
+from src.schemas.contact import ContactResponse  # noqa: E402
+
+PAGE_SIZES = [10, 100]
+ROUNDS = 2000
+
+FIELD = create_model_field("response", List[ContactResponse], mode="serialization")
+
+
+def make_page(size: int) -> list[dict]:
+    """Build rows shaped like the contact list query results."""
+    return [
+        {
+            "id": i,
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "email": f"contact{i}@example.com",
+            "phone": f"+380{i:09d}",
+            "birthday": date(1970, 1, 1) + timedelta(days=i * 37),
+            "additional_data": "Met at the conference, likes hiking" if i % 3 else None,
+        }
+        for i in range(size)
+    ]
+
+
+async def validated(rows: list[dict], response_class) -> bytes:
+    """Serialize rows the way FastAPI does for a ``response_model`` route."""
+    content = await serialize_response(field=FIELD, response_content=rows)
+    return response_class(content).body
+
+
+async def trusted(rows: list[dict]) -> bytes:
+    """Serialize rows with ``TrustedJSONResponse``."""
+    return TrustedJSONResponse(rows).body
+
+
+async def per_page_us(fn, *args) -> float:
+    """Return the average run time of ``fn`` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await fn(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1_000_000
+
+
+async def main():
+    """Print serialization time per page for each path."""
+    print(
+        f"{'page':>6} {'default us':>11} {'orjson us':>10} {'trusted us':>11} {'speedup':>8}"
+    )
+    for size in PAGE_SIZES:
+        rows = make_page(size)
+        default = await per_page_us(validated, rows, JSONResponse)
+        orjson = await per_page_us(validated, rows, ORJSONResponse)
+        fast = await per_page_us(trusted, rows)
+        print(
+            f"{size:>6} {default:>11.1f} {orjson:>10.1f} {fast:>11.1f} "
+            f"{default / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark for compression of cached Redis values.
+
+Measures serialized size and encode/decode time of a realistic contact list
+payload with and without zstd compression, to help pick
+``REDIS_COMPRESSION_THRESHOLD`` and ``REDIS_COMPRESSION_LEVEL``.
+
+Run with:
+    python benchmarks/redis_compression.py
+"""
+
+import pickle
+import random
+import time
+from datetime import date, timedelta
+
+import zstandard
+
+ROUNDS = 50
+SIZES = [10, 100, 1000, 5000]
+LEVELS = [1, 3, 6, 9]
+
+
+def make_contacts(count: int) -> list[dict]:
+    """Build a list of contact dicts resembling ``ContactResponse`` data."""
+    rnd = random.Random(42)
+    first_names = ["John", "Jane", "Oleksii", "Maria", "Petro", "Anna", "Ivan"]
+    last_names = ["Doe", "Smith", "Shevchenko", "Kovalenko", "Bondarenko"]
+    contacts = []
+    for i in range(count):
+        first = rnd.choice(first_names)
+        last = rnd.choice(last_names)
+        contacts.append(
+            {
+                "id": i + 1,
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                "phone": f"+380{rnd.randint(100000000, 999999999)}",
+                "birthday": date(1970, 1, 1) + timedelta(days=rnd.randint(0, 15000)),
+                "additional_data": rnd.choice(
+                    [None, "Met at the conference", "Colleague from the old job"]
+                ),
+            }
+        )
+    return contacts
+
+
+def timeit(fn, *args) -> float:
+    """Return the average run time of ``fn(*args)`` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1_000_000
+
+
+def main():
+    """Print a size/CPU table for each payload size and compression level."""
+    print(
+        f"{'contacts':>8} {'codec':>8} {'bytes':>10} {'ratio':>6} "
+        f"{'encode us':>10} {'decode us':>10}"
+    )
+    for size in SIZES:
+        payload = make_contacts(size)
+        raw = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        print(
+            f"{size:>8} {'raw':>8} {len(raw):>10} {1.0:>6.2f} "
+            f"{timeit(pickle.dumps, payload, pickle.HIGHEST_PROTOCOL):>10.1f} "
+            f"{timeit(pickle.loads, raw):>10.1f}"
+        )
+        for level in LEVELS:
+            compressor = zstandard.ZstdCompressor(level=level)
+            decompressor = zstandard.ZstdDecompressor()
+            compressed = compressor.compress(raw)
+
+            def encode():
+                compressor.compress(
+                    pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+                )
+
+            def decode():
+                pickle.loads(decompressor.decompress(compressed))
+
+            print(
+                f"{size:>8} {f'zstd-{level}':>8} {len(compressed):>10} "
+                f"{len(raw) / len(compressed):>6.2f} "
+                f"{timeit(encode):>10.1f} {timeit(decode):>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark for SMTP connection pooling.
+
+Sends the same batch of messages to a local aiosmtpd server twice: once
+opening a new SMTP session per message, as ``fastapi-mail`` did, and once
+through ``SMTPConnectionPool``. A local server has no TLS handshake or AUTH
+round trips, so real-world gains against a remote SSL server are larger.
+
+Run with:
+    python benchmarks/smtp_pool.py
+"""
+
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.conf.config import settings  # noqa: E402
+from src.services.email import EmailService  # noqa: E402
+from src.services.smtp_pool import SMTPConnectionPool  # noqa: E402
+
+MESSAGES = [100, 500]
+POOL_SIZES = [1, 4]
+
+
+def free_port() -> int:
+    """Return a free TCP port on the loopback interface."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_messages(count: int) -> list:
+    """Build ``count`` verification-sized messages."""
+    # MAIL_FROM may be unset where the benchmark runs
+    settings.MAIL_FROM = settings.MAIL_FROM or "noreply@example.com"
+    messages = []
+    for i in range(count):
+        message = EmailService.render_message(
+            f"user{i}@example.com",
+            "Verify your email",
+            "verification",
+            username=f"user{i}",
+            token=f"{i:032x}",
+        )
+        messages.append(message)
+    return messages
+
+
+async def send_unpooled(port: int, messages: list) -> None:
+    """Send each message over its own SMTP session, concurrently."""
+    await asyncio.gather(
+        *(
+            aiosmtplib.send(message, hostname="127.0.0.1", port=port)
+            for message in messages
+        )
+    )
+
+
+async def send_pooled(port: int, messages: list, size: int) -> int:
+    """Send the messages concurrently through a pool of ``size`` sessions."""
+    pool = SMTPConnectionPool("127.0.0.1", port, use_tls=False, size=size)
+    await asyncio.gather(*(pool.send(message) for message in messages))
+    await pool.close()
+    return pool.connections_opened
+
+
+async def main():
+    """Print messages per second for unpooled and pooled sending."""
+    port = free_port()
+    controller = Controller(Sink(), hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        print(f"{'messages':>8} {'mode':>12} {'sessions':>8} {'msg/s':>10}")
+        for count in MESSAGES:
+            messages = make_messages(count)
+
+            start = time.perf_counter()
+            await send_unpooled(port, messages)
+            elapsed = time.perf_counter() - start
+            print(f"{count:>8} {'unpooled':>12} {count:>8} {count / elapsed:>10.0f}")
+
+            for size in POOL_SIZES:
+                start = time.perf_counter()
+                sessions = await send_pooled(port, messages, size)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{count:>8} {f'pool({size})':>12} {sessions:>8} "
+                    f"{count / elapsed:>10.0f}"
+                )
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""Email delivery worker for the Contacts API.
+
+This module runs the background worker that sends the emails queued by the
+API. Run it next to the API server with ``python email_worker.py``.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from src.conf.config import settings
+from src.services.email import EmailService
+from src.services.email_queue import EmailQueue
+from src.services.email_templates import EmailTemplates
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger("email_worker")
+
+
+async def run_worker(stop: asyncio.Event) -> None:
+    """Deliver queued emails until ``stop`` is set.
+
+    Before taking its first job, the worker requeues the jobs left behind by
+    workers that stopped mid-send.
+
+    Args:
+        stop (asyncio.Event): Event that ends the loop after the current job
+    """
+    email_service = EmailService()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    recovered = False
+    while not stop.is_set():
+        try:
+            if not recovered:
+                requeued = await EmailQueue.requeue_abandoned()
+                if requeued:
+                    logger.warning(f"Requeued {requeued} abandoned email jobs")
+                recovered = True
+            await EmailQueue.heartbeat(worker_id)
+            await EmailQueue.promote_due_retries()
+            payloads = await EmailQueue.dequeue(
+                worker_id,
+                timeout=settings.EMAIL_WORKER_POLL_SECONDS,
+                max_jobs=settings.EMAIL_WORKER_BATCH_SIZE,
+            )
+        except Exception as e:
+            logger.error(f"Email queue is unavailable: {e}")
+            await asyncio.sleep(settings.EMAIL_WORKER_POLL_SECONDS)
+            continue
+        # The SMTP pool bounds how many of these are sent concurrently
+        results = await asyncio.gather(
+            *(
+                EmailQueue.process(payload, worker_id, email_service)
+                for payload in payloads
+            ),
+            return_exceptions=True,
+        )
+        for payload, result in zip(payloads, results):
+            if isinstance(result, Exception):
+                logger.error(f"Email job {payload!r} crashed: {result!r}")
+    try:
+        await EmailQueue.stop_heartbeat(worker_id)
+    except Exception as e:
+        logger.error(f"Could not deregister email worker {worker_id}: {e}")
+
+
+async def main() -> None:
+    """Run the worker until SIGINT or SIGTERM is received."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    templates = EmailTemplates.preload()
+    logger.info(f"Email worker started with {templates} compiled templates")
+    try:
+        await run_worker(stop)
+    finally:
+        await EmailService.close()
+        await RedisService.close()
+    logger.info("Email worker stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -4,23 +4,33 @@ This module initializes the FastAPI application and sets up all necessary routes
 middleware, and configurations.
 """
 
+import asyncio
+
 from fastapi import FastAPI, Depends, HTTPException, status, Request, File, UploadFile
 from fastapi.concurrency import asynccontextmanager
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from slowapi.errors import RateLimitExceeded
 
-from src.routes import auth, contacts, users
-from src.database.db import get_db
+from src.routes import auth, avatars, contacts, users, metrics
+from src.database.db import get_db, sessionmanager
+from src.database.instrumentation import track_queries
+from src.middleware.compression import CompressionMiddleware
+from src.services.cloud_image import CloudImage
+from src.services.image_processing import ImageProcessor
 from src.services.redis_service import RedisService
+from src.services.scheduler import create_scheduler
+from src.services.warmup import WarmupService
+from src.conf.config import settings
 
 
 app = FastAPI(
     title="Contacts API",
     description="A FastAPI application for managing contacts with user authentication",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -31,9 +41,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Total-Count-Estimated"],
 )
 
 
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    """Count the SQL statements each request runs.
+
+    Args:
+        request (Request): The incoming request
+        call_next: Next handler in the middleware chain
+
+    Returns:
+        Response: The response, with the query count in ``X-DB-Query-Count``
+            if ``SQL_QUERY_COUNT_HEADER`` is set
+    """
+    with track_queries(f"{request.method} {request.url.path}") as stats:
+        response = await call_next(request)
+    if settings.SQL_QUERY_COUNT_HEADER:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+    return response
+
+
+# Added last so it is the outermost middleware and compresses every response
+app.add_middleware(CompressionMiddleware)
+
+
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     """Handle rate limit exceeded exceptions.
@@ -55,6 +89,8 @@ api_prefix = "/api"
 app.include_router(contacts.router, prefix=api_prefix)
 app.include_router(auth.router, prefix=api_prefix)
 app.include_router(users.router, prefix=api_prefix)
+app.include_router(metrics.router, prefix=api_prefix)
+app.include_router(avatars.router, prefix=api_prefix)
 
 
 @app.get("/")
@@ -110,16 +146,68 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
         )
 
 
+@app.get(f"{api_prefix}/readiness")
+async def readiness(db: AsyncSession = Depends(get_db)):
+    """Readiness endpoint checking that the database and Redis answer.
+
+    Requests are only served once the startup warm-up has finished, so the
+    probe checks the dependencies instead. Each check may take at most
+    ``HEALTH_CHECK_TIMEOUT`` seconds, so a hung dependency fails the probe
+    rather than stalling it.
+
+    Args:
+        db (AsyncSession): Database session dependency
+
+    Returns:
+        dict: Ready status message
+
+    Raises:
+        HTTPException: If the database or Redis is unavailable
+    """
+    checks = {
+        "database": lambda: db.execute(text("SELECT 1")),
+        "redis": RedisService.ping,
+    }
+    unavailable = []
+    for name, check in checks.items():
+        try:
+            await asyncio.wait_for(check(), settings.HEALTH_CHECK_TIMEOUT)
+        except Exception as e:
+            print(f"Readiness check of {name} failed: {e!r}")
+            unavailable.append(name)
+    if unavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Unavailable: {', '.join(unavailable)}",
+        )
+    return {"status": "ready"}
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events."""
-    # Startup: Redis connection is created on demand
+    # Startup: Warm up database and Redis connections, statements and OpenAPI
+    if settings.WARMUP_ENABLED:
+        await WarmupService.run(app)
+    # Startup: Schedule background jobs
+    scheduler = create_scheduler()
+    scheduler.start()
     yield
+    # Shutdown: Stop the scheduler without waiting for running jobs
+    scheduler.shutdown(wait=False)
+    # Shutdown: Stop the Cloudinary upload threads and image workers
+    CloudImage.shutdown()
+    ImageProcessor.shutdown()
     # Shutdown: Close Redis connection
     try:
         await RedisService.close()
     except Exception as e:
         print(f"Error closing Redis connection: {e}")
+    # Shutdown: Dispose database engine and its pooled connections
+    try:
+        await sessionmanager.close()
+    except Exception as e:
+        print(f"Error disposing database engine: {e}")
 
 
 app.router.lifespan_context = lifespan
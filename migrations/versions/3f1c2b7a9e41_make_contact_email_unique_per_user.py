@@ -0,0 +1,30 @@
+"""make contact email unique per user
+
+Revision ID: 3f1c2b7a9e41
+Revises: d6fadee5969d
+Create Date: 2026-10-19 10:12:31.502214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2b7a9e41'
+down_revision: Union[str, None] = 'd6fadee5969d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contacts_user_id_email', 'contacts', ['user_id', 'email'], unique=True)
+    op.drop_index(op.f('ix_contacts_email'), table_name='contacts')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_contacts_email'), 'contacts', ['email'], unique=True)
+    op.drop_index('ix_contacts_user_id_email', table_name='contacts')
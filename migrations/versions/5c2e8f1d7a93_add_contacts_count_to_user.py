@@ -0,0 +1,57 @@
+"""add contacts count to user
+
+Revision ID: 5c2e8f1d7a93
+Revises: 8b5e0d4c2f17
+Create Date: 2026-10-19 16:41:07.284519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8f1d7a93'
+down_revision: Union[str, None] = '8b5e0d4c2f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('contacts_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_contacts_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE users SET contacts_count = contacts_count + 1
+                WHERE id = NEW.user_id;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE users SET contacts_count = contacts_count - 1
+                WHERE id = OLD.user_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # Lock contacts so no write slips in between the backfill and the trigger
+    op.execute("LOCK TABLE contacts IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+        CREATE TRIGGER contacts_count
+        AFTER INSERT OR DELETE OR UPDATE OF user_id ON contacts
+        FOR EACH ROW EXECUTE FUNCTION update_contacts_count()
+    """)
+    op.execute("""
+        UPDATE users SET contacts_count = (
+            SELECT count(*) FROM contacts WHERE contacts.user_id = users.id
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER contacts_count ON contacts")
+    op.execute("DROP FUNCTION update_contacts_count()")
+    op.drop_column('users', 'contacts_count')
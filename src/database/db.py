@@ -4,15 +4,105 @@ This module provides functionality for managing database sessions and connection
 """
 
 import contextlib
+import itertools
+import logging
+import math
+import time
 
+from fastapi import Request
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from src.conf.config import settings
 from src.database.config import config
+from src.database.instrumentation import instrument_engine
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger("uvicorn.error")
+
+# Redis key marking a user whose reads go to the primary
+PIN_KEY = "db:pinned:{user_id}"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool that records how long checkouts wait for a connection.
+
+    Attributes:
+        checkouts (int): Number of successful checkouts
+        wait_time_total (float): Total time spent waiting for connections, in seconds
+        wait_time_max (float): Longest single wait for a connection, in seconds
+        timeouts (int): Number of checkouts that gave up after ``pool_timeout``
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - start
+        self.checkouts += 1
+        self.wait_time_total += elapsed
+        self.wait_time_max = max(self.wait_time_max, elapsed)
+        return connection
+
+
+class TrackedSession(Session):
+    """Session that records whether it has acquired a database connection.
+
+    Sessions check out a pooled connection lazily, on their first query.
+    ``session.info["connection_used"]`` is set once that happens.
+    """
+
+
+@event.listens_for(TrackedSession, "after_begin")
+def _mark_connection_used(session, transaction, connection):
+    session.info["connection_used"] = True
+
+
+def _engine_options(url: str) -> dict:
+    """Build ``create_async_engine`` keyword arguments from the settings.
+
+    Pool sizing only applies to server databases; SQLite keeps the
+    SQLAlchemy defaults.
+
+    Args:
+        url (str): Database connection URL
+
+    Returns:
+        dict: Keyword arguments for ``create_async_engine``
+    """
+    db_url = make_url(url)
+    if db_url.get_backend_name() == "sqlite":
+        return {}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if db_url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"command_timeout": settings.DB_COMMAND_TIMEOUT}
+    return options
 
 
 class DatabaseSessionManager:
@@ -20,18 +110,86 @@ class DatabaseSessionManager:
 
     This class provides functionality for creating and managing database sessions.
     It ensures proper handling of session lifecycle and error handling.
+
+    Besides the primary engine it can hold any number of read replica engines.
+    Read sessions are balanced across replicas, except for users who wrote
+    recently: they are pinned to the primary so they always see their own
+    writes. Pins are kept in Redis, so they hold across worker processes.
+    Every engine is instrumented to time its SQL statements.
     """
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        replica_urls: list[str] | None = None,
+        replica_strategy: str = "round_robin",
+        read_your_writes_seconds: float = 5,
+    ):
         """Initialize the database session manager.
 
         Args:
-            url (str): Database connection URL
+            url (str): Primary database connection URL
+            replica_urls (list[str] | None): Read replica connection URLs
+            replica_strategy (str): ``round_robin`` or ``least_connections``
+            read_your_writes_seconds (float): How long a user stays pinned to
+                the primary after a write
         """
-        self._engine: AsyncEngine | None = create_async_engine(url)
+        if replica_strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica strategy: {replica_strategy}")
+
+        self._engine: AsyncEngine | None = create_async_engine(
+            url, **_engine_options(url)
+        )
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            bind=self._engine,
+            sync_session_class=TrackedSession,
         )
+        self._replica_engines: list[AsyncEngine] = [
+            create_async_engine(replica_url, **_engine_options(replica_url))
+            for replica_url in replica_urls or []
+        ]
+        self._replica_session_makers: list[async_sessionmaker] = [
+            async_sessionmaker(
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+                bind=engine,
+                sync_session_class=TrackedSession,
+            )
+            for engine in self._replica_engines
+        ]
+        for engine in [self._engine, *self._replica_engines]:
+            instrument_engine(engine)
+        self._replica_strategy = replica_strategy
+        self._replica_cycle = itertools.cycle(range(len(self._replica_engines)))
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._requests_total = 0
+        self._requests_without_db = 0
+
+    @contextlib.asynccontextmanager
+    async def _managed_session(self, session_maker: async_sessionmaker):
+        """Yield a session from ``session_maker`` and clean it up afterwards.
+
+        Args:
+            session_maker (async_sessionmaker): Session factory to use
+
+        Yields:
+            AsyncSession: Database session
+
+        Raises:
+            SQLAlchemyError: If a database error occurs
+        """
+        session = session_maker()
+        try:
+            yield session
+        except SQLAlchemyError as e:
+            await session.rollback()
+            raise  # Re-raise the original error
+        finally:
+            await session.close()
 
     @contextlib.asynccontextmanager
     async def session(self):
@@ -49,28 +207,260 @@ class DatabaseSessionManager:
         """
         if self._session_maker is None:
             raise Exception("Database session is not initialized")
-        session = self._session_maker()
-        try:
+        async with self._managed_session(self._session_maker) as session:
             yield session
-        except SQLAlchemyError as e:
-            await session.rollback()
-            raise  # Re-raise the original error
-        finally:
-            await session.close()
 
+    @contextlib.asynccontextmanager
+    async def read_session(self, user_id: int | None = None):
+        """Create a new database session for read-only work.
 
-sessionmanager = DatabaseSessionManager(config.DB_URL)
+        The session is bound to a read replica, or to the primary if no
+        replicas are configured or the user has written recently.
 
+        Args:
+            user_id (int | None): ID of the user the reads are made for
 
-async def get_db():
+        Yields:
+            AsyncSession: Database session
+
+        Raises:
+            Exception: If database session is not initialized
+            SQLAlchemyError: If a database error occurs
+        """
+        if not self._replica_session_makers or await self.is_pinned(user_id):
+            async with self.session() as session:
+                yield session
+            return
+
+        session_maker = self._replica_session_makers[self._pick_replica()]
+        async with self._managed_session(session_maker) as session:
+            yield session
+
+    @property
+    def replica_count(self) -> int:
+        """int: Number of configured read replicas."""
+        return len(self._replica_engines)
+
+    async def prewarm(self, connections: int) -> int:
+        """Open pooled connections ahead of the first requests.
+
+        The connections are held open together, so the pool keeps that many
+        distinct connections once they are released. The number is capped at
+        each pool's size so no overflow connections are created.
+
+        Args:
+            connections (int): Number of connections to open per engine
+
+        Returns:
+            int: Total number of connections opened
+        """
+        opened = 0
+        for engine in [self._engine, *self._replica_engines]:
+            if engine is None:
+                continue
+            count = connections
+            if isinstance(engine.pool, AsyncAdaptedQueuePool):
+                count = min(count, engine.pool.size())
+            async with contextlib.AsyncExitStack() as stack:
+                for _ in range(count):
+                    conn = await stack.enter_async_context(engine.connect())
+                    await conn.execute(text("SELECT 1"))
+                    opened += 1
+        return opened
+
+    def _pick_replica(self) -> int:
+        """Choose the replica that should serve the next read session.
+
+        Returns:
+            int: Index of the chosen replica
+        """
+        if self._replica_strategy == "least_connections":
+            return min(
+                range(len(self._replica_engines)),
+                key=lambda i: getattr(
+                    self._replica_engines[i].pool, "checkedout", lambda: 0
+                )(),
+            )
+        return next(self._replica_cycle)
+
+    async def pin_to_primary(self, user_id: int) -> None:
+        """Route a user's reads to the primary for the read-your-writes window.
+
+        The pin is a Redis key that expires with the window, so every worker
+        process sees it.
+
+        Args:
+            user_id (int): ID of the user who has just written
+        """
+        if not self._replica_engines or self._read_your_writes_seconds <= 0:
+            return
+        pinned = await RedisService.set(
+            PIN_KEY.format(user_id=user_id),
+            True,
+            ttl=math.ceil(self._read_your_writes_seconds),
+        )
+        if not pinned:
+            logger.warning(f"Could not pin user {user_id} to the primary")
+
+    async def is_pinned(self, user_id: int | None) -> bool:
+        """Check whether a user's reads must go to the primary.
+
+        Args:
+            user_id (int | None): ID of the user
+
+        Returns:
+            bool: True if the user wrote within the read-your-writes window,
+                or if Redis cannot tell
+        """
+        if user_id is None:
+            return False
+        try:
+            return bool(await RedisService.get(PIN_KEY.format(user_id=user_id)))
+        except Exception as e:
+            # Reading from the primary is always consistent
+            logger.warning(f"Could not check the primary pin of user {user_id}: {e}")
+            return True
+
+    @staticmethod
+    def _engine_pool_status(engine: AsyncEngine) -> dict:
+        """Get connection pool statistics for a single engine.
+
+        Args:
+            engine (AsyncEngine): Engine whose pool to inspect
+
+        Returns:
+            dict: Pool size, checked-out and overflow connections and
+            checkout wait times
+        """
+        pool = engine.pool
+        status = {"pool_class": type(pool).__name__}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            status.update(
+                {
+                    "size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                }
+            )
+        if isinstance(pool, InstrumentedQueuePool):
+            status.update(
+                {
+                    "checkouts": pool.checkouts,
+                    "timeouts": pool.timeouts,
+                    "wait_time_avg_ms": (
+                        pool.wait_time_total / pool.checkouts * 1000
+                        if pool.checkouts
+                        else 0.0
+                    ),
+                    "wait_time_max_ms": pool.wait_time_max * 1000,
+                }
+            )
+        return status
+
+    def pool_status(self) -> dict:
+        """Get connection pool statistics.
+
+        Returns:
+            dict: Statistics of the primary pool, with the statistics of each
+            replica pool under ``replicas``
+        """
+        if self._engine is None:
+            return {}
+        status = self._engine_pool_status(self._engine)
+        status["replicas"] = [
+            self._engine_pool_status(engine) for engine in self._replica_engines
+        ]
+        return status
+
+    def record_request(self, used_db: bool) -> None:
+        """Record whether a finished request used a database connection.
+
+        Args:
+            used_db (bool): True if any of the request's sessions ran a query
+        """
+        self._requests_total += 1
+        if not used_db:
+            self._requests_without_db += 1
+
+    def session_stats(self) -> dict:
+        """Get request-level session usage statistics.
+
+        Returns:
+            dict: Number of requests that got a session and how many of them
+            finished without acquiring a database connection
+        """
+        return {
+            "requests": self._requests_total,
+            "requests_without_db": self._requests_without_db,
+        }
+
+    async def close(self):
+        """Dispose of the engines and close all pooled connections."""
+        for engine in [self._engine, *self._replica_engines]:
+            if engine is not None:
+                await engine.dispose()
+
+
+sessionmanager = DatabaseSessionManager(
+    config.DB_URL,
+    replica_urls=config.DB_REPLICA_URLS,
+    replica_strategy=settings.DB_REPLICA_STRATEGY,
+    read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+async def get_db(request: Request):
     """Get a database session.
 
     This is a dependency that can be used in FastAPI endpoints
-    to get a database session.
+    to get a database session. The session checks out a pooled connection
+    only on its first query, so requests answered from cache or rejected
+    before touching the database never hold a connection. Whether the
+    request used the database is recorded in the session manager stats.
+
+    After a non-GET request of an authenticated user, that user's reads are
+    pinned to the primary for a short while.
+
+    Args:
+        request (Request): FastAPI request object
 
     Yields:
         AsyncSession: Database session
     """
     async with sessionmanager.session() as session:
-        yield session
+        try:
+            yield session
+        finally:
+            # get_read_db is resolved after get_db, so it has already finished
+            sessionmanager.record_request(
+                session.info.get("connection_used", False)
+                or getattr(request.state, "read_db_used", False)
+            )
+    user = getattr(request.state, "current_user", None)
+    if user is not None and request.method not in SAFE_METHODS:
+        await sessionmanager.pin_to_primary(user.id)
+
+
+async def get_read_db(request: Request):
+    """Get a database session for read-only endpoints.
+
+    The session goes to a read replica unless the authenticated user has
+    written recently. The user is taken from ``request.state.current_user``,
+    so the route must resolve ``AuthService.get_current_user`` first, for
+    example as a router dependency.
 
+    Args:
+        request (Request): FastAPI request object
+
+    Yields:
+        AsyncSession: Database session
+    """
+    user = getattr(request.state, "current_user", None)
+    async with sessionmanager.read_session(user.id if user else None) as session:
+        try:
+            yield session
+        finally:
+            request.state.read_db_used = session.info.get("connection_used", False)
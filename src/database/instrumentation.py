@@ -0,0 +1,264 @@
+"""SQL statement instrumentation.
+
+This module hooks SQLAlchemy cursor events to time every statement. Queries
+are counted per request through a context variable, statements slower than
+``SQL_SLOW_QUERY_MS`` go to a slow-query log and statements repeated many
+times within one request are reported as likely N+1 patterns.
+"""
+
+import contextlib
+import functools
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.conf.config import settings
+
+logger = logging.getLogger("src.database.sql")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """Reduce a SQL statement to its shape.
+
+    Literals and bind parameters become ``?`` and parameter lists such as
+    ``IN (?, ?, ?)`` collapse to ``(...)``, so executions of the same query
+    with different values normalize to the same string.
+
+    Args:
+        statement (str): SQL statement as sent to the driver
+
+    Returns:
+        str: Normalized statement
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PARAMETER_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryStats:
+    """Statements executed within one unit of work, usually a request.
+
+    Attributes:
+        count (int): Number of statements executed
+        total_time (float): Total statement time, in seconds
+        statements (dict[str, int]): Executions per normalized statement
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Record an executed statement.
+
+        Args:
+            statement (str): Normalized SQL statement
+            elapsed (float): Execution time in seconds
+        """
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Get the statements executed at least ``threshold`` times.
+
+        Args:
+            threshold (int): Minimum number of executions
+
+        Returns:
+            dict[str, int]: Executions per normalized statement
+        """
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+class StatementRegistry:
+    """Process-wide latency totals per normalized statement.
+
+    The number of distinct statements is capped so ad-hoc SQL with inlined
+    literals cannot grow it without bound.
+    """
+
+    def __init__(self, max_statements: int = 500):
+        """Initialize the registry.
+
+        Args:
+            max_statements (int): Maximum number of distinct statements kept
+        """
+        self._max_statements = max_statements
+        # normalized statement -> [executions, total seconds, max seconds]
+        self._totals: dict[str, list] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Add an execution to the statement's totals.
+
+        Args:
+            statement (str): Normalized SQL statement
+            elapsed (float): Execution time in seconds
+        """
+        totals = self._totals.get(statement)
+        if totals is None:
+            if len(self._totals) >= self._max_statements:
+                return
+            totals = self._totals[statement] = [0, 0.0, 0.0]
+        totals[0] += 1
+        totals[1] += elapsed
+        totals[2] = max(totals[2], elapsed)
+
+    def top(self, limit: int = 20) -> list[dict]:
+        """Get the statements with the highest total execution time.
+
+        Args:
+            limit (int): Maximum number of statements to return
+
+        Returns:
+            list[dict]: Statement text, execution count and average, maximum
+            and total time in milliseconds
+        """
+        ranked = sorted(self._totals.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {
+                "statement": statement,
+                "count": count,
+                "total_ms": total * 1000,
+                "avg_ms": total / count * 1000,
+                "max_ms": longest * 1000,
+            }
+            for statement, (count, total, longest) in ranked[:limit]
+        ]
+
+    def reset(self) -> None:
+        """Forget all recorded statements."""
+        self._totals.clear()
+
+
+statement_registry = StatementRegistry()
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    normalized = normalize_sql(statement)
+    statement_registry.record(normalized, elapsed)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(normalized, elapsed)
+    if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, normalized)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def instrument_engine(engine: AsyncEngine | Engine) -> None:
+    """Attach the statement timing listeners to an engine.
+
+    Calling this more than once for the same engine has no effect.
+
+    Args:
+        engine (AsyncEngine | Engine): Engine to instrument
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+@contextlib.contextmanager
+def track_queries(label: str = "request") -> Iterator[QueryStats]:
+    """Count the statements run in the current context.
+
+    Statements executed at least ``SQL_N_PLUS_ONE_THRESHOLD`` times are
+    logged as a possible N+1 pattern when the block exits.
+
+    Args:
+        label (str): Name of the unit of work used in log messages,
+            such as the route path
+
+    Yields:
+        QueryStats: Statistics filled in while the block runs
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        for statement, count in stats.repeated(
+            settings.SQL_N_PLUS_ONE_THRESHOLD
+        ).items():
+            logger.warning(
+                "Possible N+1 in %s: %d executions of %s", label, count, statement
+            )
+
+
+@contextlib.contextmanager
+def assert_max_queries(
+    engine: AsyncEngine | Engine, max_queries: int
+) -> Iterator[QueryStats]:
+    """Fail if more than ``max_queries`` statements run on an engine.
+
+    Meant for tests: wrapping a request in this block turns an N+1
+    regression into a test failure listing the offending statements. It
+    listens on the engine rather than the context variable, so it also sees
+    statements run on the test client's event loop thread.
+
+    Args:
+        engine (AsyncEngine | Engine): Engine the statements run on
+        max_queries (int): Query budget
+
+    Yields:
+        QueryStats: Statistics filled in while the block runs
+
+    Raises:
+        AssertionError: If the block ran more statements than the budget
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    stats = QueryStats()
+
+    def record(conn, cursor, statement, *args):
+        stats.record(normalize_sql(statement), 0.0)
+
+    event.listen(sync_engine, "after_cursor_execute", record)
+    try:
+        yield stats
+    finally:
+        event.remove(sync_engine, "after_cursor_execute", record)
+    if stats.count > max_queries:
+        details = "\n".join(
+            f"  {count}x {statement}" for statement, count in stats.statements.items()
+        )
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, ran {stats.count}:\n{details}"
+        )
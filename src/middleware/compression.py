@@ -0,0 +1,346 @@
+"""Response compression for the Contacts API.
+
+This module provides an ASGI middleware that compresses response bodies with
+zstd, Brotli or gzip, whichever the client accepts and the server prefers.
+Only bodies of an allowed media type are compressed, and complete bodies
+smaller than ``COMPRESSION_MIN_SIZE`` are sent as they are: below about a
+kilobyte the encoding overhead outweighs the bytes saved.
+
+Streamed responses, such as NDJSON exports, are compressed on the fly: every
+chunk the application sends is compressed and flushed right away, so the
+client can decode each chunk as soon as it arrives.
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.conf.config import settings
+
+
+class StreamCompressor(ABC):
+    """Incremental compressor for one response body."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, possibly holding part of the output back.
+
+        Args:
+            data (bytes): Uncompressed chunk
+
+        Returns:
+            bytes: Compressed output available so far
+        """
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """Emit all held-back output, so the client can decode it now.
+
+        Returns:
+            bytes: Compressed output
+        """
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """End the compressed stream.
+
+        Returns:
+            bytes: Remaining compressed output
+        """
+
+
+class GzipCompressor(StreamCompressor):
+    """gzip stream compressor."""
+
+    def __init__(self, level: int):
+        """Initialize the compressor.
+
+        Args:
+            level (int): Compression level, 1 to 9
+        """
+        # A window size of 16 + MAX_WBITS writes the gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk."""
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Emit held-back output with a sync flush."""
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """Write the final block and the trailer."""
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor(StreamCompressor):
+    """Brotli stream compressor."""
+
+    def __init__(self, level: int):
+        """Initialize the compressor.
+
+        Args:
+            level (int): Brotli quality, 0 to 11
+        """
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk."""
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        """Emit held-back output with a sync flush."""
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        """Write the final block and the trailer."""
+        return self._compressor.finish()
+
+
+class ZstdCompressor(StreamCompressor):
+    """zstd stream compressor."""
+
+    def __init__(self, level: int):
+        """Initialize the compressor.
+
+        Args:
+            level (int): Compression level, 1 to 22
+        """
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk."""
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Emit held-back output with a sync flush."""
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        """Write the final block and the trailer."""
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# Compressor per ``Content-Encoding`` token
+COMPRESSORS: dict[str, type[StreamCompressor]] = {
+    "zstd": ZstdCompressor,
+    "br": BrotliCompressor,
+    "gzip": GzipCompressor,
+}
+
+
+def choose_encoding(accept_encoding: str, encodings: list[str]) -> str | None:
+    """Pick the response encoding for an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding (str): Value of the request's ``Accept-Encoding``
+        encodings (list[str]): Supported encodings, most preferred first
+
+    Returns:
+        str | None: Encoding with the highest quality value, the server's
+            preference breaking ties, or None if the client accepts none
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, parameters = item.partition(";")
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = quality
+
+    chosen, chosen_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > chosen_quality:
+            chosen, chosen_quality = encoding, quality
+    return chosen
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing response bodies.
+
+    Defaults come from the ``COMPRESSION_*`` settings.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: list[str] | None = None,
+        minimum_size: int | None = None,
+        content_types: list[str] | None = None,
+        levels: dict[str, int] | None = None,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): Application whose responses are compressed
+            encodings (list[str] | None): Encodings to offer, most preferred
+                first
+            minimum_size (int | None): Smallest complete body, in bytes,
+                that is compressed
+            content_types (list[str] | None): Media types that are
+                compressed; entries ending in ``/`` match a top-level type
+            levels (dict[str, int] | None): Compression level per encoding
+
+        Raises:
+            ValueError: If an encoding is not supported
+        """
+        self.app = app
+        self.encodings = encodings or [
+            encoding.strip()
+            for encoding in settings.COMPRESSION_ENCODINGS.split(",")
+            if encoding.strip()
+        ]
+        unknown = set(self.encodings) - COMPRESSORS.keys()
+        if unknown:
+            raise ValueError(f"Unsupported compression encodings: {unknown}")
+        self.minimum_size = (
+            settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        )
+        self.content_types = content_types or [
+            content_type.strip().lower()
+            for content_type in settings.COMPRESSION_CONTENT_TYPES.split(",")
+            if content_type.strip()
+        ]
+        self.levels = levels or {
+            "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+            "br": settings.COMPRESSION_BROTLI_QUALITY,
+            "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        }
+
+    def is_compressible(self, headers: Headers) -> bool:
+        """Check whether a response may be compressed, ignoring its size.
+
+        Args:
+            headers (Headers): Response headers
+
+        Returns:
+            bool: True if the response is not encoded yet, allows
+                transformation and has an allowed media type
+        """
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return any(
+            (
+                media_type.startswith(allowed)
+                if allowed.endswith("/")
+                else media_type == allowed
+            )
+            for allowed in self.content_types
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Handle an ASGI connection.
+
+        Args:
+            scope (Scope): Connection scope
+            receive (Receive): Channel for incoming messages
+            send (Send): Channel for outgoing messages
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Compressor of a single response.
+
+    The response start is held back until the first body message shows
+    whether the body is complete and how large it is.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        """Initialize the responder.
+
+        Args:
+            middleware (CompressionMiddleware): Middleware holding the settings
+            encoding (str): Negotiated content encoding
+            send (Send): Channel the response is sent on
+        """
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Message | None = None
+        self._compressor: StreamCompressor | None = None
+
+    async def send(self, message: Message):
+        """Send a response message, compressing its body if needed.
+
+        Args:
+            message (Message): ASGI message from the application
+        """
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if self._start is not None:
+            await self._send_first(message)
+            return
+        if self._compressor is None or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        more_body = message.get("more_body", False)
+        body = self._compressor.compress(message.get("body", b""))
+        body += self._compressor.flush() if more_body else self._compressor.finish()
+        await self._send({**message, "body": body})
+
+    async def _send_first(self, message: Message):
+        """Send the held-back response start with the first body message.
+
+        Args:
+            message (Message): First message after the response start
+        """
+        start, self._start = self._start, None
+        headers = MutableHeaders(scope=start)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if (
+            message["type"] != "http.response.body"
+            or not self.middleware.is_compressible(headers)
+            or (not more_body and len(body) < self.middleware.minimum_size)
+        ):
+            await self._send(start)
+            await self._send(message)
+            return
+
+        self._compressor = COMPRESSORS[self.encoding](
+            self.middleware.levels[self.encoding]
+        )
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # The encoded bytes differ from the identity ones, so a strong
+        # validator no longer applies
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        body = self._compressor.compress(body)
+        if more_body:
+            # The final size is unknown: the body goes out chunked
+            del headers["Content-Length"]
+            body += self._compressor.flush()
+        else:
+            body += self._compressor.finish()
+            headers["Content-Length"] = str(len(body))
+        await self._send(start)
+        await self._send({**message, "body": body})
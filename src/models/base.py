@@ -6,7 +6,20 @@ This module defines the SQLAlchemy models for users and contacts.
 from enum import Enum
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, Date, Text, ForeignKey, Boolean, DateTime, func
+from sqlalchemy import (
+    Integer,
+    String,
+    Date,
+    Text,
+    ForeignKey,
+    Boolean,
+    DateTime,
+    Index,
+    JSON,
+    DDL,
+    event,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 
@@ -42,9 +55,7 @@ class Contact(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     first_name: Mapped[str] = mapped_column(String(50), nullable=False)
     last_name: Mapped[str] = mapped_column(String(50), nullable=False)
-    email: Mapped[str] = mapped_column(
-        String(100), unique=True, nullable=False, index=True
-    )
+    email: Mapped[str] = mapped_column(String(100), nullable=False)
     phone: Mapped[str] = mapped_column(String(20), nullable=False)
     birthday: Mapped[Date] = mapped_column(Date, nullable=False)
     additional_data: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -53,6 +64,11 @@ class Contact(Base):
     )
     user: Mapped["User"] = relationship("User", backref="contacts", lazy="joined")
 
+    # Emails are unique per owner, so different users can store the same contact
+    __table_args__ = (
+        Index("ix_contacts_user_id_email", "user_id", "email", unique=True),
+    )
+
 
 class User(Base):
     """Model representing a user in the system.
@@ -70,6 +86,8 @@ class User(Base):
         reset_password_token (str | None): Token for password reset
         reset_token_expires (DateTime | None): Expiration time for reset token
         role (UserRole): User's role in the system
+        contacts_count (int): Number of contacts the user owns, maintained by
+            database triggers on the contacts table
     """
 
     __tablename__ = "users"
@@ -94,3 +112,106 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(
         String(50), default=UserRole.USER, nullable=False
     )
+    contacts_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
+    # Fetch created_at/updated_at with RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class OutboxMessage(Base):
+    """Model representing a side effect waiting to be relayed.
+
+    Rows are written in the same transaction as the change that causes the
+    side effect and handed to the email queue by the outbox relay.
+
+    Attributes:
+        id (int): Primary key
+        job (str): Name of the ``EmailService`` method to run
+        payload (list): JSON-serializable arguments of the job
+        created_at (DateTime): Timestamp of the change
+        processed_at (DateTime | None): When the relay handed the job over
+    """
+
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[list] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime, default=func.now(), nullable=False
+    )
+    processed_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+
+    # Only pending rows are indexed, so the relay's scan stays small
+    __table_args__ = (
+        Index(
+            "ix_outbox_pending",
+            "id",
+            postgresql_where=processed_at.is_(None),
+            sqlite_where=processed_at.is_(None),
+        ),
+    )
+
+
+# Triggers keeping users.contacts_count in step with the contacts table.
+# Running in the database, they cover every write path, upserts and bulk
+# statements included, without an extra round trip.
+CONTACTS_COUNT_TRIGGERS = {
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION update_contacts_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE users SET contacts_count = contacts_count + 1
+                WHERE id = NEW.user_id;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE users SET contacts_count = contacts_count - 1
+                WHERE id = OLD.user_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER contacts_count
+        AFTER INSERT OR DELETE OR UPDATE OF user_id ON contacts
+        FOR EACH ROW EXECUTE FUNCTION update_contacts_count()
+        """,
+    ],
+    "sqlite": [
+        """
+        CREATE TRIGGER contacts_count_insert AFTER INSERT ON contacts
+        BEGIN
+            UPDATE users SET contacts_count = contacts_count + 1
+            WHERE id = NEW.user_id;
+        END
+        """,
+        """
+        CREATE TRIGGER contacts_count_delete AFTER DELETE ON contacts
+        BEGIN
+            UPDATE users SET contacts_count = contacts_count - 1
+            WHERE id = OLD.user_id;
+        END
+        """,
+        """
+        CREATE TRIGGER contacts_count_update AFTER UPDATE OF user_id ON contacts
+        BEGIN
+            UPDATE users SET contacts_count = contacts_count + 1
+            WHERE id = NEW.user_id;
+            UPDATE users SET contacts_count = contacts_count - 1
+            WHERE id = OLD.user_id;
+        END
+        """,
+    ],
+}
+
+for dialect, statements in CONTACTS_COUNT_TRIGGERS.items():
+    for statement in statements:
+        event.listen(
+            Contact.__table__,
+            "after_create",
+            DDL(statement).execute_if(dialect=dialect),
+        )
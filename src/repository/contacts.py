@@ -4,16 +4,94 @@ This module provides database access methods for contact CRUD operations
 and specialized queries.
 """
 
+import json
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, extract, func
 from sqlalchemy.future import select
-from typing import List, Optional
-from datetime import timedelta
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import AsyncIterator, List, Optional
+from datetime import date, timedelta
 
-from src.models.base import Contact
-from src.schemas.contact import ContactCreate, ContactUpdate
+from src.models.base import Contact, User
+from src.schemas.contact import ContactCreate, ContactUpdate, ContactUpsert
 from src.exceptions.contact import ContactAlreadyExists
 
+# Columns needed to build a ContactResponse. Selecting them directly returns
+# plain rows, skipping the joined User load and the ORM identity map.
+CONTACT_RESPONSE_COLUMNS = (
+    Contact.id,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone,
+    Contact.birthday,
+    Contact.additional_data,
+)
+
+# Response columns by field name, for requests that select a subset of them
+CONTACT_RESPONSE_FIELDS = {column.key: column for column in CONTACT_RESPONSE_COLUMNS}
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def contact_filter(
+    user_id: int,
+    first_name: Optional[str],
+    last_name: Optional[str],
+    email: Optional[str],
+):
+    """Build the filter of the contact list.
+
+    The name and email filters are substring matches, and a contact matches
+    if any of the given ones does.
+
+    Args:
+        user_id (int): ID of the user who owns the contacts
+        first_name (Optional[str]): Filter by first name
+        last_name (Optional[str]): Filter by last name
+        email (Optional[str]): Filter by email
+
+    Returns:
+        ColumnElement[bool]: Filter expression on ``Contact``
+    """
+    filters = []
+    if first_name:
+        filters.append(Contact.first_name.ilike(f"%{first_name}%"))
+    if last_name:
+        filters.append(Contact.last_name.ilike(f"%{last_name}%"))
+    if email:
+        filters.append(Contact.email.ilike(f"%{email}%"))
+    if not filters:
+        return Contact.user_id == user_id
+    return and_(Contact.user_id == user_id, or_(*filters))
+
+
+def birthday_window(start: date, days: int):
+    """Build a filter for birthdays within ``days`` days of ``start``.
+
+    The year of birth is ignored. Birthdays are compared as ``month * 100 +
+    day`` numbers, and a window that crosses the new year matches both its
+    December and its January part.
+
+    Args:
+        start (date): First day of the window
+        days (int): Length of the window in days, ``start`` excluded
+
+    Returns:
+        ColumnElement[bool]: Filter expression on ``Contact.birthday``
+    """
+    month_day = extract("month", Contact.birthday) * 100 + extract(
+        "day", Contact.birthday
+    )
+    end = start + timedelta(days=days)
+    first = start.month * 100 + start.day
+    last = end.month * 100 + end.day
+    if first <= last:
+        return month_day.between(first, last)
+    return or_(month_day >= first, month_day <= last)
+
 
 class ContactsRepository:
     """Repository for managing contacts in the database.
@@ -59,6 +137,46 @@ class ContactsRepository:
         await self.db.refresh(db_contact)
         return db_contact
 
+    async def upsert_contact_by_email(
+        self, email: str, contact: ContactUpsert, user_id: int
+    ) -> dict:
+        """Create a contact or replace the user's contact with the same email.
+
+        Runs a single ``INSERT ... ON CONFLICT (user_id, email) DO UPDATE``,
+        so concurrent calls with the same email cannot create duplicates.
+
+        Args:
+            email (str): Email identifying the contact
+            contact (ContactUpsert): Contact data to store
+            user_id (int): ID of the user who owns the contact
+
+        Returns:
+            dict: Contact response fields of the stored contact
+
+        Raises:
+            NotImplementedError: If the database does not support
+                ``ON CONFLICT``
+        """
+        values = contact.model_dump()
+        dialect = self.db.get_bind().dialect.name
+        if dialect not in UPSERT_INSERTS:
+            raise NotImplementedError(
+                f"Contact upsert needs ON CONFLICT support, which the {dialect}"
+                f" dialect lacks; supported: {', '.join(UPSERT_INSERTS)}"
+            )
+
+        statement = UPSERT_INSERTS[dialect](Contact).values(
+            **values, email=email, user_id=user_id
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[Contact.user_id, Contact.email],
+            set_={key: statement.excluded[key] for key in values},
+        ).returning(*CONTACT_RESPONSE_COLUMNS)
+        result = await self.db.execute(statement)
+        row = dict(result.mappings().one())
+        await self.db.commit()
+        return row
+
     async def get_contacts(
         self,
         skip: int,
@@ -67,9 +185,13 @@ class ContactsRepository:
         last_name: Optional[str],
         email: Optional[str],
         user_id: int,
-    ) -> List[Contact]:
+        fields: Optional[List[str]] = None,
+    ) -> List[dict]:
         """Get a list of contacts with optional filtering.
 
+        Only the requested columns are selected, so leaving out large ones
+        such as ``additional_data`` saves database I/O as well as payload.
+
         Args:
             skip (int): Number of records to skip
             limit (int): Maximum number of records to return
@@ -77,27 +199,109 @@ class ContactsRepository:
             last_name (Optional[str]): Filter by last name
             email (Optional[str]): Filter by email
             user_id (int): ID of the user whose contacts to retrieve
+            fields (Optional[List[str]]): Names of the response fields to
+                select, all of them if None
 
         Returns:
-            List[Contact]: List of contacts matching the criteria
+            List[dict]: Requested contact response fields of the matching contacts
         """
-        query = select(Contact).where(Contact.user_id == user_id)
+        columns = (
+            CONTACT_RESPONSE_COLUMNS
+            if fields is None
+            else [CONTACT_RESPONSE_FIELDS[field] for field in fields]
+        )
+        query = (
+            select(*columns)
+            .where(contact_filter(user_id, first_name, last_name, email))
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings()]
 
-        # Apply filters if provided
-        if first_name or last_name or email:
-            filters = []
-            if first_name:
-                filters.append(Contact.first_name.ilike(f"%{first_name}%"))
-            if last_name:
-                filters.append(Contact.last_name.ilike(f"%{last_name}%"))
-            if email:
-                filters.append(Contact.email.ilike(f"%{email}%"))
+    async def get_contacts_count(self, user_id: int) -> int:
+        """Get the number of contacts a user owns.
 
-            query = query.where(and_(or_(*filters), Contact.user_id == user_id))
+        Reads the counter the contacts table triggers maintain, rather than
+        counting the rows.
 
-        query = query.offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            int: Number of contacts
+        """
+        result = await self.db.execute(
+            select(User.contacts_count).where(User.id == user_id)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def count_contacts(
+        self,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        email: Optional[str],
+        user_id: int,
+    ) -> int:
+        """Count the contacts matching the list filters.
+
+        Args:
+            first_name (Optional[str]): Filter by first name
+            last_name (Optional[str]): Filter by last name
+            email (Optional[str]): Filter by email
+            user_id (int): ID of the user whose contacts to count
+
+        Returns:
+            int: Number of matching contacts
+        """
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(Contact)
+            .where(contact_filter(user_id, first_name, last_name, email))
+        )
+        return result.scalar_one()
+
+    async def estimate_contacts(
+        self,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        email: Optional[str],
+        user_id: int,
+    ) -> Optional[int]:
+        """Estimate the number of contacts matching the list filters.
+
+        Uses the PostgreSQL planner's row estimate, which costs a query plan
+        but no scan of the matching rows.
+
+        Args:
+            first_name (Optional[str]): Filter by first name
+            last_name (Optional[str]): Filter by last name
+            email (Optional[str]): Filter by email
+            user_id (int): ID of the user whose contacts to count
+
+        Returns:
+            Optional[int]: Estimated number of matching contacts, or None if
+                the database cannot estimate it
+        """
+        dialect = self.db.get_bind().dialect
+        if dialect.name != "postgresql":
+            return None
+        query = select(Contact.id).where(
+            contact_filter(user_id, first_name, last_name, email)
+        )
+        # Run the statement as compiled for the driver, with its parameters
+        compiled = query.compile(dialect=dialect)
+        parameters = compiled.construct_params()
+        if compiled.positional:
+            parameters = tuple(parameters[name] for name in compiled.positiontup)
+        connection = await self.db.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", parameters
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     async def get_contact(self, contact_id: int, user_id: int) -> Optional[Contact]:
         """Get a specific contact by ID.
@@ -148,51 +352,56 @@ class ContactsRepository:
         await self.db.delete(db_contact)
         await self.db.commit()
 
-    async def get_upcoming_birthdays(self) -> List[Contact]:
+    async def get_upcoming_birthdays(
+        self, user_id: int, today: Optional[date] = None
+    ) -> List[dict]:
         """Get a list of contacts with birthdays in the next 7 days.
 
         Args:
             user_id (int): ID of the user whose contacts to retrieve
+            today (Optional[date]): Day to count from, the current date by default
 
         Returns:
-            List[Contact]: List of contacts with upcoming birthdays
+            List[dict]: Contact response fields of contacts with upcoming birthdays
         """
-        # Get current month and day
-        current_date = func.current_date()
-        current_month = extract("month", current_date)
-        current_day = extract("day", current_date)
-
-        # Calculate month and day 7 days from now
-        seven_days_later = current_date + timedelta(days=7)
-        end_month = extract("month", seven_days_later)
-        end_day = extract("day", seven_days_later)
-
-        # Query for contacts with birthdays in the next 7 days, ignoring year
-        if current_month == end_month:
-            # Simple case: both dates in same month
-            query = select(Contact).where(
-                and_(
-                    extract("month", Contact.birthday) == current_month,
-                    extract("day", Contact.birthday) >= current_day,
-                    extract("day", Contact.birthday) <= end_day,
-                )
-            )
-        else:
-            # Handles December to January transition
-            query = select(Contact).where(
-                or_(
-                    # Either current month with day >= current day
-                    and_(
-                        extract("month", Contact.birthday) == current_month,
-                        extract("day", Contact.birthday) >= current_day,
-                    ),
-                    # Or next month with day <= end day
-                    and_(
-                        extract("month", Contact.birthday) == end_month,
-                        extract("day", Contact.birthday) <= end_day,
-                    ),
-                ),
-            )
-
+        query = select(*CONTACT_RESPONSE_COLUMNS).where(
+            Contact.user_id == user_id,
+            birthday_window(today or date.today(), 7),
+        )
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return [dict(row) for row in result.mappings()]
+
+    async def stream_upcoming_birthdays(
+        self, start: date, days: int, batch_size: int = 500
+    ) -> AsyncIterator[dict]:
+        """Stream the upcoming birthdays of all users' contacts.
+
+        A single query returns the rows ordered by owner, so callers can
+        group them by user while they arrive. Rows are fetched from the
+        server ``batch_size`` at a time.
+
+        Args:
+            start (date): First day of the window
+            days (int): Length of the window in days
+            batch_size (int): Number of rows fetched per round trip
+
+        Yields:
+            dict: Owner's ID, email and username and the contact's name and birthday
+        """
+        query = (
+            select(
+                Contact.user_id,
+                User.email.label("user_email"),
+                User.username,
+                Contact.first_name,
+                Contact.last_name,
+                Contact.birthday,
+            )
+            .join(User, Contact.user_id == User.id)
+            .where(birthday_window(start, days))
+            .order_by(Contact.user_id, Contact.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(query)
+        async for row in result.mappings():
+            yield dict(row)
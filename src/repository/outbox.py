@@ -0,0 +1,76 @@
+"""Repository for outbox database operations.
+
+This module provides database access methods for claiming and completing
+outbox messages.
+"""
+
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.base import OutboxMessage
+
+
+class OutboxRepository:
+    """Repository for managing outbox messages in the database."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the outbox repository.
+
+        Args:
+            db (AsyncSession): Database session
+        """
+        self.db = db
+
+    async def claim_pending(self, limit: int) -> List[OutboxMessage]:
+        """Lock the oldest pending messages for the current transaction.
+
+        Uses ``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent relays
+        claim disjoint batches instead of waiting for each other.
+
+        Args:
+            limit (int): Maximum number of messages to claim
+
+        Returns:
+            List[OutboxMessage]: Claimed messages, oldest first
+        """
+        query = (
+            select(OutboxMessage)
+            .where(OutboxMessage.processed_at.is_(None))
+            .order_by(OutboxMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars())
+
+    async def mark_processed(self, ids: List[int], now: datetime) -> None:
+        """Mark messages as handed over, without committing.
+
+        Args:
+            ids (List[int]): IDs of the processed messages
+            now (datetime): Processing time
+        """
+        await self.db.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids))
+            .values(processed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def purge_processed(self, before: datetime) -> int:
+        """Delete messages processed before a given time.
+
+        Args:
+            before (datetime): Messages processed earlier are deleted
+
+        Returns:
+            int: Number of deleted messages
+        """
+        result = await self.db.execute(
+            delete(OutboxMessage).where(OutboxMessage.processed_at < before)
+        )
+        await self.db.commit()
+        return result.rowcount
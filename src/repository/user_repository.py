@@ -4,11 +4,12 @@ This module provides database access methods for user CRUD operations
 and specialized queries.
 """
 
+from datetime import datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, or_, select, update
 
-from src.models.base import User, UserRole
+from src.models.base import OutboxMessage, User, UserRole
 
 
 class UserRepository:
@@ -16,6 +17,14 @@ class UserRepository:
 
     This class provides methods for creating, reading, and updating users,
     as well as specialized queries like finding users by email or verification token.
+
+    Sessions are expected to use ``expire_on_commit=False``; mutators commit
+    without reloading the user, and server-generated timestamps are fetched
+    with RETURNING.
+
+    Mutators that trigger an email accept an ``outbox_job``: the job is
+    written to the outbox in the same transaction as the change, with the
+    user's email, username and the new token as arguments.
     """
 
     def __init__(self, db: AsyncSession):
@@ -26,6 +35,17 @@ class UserRepository:
         """
         self.db = db
 
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get a user by their ID.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            Optional[User]: User object if found, None otherwise
+        """
+        return await self.db.get(User, user_id)
+
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get a user by their email address.
 
@@ -65,19 +85,32 @@ class UserRepository:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def create(self, user_data: dict) -> User:
+    def _add_to_outbox(self, job: str, user: User, token: str) -> None:
+        """Add an email job for a user to the current transaction's outbox.
+
+        Args:
+            job (str): Name of the ``EmailService`` method to run
+            user (User): User the email is for
+            token (str): Token to embed in the email
+        """
+        self.db.add(OutboxMessage(job=job, payload=[user.email, user.username, token]))
+
+    async def create(self, user_data: dict, outbox_job: Optional[str] = None) -> User:
         """Create a new user in the database.
 
         Args:
             user_data (dict): User data including username, email, and hashed password
+            outbox_job (Optional[str]): Email job to record for the
+                user's verification token
 
         Returns:
             User: Created user object
         """
         new_user = User(**user_data)
         self.db.add(new_user)
+        if outbox_job:
+            self._add_to_outbox(outbox_job, new_user, new_user.verification_token)
         await self.db.commit()
-        await self.db.refresh(new_user)
         return new_user
 
     async def update(self, user: User) -> User:
@@ -90,7 +123,6 @@ class UserRepository:
             User: Updated user object
         """
         await self.db.commit()
-        await self.db.refresh(user)
         return user
 
     async def update_avatar(self, user: User, avatar_url: str) -> User:
@@ -105,7 +137,6 @@ class UserRepository:
         """
         user.avatar_url = avatar_url
         await self.db.commit()
-        await self.db.refresh(user)
         return user
 
     async def update_password(self, user: User, hashed_password: str) -> User:
@@ -122,7 +153,6 @@ class UserRepository:
         user.reset_password_token = None
         user.reset_token_expires = None
         await self.db.commit()
-        await self.db.refresh(user)
         return user
 
     async def update_role(self, user: User, role: UserRole) -> User:
@@ -137,5 +167,141 @@ class UserRepository:
         """
         user.role = role
         await self.db.commit()
-        await self.db.refresh(user)
         return user
+
+    async def verify_email_token(self, token: str) -> Optional[User]:
+        """Mark the email of the user holding a verification token as verified.
+
+        The lookup and the update are done in a single
+        ``UPDATE ... WHERE verification_token = ... RETURNING`` statement.
+
+        Args:
+            token (str): Email verification token
+
+        Returns:
+            Optional[User]: Verified user, or None if no unverified user
+            holds the token
+        """
+        query = (
+            update(User)
+            .where(User.verification_token == token, User.email_verified.is_(False))
+            .values(email_verified=True, verification_token=None)
+            .returning(User)
+        )
+        result = await self.db.execute(query)
+        user = result.scalar_one_or_none()
+        await self.db.commit()
+        return user
+
+    async def set_reset_password_token(
+        self,
+        email: str,
+        token: str,
+        expires: datetime,
+        outbox_job: Optional[str] = None,
+    ) -> Optional[User]:
+        """Store a password reset token for the user with the given email.
+
+        Args:
+            email (str): User's email address
+            token (str): Password reset token
+            expires (datetime): Token expiration time
+            outbox_job (Optional[str]): Email job to record for the token
+
+        Returns:
+            Optional[User]: Updated user, or None if no user has this email
+        """
+        query = (
+            update(User)
+            .where(User.email == email)
+            .values(reset_password_token=token, reset_token_expires=expires)
+            .returning(User)
+        )
+        result = await self.db.execute(query)
+        user = result.scalar_one_or_none()
+        if user is not None and outbox_job:
+            self._add_to_outbox(outbox_job, user, token)
+        await self.db.commit()
+        return user
+
+    async def reset_password_by_token(
+        self, token: str, hashed_password: str, now: datetime
+    ) -> Optional[User]:
+        """Set a new password for the user holding a valid reset token.
+
+        The token is redeemed and cleared in a single
+        ``UPDATE ... WHERE reset_password_token = ... RETURNING`` statement.
+
+        Args:
+            token (str): Password reset token
+            hashed_password (str): New hashed password
+            now (datetime): Current time, tokens expiring before it are rejected
+
+        Returns:
+            Optional[User]: Updated user, or None if the token is unknown
+            or expired
+        """
+        query = (
+            update(User)
+            .where(
+                User.reset_password_token == token,
+                or_(
+                    User.reset_token_expires.is_(None),
+                    User.reset_token_expires >= now,
+                ),
+            )
+            .values(
+                password=hashed_password,
+                reset_password_token=None,
+                reset_token_expires=None,
+            )
+            .returning(User)
+        )
+        result = await self.db.execute(query)
+        user = result.scalar_one_or_none()
+        await self.db.commit()
+        return user
+
+    async def get_without_avatar(
+        self, after_id: int, limit: int
+    ) -> list[tuple[int, str]]:
+        """Get a batch of users that have no avatar URL, in ID order.
+
+        Args:
+            after_id (int): Only users with a greater ID are returned
+            limit (int): Maximum number of users to return
+
+        Returns:
+            list[tuple[int, str]]: ID and email of each user
+        """
+        query = (
+            select(User.id, User.email)
+            .where(User.avatar_url.is_(None), User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return [(user_id, email) for user_id, email in result]
+
+    async def set_missing_avatar_urls(self, avatar_urls: dict[int, str]) -> None:
+        """Set the avatar URL of users that still have none.
+
+        All users are updated with one executemany statement. Users that
+        got an avatar in the meantime keep it.
+
+        Args:
+            avatar_urls (dict[int, str]): Avatar URL per user ID
+        """
+        if not avatar_urls:
+            return
+        users = User.__table__
+        query = (
+            update(users)
+            .where(users.c.id == bindparam("user_id"), users.c.avatar_url.is_(None))
+            .values(avatar_url=bindparam("url"))
+        )
+        await self.db.execute(
+            query,
+            [{"user_id": user_id, "url": url} for user_id, url in avatar_urls.items()],
+        )
+        await self.db.commit()
@@ -0,0 +1,49 @@
+"""Avatar file routes for the Contacts API.
+
+This module serves avatars kept by the local storage backend. File names
+contain the digest of their content, so responses may be cached forever.
+"""
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+
+from src.conf.config import settings
+from src.services.storage import LocalStorage, get_storage
+
+router = APIRouter(prefix="/avatars", tags=["avatars"])
+
+
+@router.get("/{name}", response_class=FileResponse)
+async def get_avatar(name: str) -> FileResponse:
+    """Serve an avatar file from the local storage backend.
+
+    Args:
+        name (str): Avatar file name
+
+    Returns:
+        FileResponse: The file, cacheable for ``AVATAR_CACHE_MAX_AGE`` seconds
+
+    Raises:
+        HTTPException: If local storage is not in use or the file does not exist
+    """
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Avatar not found"
+    )
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        raise not_found
+    try:
+        path = storage.path(name)
+    except ValueError:
+        raise not_found
+    if not path.is_file():
+        raise not_found
+    return FileResponse(
+        path,
+        media_type="image/webp",
+        headers={
+            "Cache-Control": (
+                f"public, max-age={settings.AVATAR_CACHE_MAX_AGE}, immutable"
+            )
+        },
+    )
@@ -5,14 +5,16 @@ as well as retrieving upcoming birthdays.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 import logging
 
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db
 from src.services.contacts import ContactsService
-from src.schemas.contact import ContactCreate, ContactResponse, ContactUpdate
+from src.schemas.contact import ContactCreate, ContactFieldsResponse, ContactPage, ContactResponse, ContactUpdate, ContactUpsert
 from src.services.auth import AuthService
+from src.routes.responses import TrustedJSONResponse
 from src.models.base import User
 
 router = APIRouter(prefix="/contacts", tags=["contacts"], dependencies=[Depends(AuthService.get_current_user)])
@@ -39,37 +41,77 @@ async def create_contact(
     return await service.create_contact(contact, current_user.id)
 
 
-@router.get("/", response_model=List[ContactResponse])
+@router.get("/", response_model=Union[List[ContactFieldsResponse], ContactPage])
 async def get_contacts(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=100),
     first_name: Optional[str] = Query(default=None),
     last_name: Optional[str] = Query(default=None),
     email: Optional[str] = Query(default=None),
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated fields to return, e.g. first_name,last_name,phone; id is always included",
+    ),
+    count: Optional[Literal["exact", "estimate"]] = Query(
+        default=None,
+        description="Return the number of matching contacts in X-Total-Count; estimate allows a planner estimate for huge results",
+    ),
+    envelope: bool = Query(
+        default=False,
+        description="Wrap the contacts in an object with the total count",
+    ),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(AuthService.get_current_user)
-) -> List[ContactResponse]:
+) -> Union[List[ContactFieldsResponse], ContactPage]:
     """Get a list of contacts with optional filtering.
 
+    With ``count`` or ``envelope``, the number of matching contacts is sent
+    in the ``X-Total-Count`` header, and ``X-Total-Count-Estimated`` marks
+    an estimate. Counts of filtered lists are cached briefly.
+
     Args:
         skip (int): Number of records to skip
         limit (int): Maximum number of records to return
         first_name (Optional[str]): Filter by first name
         last_name (Optional[str]): Filter by last name
         email (Optional[str]): Filter by email
+        fields (Optional[str]): Comma-separated fields to return, all if not given
+        count (Optional[Literal["exact", "estimate"]]): How to count the
+            matching contacts, not counted if not given
+        envelope (bool): Whether to return a ``ContactPage`` instead of a list;
+            counts exactly unless ``count`` is given
         db (AsyncSession): Database session
         current_user (User): Current authenticated user
 
     Returns:
-        List[ContactResponse]: List of contacts matching the criteria
+        Union[List[ContactFieldsResponse], ContactPage]: Contacts matching
+            the criteria, with only the requested fields
+
+    Raises:
+        HTTPException: If a requested field is unknown
     """
+    selected = ContactsService.parse_fields(fields)
     service = ContactsService(db)
-    return await service.get_contacts(skip, limit, first_name, last_name, email, current_user.id)
+    contacts = await service.get_contacts(skip, limit, first_name, last_name, email, current_user.id, selected)
+    if count is None and not envelope:
+        # Rows come straight from the response columns: skip re-validation
+        return TrustedJSONResponse(contacts)
+
+    total, estimated = await service.count_contacts(
+        first_name, last_name, email, current_user.id, estimate=count == "estimate"
+    )
+    headers = {"X-Total-Count": str(total)}
+    if estimated:
+        headers["X-Total-Count-Estimated"] = "true"
+    if envelope:
+        content = {"items": contacts, "total": total, "estimated": estimated}
+        return TrustedJSONResponse(content, headers=headers)
+    return TrustedJSONResponse(contacts, headers=headers)
 
 
 @router.get("/birthdays", response_model=List[ContactResponse])
 async def get_upcoming_birthdays(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(AuthService.get_current_user)
 ) -> List[ContactResponse]:
     """Get a list of contacts with upcoming birthdays.
@@ -82,13 +124,38 @@ async def get_upcoming_birthdays(
         List[ContactResponse]: List of contacts with upcoming birthdays
     """
     service = ContactsService(db)
-    return await service.get_upcoming_birthdays(current_user.id)
+    return TrustedJSONResponse(await service.get_upcoming_birthdays(current_user.id))
+
+
+@router.put("/by-email/{email}", response_model=ContactResponse)
+async def upsert_contact_by_email(
+    email: EmailStr,
+    contact: ContactUpsert,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+) -> ContactResponse:
+    """Create a contact or replace the one with the same email.
+
+    The write is a single atomic upsert, so external syncs can push the
+    same record repeatedly without reading it first.
+
+    Args:
+        email (EmailStr): Email identifying the contact
+        contact (ContactUpsert): Contact data to store
+        db (AsyncSession): Database session
+        current_user (User): Current authenticated user
+
+    Returns:
+        ContactResponse: Stored contact data
+    """
+    service = ContactsService(db)
+    return await service.upsert_contact_by_email(email, contact, current_user.id)
 
 
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def get_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(AuthService.get_current_user)
 ) -> ContactResponse:
     """Get a specific contact by ID.
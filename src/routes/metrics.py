@@ -0,0 +1,75 @@
+"""Operational metrics routes for the Contacts API.
+
+This module provides admin-only endpoints exposing runtime statistics
+such as database connection pool usage and SQL statement latency.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from src.database.db import sessionmanager
+from src.database.instrumentation import statement_registry
+from src.models.base import User, UserRole
+from src.services.auth import AuthService
+
+
+async def require_admin(
+    current_user: User = Depends(AuthService.get_current_user),
+) -> User:
+    """Require the current user to be an administrator.
+
+    Args:
+        current_user (User): Current authenticated user
+
+    Returns:
+        User: Current authenticated admin user
+
+    Raises:
+        HTTPException: If the current user is not an admin
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can view metrics",
+        )
+    return current_user
+
+
+router = APIRouter(
+    prefix="/metrics", tags=["metrics"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats() -> dict:
+    """Get database connection pool statistics.
+
+    Returns:
+        dict: Pool size, checked-out and overflow connections and
+        checkout wait times
+    """
+    return sessionmanager.pool_status()
+
+
+@router.get("/db-sessions")
+async def get_db_session_stats() -> dict:
+    """Get database session usage statistics.
+
+    Returns:
+        dict: Number of requests that got a session and how many of them
+        finished without acquiring a database connection
+    """
+    return sessionmanager.session_stats()
+
+
+@router.get("/sql")
+async def get_sql_stats(limit: int = Query(default=20, ge=1, le=100)) -> list[dict]:
+    """Get the SQL statements with the highest total execution time.
+
+    Args:
+        limit (int): Maximum number of statements to return
+
+    Returns:
+        list[dict]: Normalized statement, execution count and average,
+        maximum and total time in milliseconds
+    """
+    return statement_registry.top(limit)
@@ -0,0 +1,21 @@
+"""Response classes shared by the API routes.
+
+Routes declare a ``response_model`` for validation and documentation, and
+FastAPI validates every returned value against it before encoding. For
+list endpoints that return rows the server just selected, that validation
+can take longer than the query. ``TrustedJSONResponse`` sends such rows as they
+are, encoded by orjson, while the route keeps its ``response_model`` for
+the OpenAPI schema.
+"""
+
+from fastapi.responses import ORJSONResponse
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    """JSON response for data produced by the server itself.
+
+    Returning a response object skips the route's response validation, so
+    only use it for rows read from our own database whose columns match the
+    declared response model, e.g. ``CONTACT_RESPONSE_COLUMNS``. orjson
+    encodes ``date`` and ``datetime`` values in ISO 8601 like pydantic does.
+    """
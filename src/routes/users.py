@@ -3,14 +3,28 @@
 This module provides endpoints for managing user profiles and avatars.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+    File,
+    UploadFile,
+)
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.services.user import UserService
 from src.services.auth import AuthService
+from src.services.avatar_jobs import AvatarJobs
 from src.models.base import User, UserRole
-from src.schemas.user import UserResponse
+from src.schemas.user import AvatarJobResponse, UserResponse
 
 # Define a new schema for updating user role
 from pydantic import BaseModel
@@ -31,27 +45,85 @@ class RoleUpdate(BaseModel):
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.patch("/avatar", response_model=UserResponse)
+@router.patch(
+    "/avatar",
+    response_model=UserResponse,
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": AvatarJobResponse,
+            "description": "Avatar accepted for processing (mode=async)",
+        }
+    },
+)
 async def update_avatar(
+    request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    mode: Literal["sync", "async"] = Query(
+        "sync", description="Process the avatar before or after responding"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(AuthService.get_current_user),
-) -> User:
+):
     """Update user's avatar image.
 
+    In ``async`` mode the upload is checked and accepted with
+    ``202 Accepted``, and the avatar is processed after the response is
+    sent. Its progress is reported by ``GET /users/avatar/jobs/{job_id}``.
+
     Args:
+        request (Request): The incoming request
+        background_tasks (BackgroundTasks): Tasks run after the response
         file (UploadFile): Image file to upload
+        mode (str): ``sync`` or ``async``
         db (AsyncSession): Database session
         current_user (User): Current authenticated user
 
     Returns:
-        User: Updated user data with new avatar URL
+        User | JSONResponse: Updated user data with new avatar URL, or the
+        accepted job in ``async`` mode
 
     Raises:
         HTTPException: If file upload fails or file type is not supported
     """
     user_service = UserService(db)
-    return await user_service.update_avatar(current_user, file)
+    if mode == "sync":
+        return await user_service.update_avatar(current_user, file)
+
+    job, image = await user_service.submit_avatar(current_user, file)
+    background_tasks.add_task(
+        UserService.run_avatar_job, job, current_user.email, image
+    )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=AvatarJobResponse.model_validate(job).model_dump(mode="json"),
+        headers={"Location": str(request.url_for("get_avatar_job", job_id=job["id"]))},
+    )
+
+
+@router.get("/avatar/jobs/{job_id}", response_model=AvatarJobResponse)
+async def get_avatar_job(
+    job_id: str,
+    current_user: User = Depends(AuthService.get_current_user),
+) -> dict:
+    """Get the progress of an asynchronous avatar upload.
+
+    Args:
+        job_id (str): Job ID returned when the upload was accepted
+        current_user (User): Current authenticated user
+
+    Returns:
+        dict: Job state
+
+    Raises:
+        HTTPException: If the job does not exist or belongs to another user
+    """
+    job = await AvatarJobs.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Avatar job not found"
+        )
+    return job
 
 
 @router.post("/role", response_model=UserResponse)
@@ -4,7 +4,7 @@ This module defines the data validation schemas for contact-related operations.
 """
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 
@@ -36,6 +36,25 @@ class ContactCreate(ContactBase):
     pass
 
 
+class ContactUpsert(BaseModel):
+    """Schema for creating or replacing a contact identified by its email.
+
+    The email is taken from the URL, so it is not part of the body.
+
+    Attributes:
+        first_name (str): Contact's first name (1-50 characters)
+        last_name (str): Contact's last name (1-50 characters)
+        phone (str): Contact's phone number (5-20 characters)
+        birthday (date): Contact's date of birth
+        additional_data (Optional[str]): Additional information (max 500 characters)
+    """
+    first_name: str = Field(..., min_length=1, max_length=50)
+    last_name: str = Field(..., min_length=1, max_length=50)
+    phone: str = Field(..., min_length=5, max_length=20)
+    birthday: date
+    additional_data: Optional[str] = Field(None, max_length=500)
+
+
 class ContactUpdate(BaseModel):
     """Schema for updating an existing contact.
 
@@ -69,3 +88,41 @@ class ContactResponse(ContactBase):
 
     class Config:
         from_attributes = True
+
+
+class ContactFieldsResponse(BaseModel):
+    """Schema for contact data limited to the fields a client selected.
+
+    Only ``id`` is always present. The other fields are present when they
+    were requested with ``fields``, or when ``fields`` was not given.
+
+    Attributes:
+        id (int): Contact's unique identifier
+        first_name (Optional[str]): Contact's first name
+        last_name (Optional[str]): Contact's last name
+        email (Optional[EmailStr]): Contact's email address
+        phone (Optional[str]): Contact's phone number
+        birthday (Optional[date]): Contact's date of birth
+        additional_data (Optional[str]): Additional information
+    """
+    id: int
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[EmailStr] = None
+    phone: Optional[str] = None
+    birthday: Optional[date] = None
+    additional_data: Optional[str] = None
+
+
+class ContactPage(BaseModel):
+    """Schema for a page of contacts with their total count.
+
+    Attributes:
+        items (List[ContactFieldsResponse]): Contacts on this page, with the
+            selected fields
+        total (int): Number of contacts matching the filters
+        estimated (bool): Whether the total is an estimate
+    """
+    items: List[ContactFieldsResponse]
+    total: int
+    estimated: bool
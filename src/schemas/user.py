@@ -5,7 +5,7 @@ This module defines the data validation schemas for user-related operations.
 
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from src.models.base import UserRole
 
@@ -50,6 +50,24 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class AvatarJobResponse(BaseModel):
+    """Schema for the state of an asynchronous avatar upload.
+
+    Attributes:
+        id (str): Job ID
+        status (str): ``pending``, ``processing``, ``done`` or ``failed``
+        avatar_url (Optional[str]): New avatar URL, once the job is done
+        error (Optional[str]): Reason the job failed
+        created_at (datetime): When the upload was accepted
+    """
+
+    id: str
+    status: Literal["pending", "processing", "done", "failed"]
+    avatar_url: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+
+
 class UserLogin(BaseModel):
     """Schema for user login credentials.
 
@@ -6,8 +6,9 @@ login, email verification, and JWT token management.
 
 from typing import Optional
 from datetime import UTC, datetime, timedelta, timezone
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 import uuid
@@ -17,7 +18,7 @@ from src.database.db import get_db
 from src.models.base import User, UserRole
 from src.schemas.user import UserCreate
 from src.conf.config import settings
-from src.services.email import EmailService
+from src.services.gravatar import GravatarService
 from src.services.redis_service import RedisService
 from src.repository.user_repository import UserRepository
 
@@ -26,6 +27,10 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Values of the password reset coalescing key
+RESET_PENDING = "pending"
+RESET_UNKNOWN_EMAIL = "unknown"
+
 
 class AuthService:
     """Service for handling user authentication and authorization.
@@ -41,7 +46,6 @@ class AuthService:
             db (AsyncSession): Database session
         """
         self.repository = UserRepository(db)
-        self.email_service = EmailService()
 
     async def register(self, user_data: UserCreate) -> User:
         """Register a new user.
@@ -55,31 +59,31 @@ class AuthService:
         Raises:
             HTTPException: If email is already registered
         """
-        # Check if user exists
-        existing_user = await self.repository.get_by_email(user_data.email)
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT, detail="Email already registered"
-            )
-
-        # Create new user
         hashed_password = self.get_password_hash(user_data.password)
         email_verification_token = str(uuid.uuid4())
 
-        new_user = await self.repository.create(
-            {
-                "username": user_data.username,
-                "email": user_data.email,
-                "password": hashed_password,
-                "verification_token": email_verification_token,
-                "role": UserRole.USER,  # Default role is USER
-            }
-        )
+        # Rely on the unique email constraint instead of checking first
+        try:
+            new_user = await self.repository.create(
+                {
+                    "username": user_data.username,
+                    "email": user_data.email,
+                    "password": hashed_password,
+                    "verification_token": email_verification_token,
+                    "avatar_url": GravatarService.url(user_data.email),
+                    "role": UserRole.USER,  # Default role is USER
+                },
+                # The outbox relay sends the verification email
+                outbox_job="send_verification_email",
+            )
+        except IntegrityError:
+            await self.repository.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Email already registered"
+            )
 
-        # Send verification email
-        await self.email_service.send_verification_email(
-            new_user.email, new_user.username, email_verification_token
-        )
+        # A reset request made before registering may be remembered as unknown
+        await RedisService.delete(AuthService.password_reset_key(new_user.email))
 
         return new_user
 
@@ -117,22 +121,20 @@ class AuthService:
         Raises:
             HTTPException: If token is invalid or email already verified
         """
-        user = await self.repository.get_by_email_verification_token(token)
+        user = await self.repository.verify_email_token(token)
 
         if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Invalid verification token",
-            )
-
-        if user.email_verified:
+            # Only the error path needs to tell an unknown token from a used one
+            user = await self.repository.get_by_email_verification_token(token)
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Invalid verification token",
+                )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Email already verified"
             )
 
-        user.email_verified = True
-        user.verification_token = None
-        await self.repository.update(user)
         await AuthService.invalidate_user_cache(user.email)
 
         # Update user in cache if exists
@@ -144,41 +146,54 @@ class AuthService:
     async def request_password_reset(self, email: str):
         """Request a password reset.
 
+        Repeated requests for the same email within
+        ``PASSWORD_RESET_COALESCE_SECONDS`` are coalesced: the token issued by
+        the first one stays valid and no new token or email is produced.
+        Requests for unregistered emails are remembered for
+        ``PASSWORD_RESET_UNKNOWN_EMAIL_TTL`` seconds so they skip the database.
+        The response is the same in every case to prevent user enumeration.
+
         Args:
             email (str): Email address to reset password for
 
         Returns:
             dict: Success message
-
-        Raises:
-            HTTPException: If user not found
         """
-        user = await self.repository.get_by_email(email)
-        if not user:
-            # Return success even if email doesn't exist to prevent user enumeration
-            return {
-                "message": "If your email is registered, you will receive a password reset link"
-            }
+        response = {
+            "message": "If your email is registered, you will receive a password reset link"
+        }
+        key = AuthService.password_reset_key(email)
+        if not await RedisService.add(
+            key, RESET_PENDING, ttl=settings.PASSWORD_RESET_COALESCE_SECONDS
+        ):
+            # Either a request is already pending, or Redis is unavailable and
+            # the request goes ahead uncoalesced
+            if await RedisService.get(key) is not None:
+                return response
 
-        # Generate and store reset token
         reset_token = str(uuid.uuid4())
-        user.reset_password_token = reset_token
-        user.reset_token_expires = (
-            datetime.now(timezone.utc) + timedelta(hours=24)
-        ).replace(tzinfo=None)
-        await self.repository.update(user)
+        expires = (datetime.now(timezone.utc) + timedelta(hours=24)).replace(
+            tzinfo=None
+        )
+        try:
+            # The outbox relay sends the reset email
+            user = await self.repository.set_reset_password_token(
+                email, reset_token, expires, outbox_job="send_password_reset_email"
+            )
+        except BaseException:
+            # Let the next request try again
+            await RedisService.delete(key)
+            raise
+        if not user:
+            await RedisService.set(
+                key, RESET_UNKNOWN_EMAIL, ttl=settings.PASSWORD_RESET_UNKNOWN_EMAIL_TTL
+            )
+            return response
 
         # Invalidate user cache
         await AuthService.invalidate_user_cache(user.email)
 
-        # Send reset email
-        await self.email_service.send_password_reset_email(
-            user.email, user.username, reset_token
-        )
-
-        return {
-            "message": "If your email is registered, you will receive a password reset link"
-        }
+        return response
 
     async def reset_password(self, token: str, new_password: str):
         """Reset a user's password.
@@ -193,29 +208,26 @@ class AuthService:
         Raises:
             HTTPException: If token is invalid or expired
         """
-        user = await self.repository.get_by_reset_password_token(token)
+        hashed_password = self.get_password_hash(new_password)
+        user = await self.repository.reset_password_by_token(
+            token, hashed_password, datetime.now(timezone.utc).replace(tzinfo=None)
+        )
 
         if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Invalid reset token",
-            )
-
-        # Check if token has expired
-        if user.reset_token_expires and user.reset_token_expires < datetime.now(
-            timezone.utc
-        ).replace(tzinfo=None):
+            # Only the error path needs to tell an unknown token from an expired one
+            if not await self.repository.get_by_reset_password_token(token):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Invalid reset token",
+                )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Reset token has expired",
             )
 
-        # Update password
-        hashed_password = self.get_password_hash(new_password)
-        await self.repository.update_password(user, hashed_password)
-
-        # Invalidate user cache
+        # Invalidate user cache and allow new reset requests
         await AuthService.invalidate_user_cache(user.email)
+        await RedisService.delete(AuthService.password_reset_key(user.email))
 
         return {"message": "Password reset successfully"}
 
@@ -247,11 +259,19 @@ class AuthService:
 
     @staticmethod
     async def get_current_user(
-        token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+        request: Request,
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_db),
     ) -> User:
         """Get the current authenticated user from a JWT token.
 
+        The user is also stored in ``request.state.current_user`` for
+        rate limiting and read replica routing. On a cache hit it is built
+        from the cached fields and not added to the session, so it must only
+        be read; code changing the user loads the stored row by its ID.
+
         Args:
+            request (Request): FastAPI request object
             token (str): JWT access token
             db (AsyncSession): Database session
 
@@ -285,21 +305,23 @@ class AuthService:
             cached_user_info
             and isinstance(cached_user_info, dict)
             and "id" in cached_user_info
+            and "created_at" in cached_user_info
         ):
-            try:
-                user = User(
-                    id=cached_user_info.get("id"),
-                    username=cached_user_info.get("username"),
-                    email=email,
-                    password="",
-                    role=cached_user_info.get("role"),
-                    email_verified=cached_user_info.get("email_verified", False),
-                    avatar_url=cached_user_info.get("avatar_url"),
-                )
-                await db.refresh(user)
-                return user
-            except Exception:
-                pass
+            user = User(
+                id=cached_user_info.get("id"),
+                username=cached_user_info.get("username"),
+                email=email,
+                password="",
+                role=cached_user_info.get("role"),
+                email_verified=cached_user_info.get("email_verified", False),
+                avatar_url=cached_user_info.get("avatar_url"),
+                created_at=cached_user_info.get("created_at"),
+            )
+            # The user is built from the cache and kept out of the session, so
+            # a cache hit does not query the database. It is only good for
+            # reading: code writing the user loads the stored row first.
+            request.state.current_user = user
+            return user
 
         repository = UserRepository(db)
         user = await repository.get_by_email(email)
@@ -314,9 +336,11 @@ class AuthService:
             "role": user.role,
             "email_verified": user.email_verified,
             "avatar_url": user.avatar_url,
+            "created_at": user.created_at,
         }
         await RedisService.set(cache_key, user_info)
 
+        request.state.current_user = user
         return user
 
     @staticmethod
@@ -331,9 +355,21 @@ class AuthService:
         Returns:
             bool: True if cache was invalidated, False otherwise
         """
-        cache_key = f"user_info:{email}"
+        cache_key = f"user:{email}"
         return await RedisService.delete(cache_key)
 
+    @staticmethod
+    def password_reset_key(email: str) -> str:
+        """Get the cache key that coalesces password reset requests.
+
+        Args:
+            email (str): Email address the reset is requested for
+
+        Returns:
+            str: Cache key
+        """
+        return f"password-reset:{email}"
+
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash.
@@ -0,0 +1,90 @@
+"""Avatar processing job tracking for the Contacts API.
+
+Avatars uploaded in asynchronous mode are processed after the response has
+been sent. This module records the state of each such job in Redis, where
+any API process can report it, until ``AVATAR_JOB_TTL`` expires.
+
+A job goes from ``pending`` to ``processing`` and ends as ``done``, with the
+new avatar URL, or ``failed``, with an error message.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from src.conf.config import settings
+from src.services.redis_service import RedisService
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+class AvatarJobs:
+    """Store of avatar processing job states."""
+
+    @staticmethod
+    def key(job_id: str) -> str:
+        """Get the cache key of a job.
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            str: Cache key
+        """
+        return f"avatar-job:{job_id}"
+
+    @classmethod
+    async def create(cls, user_id: int) -> dict | None:
+        """Record a new pending job.
+
+        Args:
+            user_id (int): ID of the user whose avatar is processed
+
+        Returns:
+            dict | None: Job state, None if it could not be recorded
+        """
+        job = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "status": PENDING,
+            "avatar_url": None,
+            "error": None,
+            "created_at": datetime.now(timezone.utc),
+        }
+        if not await RedisService.set(cls.key(job["id"]), job, settings.AVATAR_JOB_TTL):
+            return None
+        return job
+
+    @classmethod
+    async def get(cls, job_id: str, user_id: int) -> dict | None:
+        """Get the state of a job.
+
+        Args:
+            job_id (str): Job ID
+            user_id (int): ID of the user asking, who must own the job
+
+        Returns:
+            dict | None: Job state, None if the job does not exist, has
+            expired or belongs to another user
+        """
+        job = await RedisService.get(cls.key(job_id))
+        if not isinstance(job, dict) or job.get("user_id") != user_id:
+            return None
+        return job
+
+    @classmethod
+    async def update(cls, job: dict, **changes) -> dict:
+        """Update the state of a job.
+
+        Args:
+            job (dict): Current job state
+            **changes: Fields to change
+
+        Returns:
+            dict: New job state
+        """
+        job = {**job, **changes}
+        await RedisService.set(cls.key(job["id"]), job, settings.AVATAR_JOB_TTL)
+        return job
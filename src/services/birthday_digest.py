@@ -0,0 +1,155 @@
+"""Daily birthday digest job.
+
+This module builds one email per user listing their contacts' upcoming
+birthdays and hands the emails to the email queue. It is run by the
+scheduler in every API process; a Redis lock makes sure only one of them
+does the work. Each digest is queued with an idempotency key per user and
+day, so a run repeated after a crash never emails a user twice.
+"""
+
+import contextlib
+import logging
+from datetime import date
+from typing import AsyncIterator
+
+from redis.exceptions import LockError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repository.contacts import ContactsRepository
+from src.services.email_queue import EmailQueue
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger("uvicorn.error")
+
+LOCK_KEY = "lock:birthday-digest"
+DONE_KEY = "birthday-digest:done:{day}"
+# Idempotency key of a user's digest email
+JOB_KEY = "digest:{day}:{user_id}"
+
+
+class BirthdayDigestService:
+    """Service for building and queuing birthday digest emails."""
+
+    @staticmethod
+    async def iter_digests(
+        db: AsyncSession, today: date, days: int
+    ) -> AsyncIterator[dict]:
+        """Group upcoming birthdays by the user who owns the contacts.
+
+        Args:
+            db (AsyncSession): Database session
+            today (date): First day of the window
+            days (int): Length of the window in days
+
+        Yields:
+            dict: User's ``user_id``, ``email`` and ``username`` and their
+            ``contacts``, soonest birthday first
+        """
+        digest = None
+        rows = ContactsRepository(db).stream_upcoming_birthdays(today, days)
+        async for row in rows:
+            if digest is None or digest["user_id"] != row["user_id"]:
+                if digest is not None:
+                    yield BirthdayDigestService._finish(digest, today)
+                digest = {
+                    "user_id": row["user_id"],
+                    "email": row["user_email"],
+                    "username": row["username"],
+                    "contacts": [],
+                }
+            digest["contacts"].append(
+                {
+                    "first_name": row["first_name"],
+                    "last_name": row["last_name"],
+                    "birthday": row["birthday"].isoformat(),
+                }
+            )
+        if digest is not None:
+            yield BirthdayDigestService._finish(digest, today)
+
+    @staticmethod
+    def _finish(digest: dict, today: date) -> dict:
+        """Sort a digest's contacts by how soon their birthday is.
+
+        Args:
+            digest (dict): Digest being built
+            today (date): First day of the window
+
+        Returns:
+            dict: The digest with its contacts sorted
+        """
+        today_key = (today.month, today.day)
+
+        def days_ahead(contact: dict) -> tuple:
+            birthday = date.fromisoformat(contact["birthday"])
+            key = (birthday.month, birthday.day)
+            # Birthdays after the new year come after December ones
+            return (key < today_key, key)
+
+        return {
+            "user_id": digest["user_id"],
+            "email": digest["email"],
+            "username": digest["username"],
+            "contacts": sorted(digest["contacts"], key=days_ahead),
+        }
+
+    @staticmethod
+    async def run(today: date | None = None) -> int:
+        """Queue today's birthday digests unless another process already has.
+
+        Args:
+            today (date | None): Day to build the digest for, today by default
+
+        Returns:
+            int: Number of digest emails queued by this call
+        """
+        today = today or date.today()
+        client = RedisService.client()
+        done_key = DONE_KEY.format(day=today.isoformat())
+        lock = client.lock(
+            LOCK_KEY, timeout=settings.BIRTHDAY_DIGEST_LOCK_TIMEOUT, blocking=False
+        )
+        if not await lock.acquire():
+            logger.info("Birthday digest is already running in another process")
+            return 0
+        try:
+            if await client.exists(done_key):
+                return 0
+
+            queued = 0
+            batch = []
+            keys = []
+            async with sessionmanager.read_session() as db:
+                digests = BirthdayDigestService.iter_digests(
+                    db, today, settings.BIRTHDAY_DIGEST_DAYS
+                )
+                async for digest in digests:
+                    batch.append(
+                        (
+                            "send_birthday_digest_email",
+                            digest["email"],
+                            digest["username"],
+                            digest["contacts"],
+                        )
+                    )
+                    keys.append(
+                        JOB_KEY.format(day=today.isoformat(), user_id=digest["user_id"])
+                    )
+                    if len(batch) >= settings.BIRTHDAY_DIGEST_BATCH_SIZE:
+                        await EmailQueue.enqueue_many(batch, keys=keys)
+                        queued += len(batch)
+                        batch = []
+                        keys = []
+            await EmailQueue.enqueue_many(batch, keys=keys)
+            queued += len(batch)
+
+            # Keep the marker past midnight so a late process cannot rerun the day
+            await client.set(done_key, queued, ex=2 * 24 * 3600)
+            logger.info(f"Queued {queued} birthday digest emails")
+            return queued
+        finally:
+            # The lock may have expired during a very long run
+            with contextlib.suppress(LockError):
+                await lock.release()
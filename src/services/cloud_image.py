@@ -1,11 +1,19 @@
 """Cloudinary image service for the Contacts API.
 
 This module provides functionality for uploading and deleting images using Cloudinary.
+
+The Cloudinary SDK is synchronous, so its calls run on a small dedicated
+thread pool instead of the event loop. The pool size caps how many calls are
+in flight at once, and every call is bounded by ``CLOUDINARY_TIMEOUT``.
 """
 
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
 import cloudinary
 import cloudinary.uploader
-from typing import Optional
 
 
 from src.conf.config import settings
@@ -25,8 +33,53 @@ class CloudImage:
     using the Cloudinary service.
     """
 
-    @staticmethod
-    async def upload(file, public_id: Optional[str] = None) -> dict:
+    # Class-level executor for Cloudinary calls, created on first use
+    _executor: ThreadPoolExecutor | None = None
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Get or create the executor that runs Cloudinary calls.
+
+        Returns:
+            ThreadPoolExecutor: Executor with ``CLOUDINARY_MAX_CONCURRENCY`` threads
+        """
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=settings.CLOUDINARY_MAX_CONCURRENCY,
+                thread_name_prefix="cloudinary",
+            )
+        return cls._executor
+
+    @classmethod
+    async def _run(cls, call: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking Cloudinary call on the executor.
+
+        The SDK gets the timeout too, so a call that times out also frees
+        its thread instead of holding it until the server answers.
+
+        Args:
+            call (Callable[..., Any]): Cloudinary SDK function
+            *args: Positional arguments for the call
+            **kwargs: Keyword arguments for the call
+
+        Returns:
+            Any: Result of the call
+
+        Raises:
+            TimeoutError: If the call did not finish within ``CLOUDINARY_TIMEOUT``
+                seconds, including the time spent waiting for a free thread
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            cls._get_executor(),
+            functools.partial(
+                call, *args, timeout=settings.CLOUDINARY_TIMEOUT, **kwargs
+            ),
+        )
+        return await asyncio.wait_for(future, settings.CLOUDINARY_TIMEOUT)
+
+    @classmethod
+    async def upload(cls, file, public_id: Optional[str] = None) -> dict:
         """Upload an image to Cloudinary.
 
         Args:
@@ -35,12 +88,14 @@ class CloudImage:
 
         Returns:
             dict: Cloudinary upload response containing image details
+
+        Raises:
+            TimeoutError: If the upload did not finish in time
         """
-        r = cloudinary.uploader.upload(file, public_id=public_id)
-        return r
+        return await cls._run(cloudinary.uploader.upload, file, public_id=public_id)
 
-    @staticmethod
-    async def delete(public_id: str) -> dict:
+    @classmethod
+    async def delete(cls, public_id: str) -> dict:
         """Delete an image from Cloudinary.
 
         Args:
@@ -48,6 +103,15 @@ class CloudImage:
 
         Returns:
             dict: Cloudinary delete response
+
+        Raises:
+            TimeoutError: If the delete did not finish in time
         """
-        r = cloudinary.uploader.destroy(public_id)
-        return r
+        return await cls._run(cloudinary.uploader.destroy, public_id)
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the executor, dropping calls that have not started yet."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
@@ -4,13 +4,22 @@ This module provides business logic for managing contacts, including CRUD operat
 and special queries like upcoming birthdays.
 """
 
+import json
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 
-from src.repository.contacts import ContactsRepository
-from src.schemas.contact import ContactCreate, ContactResponse, ContactUpdate
+from src.conf.config import settings
+from src.repository.contacts import CONTACT_RESPONSE_FIELDS, ContactsRepository
+from src.schemas.contact import (
+    ContactCreate,
+    ContactResponse,
+    ContactUpdate,
+    ContactUpsert,
+)
 from src.exceptions.contact import ContactAlreadyExists
+from src.services.redis_service import RedisService
 
 
 class ContactsService:
@@ -48,6 +57,21 @@ class ContactsService:
         except ContactAlreadyExists as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    async def upsert_contact_by_email(
+        self, email: str, contact: ContactUpsert, user_id: int
+    ) -> dict:
+        """Create or replace a contact identified by its email.
+
+        Args:
+            email (str): Email identifying the contact
+            contact (ContactUpsert): Contact data to store
+            user_id (int): ID of the user who owns the contact
+
+        Returns:
+            dict: Contact response fields of the stored contact
+        """
+        return await self.repository.upsert_contact_by_email(email, contact, user_id)
+
     async def get_contacts(
         self,
         skip: int,
@@ -56,7 +80,8 @@ class ContactsService:
         last_name: Optional[str],
         email: Optional[str],
         user_id: int,
-    ) -> List[ContactResponse]:
+        fields: Optional[List[str]] = None,
+    ) -> List[dict]:
         """Get a list of contacts with optional filtering.
 
         Args:
@@ -66,24 +91,135 @@ class ContactsService:
             last_name (Optional[str]): Filter by last name
             email (Optional[str]): Filter by email
             user_id (int): ID of the user whose contacts to retrieve
+            fields (Optional[List[str]]): Response fields to return, as
+                parsed by ``parse_fields``; all of them if None
 
         Returns:
-            List[ContactResponse]: List of contacts matching the criteria
+            List[dict]: Requested contact response fields of the matching contacts
         """
         return await self.repository.get_contacts(
-            skip, limit, first_name, last_name, email, user_id
+            skip, limit, first_name, last_name, email, user_id, fields
         )
 
-    async def get_upcoming_birthdays(self, user_id: int) -> List[ContactResponse]:
+    @staticmethod
+    def count_cache_key(
+        user_id: int,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        email: Optional[str],
+        estimate: bool,
+    ) -> str:
+        """Get the cache key of a filtered contact count.
+
+        Args:
+            user_id (int): ID of the user whose contacts are counted
+            first_name (Optional[str]): First name filter
+            last_name (Optional[str]): Last name filter
+            email (Optional[str]): Email filter
+            estimate (bool): Whether the count may be an estimate
+
+        Returns:
+            str: Redis key
+        """
+        filters = json.dumps([first_name, last_name, email])
+        mode = "estimate" if estimate else "exact"
+        return f"contact-count:{user_id}:{mode}:{filters}"
+
+    async def count_contacts(
+        self,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        email: Optional[str],
+        user_id: int,
+        estimate: bool = False,
+    ) -> Tuple[int, bool]:
+        """Get the total number of contacts matching the list filters.
+
+        Unfiltered totals come from the user's contact counter and are
+        always exact. Filtered counts are cached for
+        ``CONTACT_COUNT_CACHE_TTL`` seconds, so they may lag behind recent
+        writes. With ``estimate``, the planner's estimate is returned when
+        it exceeds ``CONTACT_COUNT_ESTIMATE_THRESHOLD``, sparing a count of
+        a huge result set; smaller results are still counted exactly.
+
+        Args:
+            first_name (Optional[str]): Filter by first name
+            last_name (Optional[str]): Filter by last name
+            email (Optional[str]): Filter by email
+            user_id (int): ID of the user whose contacts to count
+            estimate (bool): Whether an estimate is acceptable
+
+        Returns:
+            Tuple[int, bool]: Number of contacts, and whether it is an estimate
+        """
+        if not (first_name or last_name or email):
+            return await self.repository.get_contacts_count(user_id), False
+
+        cache_key = self.count_cache_key(
+            user_id, first_name, last_name, email, estimate
+        )
+        cached = await RedisService.get(cache_key)
+        if cached is not None:
+            return cached
+
+        total = None
+        if estimate:
+            estimated = await self.repository.estimate_contacts(
+                first_name, last_name, email, user_id
+            )
+            if (
+                estimated is not None
+                and estimated > settings.CONTACT_COUNT_ESTIMATE_THRESHOLD
+            ):
+                total = (estimated, True)
+        if total is None:
+            count = await self.repository.count_contacts(
+                first_name, last_name, email, user_id
+            )
+            total = (count, False)
+        await RedisService.set(cache_key, total, settings.CONTACT_COUNT_CACHE_TTL)
+        return total
+
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+        """Parse a comma-separated list of contact response fields.
+
+        The contact ID is always included, so clients can still address
+        the contacts they list.
+
+        Args:
+            fields (Optional[str]): Field names, e.g. ``first_name,phone``
+
+        Returns:
+            Optional[List[str]]: Field names in response order, or None to
+                return all fields
+
+        Raises:
+            HTTPException: If a field name is unknown
+        """
+        if fields is None:
+            return None
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = names - CONTACT_RESPONSE_FIELDS.keys()
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown contact fields: {', '.join(sorted(unknown))}",
+            )
+        return [
+            name for name in CONTACT_RESPONSE_FIELDS if name in names or name == "id"
+        ]
+
+    async def get_upcoming_birthdays(self, user_id: int) -> List[dict]:
         """Get a list of contacts with upcoming birthdays.
 
         Args:
             user_id (int): ID of the user whose contacts to check
 
         Returns:
-            List[ContactResponse]: List of contacts with upcoming birthdays
+            List[dict]: Contact response fields of contacts with upcoming birthdays
         """
-        return await self.repository.get_upcoming_birthdays()
+        return await self.repository.get_upcoming_birthdays(user_id)
 
     async def get_contact(self, contact_id: int, user_id: int) -> ContactResponse:
         """Get a specific contact by ID.
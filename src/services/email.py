@@ -1,11 +1,16 @@
 """Email service for the Contacts API.
 
 This module provides functionality for sending emails, including email verification.
+Messages are rendered from the email templates and sent over a process-wide
+pool of persistent SMTP sessions.
 """
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+from email.message import EmailMessage
+from email.utils import formataddr
+
 from src.conf.config import settings
-from pathlib import Path
+from src.services.email_templates import EmailTemplates
+from src.services.smtp_pool import SMTPConnectionPool
 
 
 class EmailService:
@@ -15,22 +20,103 @@ class EmailService:
     including email verification.
     """
 
-    config = ConnectionConfig(
-        MAIL_USERNAME=settings.MAIL_USERNAME,
-        MAIL_PASSWORD=settings.MAIL_PASSWORD,
-        MAIL_FROM=settings.MAIL_FROM,
-        MAIL_PORT=settings.MAIL_PORT,
-        MAIL_SERVER=settings.MAIL_SERVER,
-        MAIL_FROM_NAME="Example email",
-        MAIL_STARTTLS=False,
-        MAIL_SSL_TLS=True,
-        USE_CREDENTIALS=True,
-        VALIDATE_CERTS=True,
-    )
-
-    def __init__(self):
-        """Initialize the email service with FastMail configuration."""
-        self.fast_mail = FastMail(self.config)
+    # Class-level SMTP pool shared by all instances, created on first use
+    _pool: SMTPConnectionPool | None = None
+
+    def __init__(self, pool: SMTPConnectionPool | None = None):
+        """Initialize the email service.
+
+        Args:
+            pool (SMTPConnectionPool | None): SMTP pool to send through,
+                the shared pool if not given
+        """
+        self.pool = pool or self.get_pool()
+
+    @classmethod
+    def get_pool(cls) -> SMTPConnectionPool:
+        """Get or create the shared SMTP connection pool.
+
+        Returns:
+            SMTPConnectionPool: Pool configured from the mail settings
+        """
+        if cls._pool is None:
+            cls._pool = SMTPConnectionPool(
+                hostname=settings.MAIL_SERVER,
+                port=settings.MAIL_PORT,
+                username=settings.MAIL_USERNAME,
+                password=settings.MAIL_PASSWORD.get_secret_value(),
+                use_tls=True,
+                validate_certs=True,
+                size=settings.MAIL_POOL_SIZE,
+                max_messages_per_connection=settings.MAIL_MAX_MESSAGES_PER_CONNECTION,
+                timeout=settings.MAIL_TIMEOUT,
+            )
+        return cls._pool
+
+    @classmethod
+    async def close(cls):
+        """Close the shared SMTP connections."""
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+
+    @staticmethod
+    def build_message(
+        recipient: str, subject: str, text: str, html: str
+    ) -> EmailMessage:
+        """Build a plain-text and HTML email from the application's sender.
+
+        Args:
+            recipient (str): Recipient's email address
+            subject (str): Email subject
+            text (str): Plain-text body
+            html (str): HTML body
+
+        Returns:
+            EmailMessage: Message ready to send
+
+        Raises:
+            ValueError: If ``MAIL_FROM`` is not set, which would send the
+                message with a null reverse-path
+        """
+        if not settings.MAIL_FROM:
+            raise ValueError("MAIL_FROM is not set")
+        message = EmailMessage()
+        message["From"] = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(text)
+        message.add_alternative(html, subtype="html")
+        return message
+
+    @classmethod
+    def render_message(
+        cls, recipient: str, subject: str, template: str, **context
+    ) -> EmailMessage:
+        """Build an email from one of the email templates.
+
+        Args:
+            recipient (str): Recipient's email address
+            subject (str): Email subject
+            template (str): Template name without extension
+            **context: Template variables
+
+        Returns:
+            EmailMessage: Message ready to send
+
+        Raises:
+            ValueError: If ``MAIL_FROM`` is not set
+        """
+        text, html = EmailTemplates.render(template, **context)
+        return cls.build_message(recipient, subject, text, html)
+
+    async def send_messages(self, messages: list[EmailMessage]):
+        """Send several messages, reusing SMTP sessions between them.
+
+        Args:
+            messages (list[EmailMessage]): Messages to send
+        """
+        await self.pool.send_many(messages)
 
     async def send_verification_email(self, email: str, username: str, token: str):
         """Send an email verification link to a user.
@@ -40,15 +126,11 @@ class EmailService:
             username (str): User's display name
             token (str): Email verification token
         """
-        message = MessageSchema(
-            subject="Verify your email",
-            recipients=[email],
-            body=f"Hi {username}, please verify your email by clicking on this link: "
-            f"http://localhost:8000/api/auth/verify/{token}",
-            subtype=MessageType.html,
+        message = self.render_message(
+            email, "Verify your email", "verification", username=username, token=token
         )
 
-        await self.fast_mail.send_message(message)
+        await self.pool.send(message)
 
     async def send_password_reset_email(self, email: str, username: str, token: str):
         """Send a password reset link to a user.
@@ -58,14 +140,33 @@ class EmailService:
             username (str): User's display name
             token (str): Password reset token
         """
-        message = MessageSchema(
-            subject="Reset at contacts app",
-            recipients=[email],
-            body=f"Hi {username}, you requested to reset. "
-            f"Please click on this link to reset: "
-            f"http://localhost:8000/api/auth/reset-password/{token} "
-            f"If you didn't request this, please ignore this email.",
-            subtype=MessageType.html,
+        message = self.render_message(
+            email,
+            "Reset at contacts app",
+            "password_reset",
+            username=username,
+            token=token,
+        )
+
+        await self.pool.send(message)
+
+    async def send_birthday_digest_email(
+        self, email: str, username: str, contacts: list[dict]
+    ):
+        """Send a user the list of their contacts' upcoming birthdays.
+
+        Args:
+            email (str): User's email address
+            username (str): User's display name
+            contacts (list[dict]): Contacts with ``first_name``, ``last_name``
+                and ISO-formatted ``birthday``
+        """
+        message = self.render_message(
+            email,
+            "Upcoming birthdays",
+            "birthday_digest",
+            username=username,
+            contacts=contacts,
         )
 
-        await self.fast_mail.send_message(message)
+        await self.pool.send(message)
@@ -0,0 +1,355 @@
+"""Redis-backed email delivery queue.
+
+This module hands emails off to a background worker, so the processes that
+produce them never talk to the SMTP server themselves.
+
+Jobs are JSON documents pushed onto a Redis list. A worker moves the jobs it
+takes into its own processing list and removes them only once they are sent
+or rescheduled, so a worker that dies mid-send leaves its jobs behind for the
+next worker to requeue. Workers prove they are alive with a heartbeat key.
+
+Failed jobs are scheduled for another attempt in a sorted set scored by the
+time they become due, with an exponentially growing delay. Jobs that keep
+failing are moved to a dead-letter list for inspection.
+
+A job may carry an idempotency key. The worker marks the key as sent after
+a successful send and skips jobs whose key is marked, so a job that was
+queued twice, such as an outbox message relayed again after a failed commit,
+is sent only once.
+"""
+
+import json
+import logging
+import time
+import uuid
+
+from src.conf.config import settings
+from src.services.email import EmailService
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger("uvicorn.error")
+
+QUEUE_KEY = "email:queue"
+RETRY_KEY = "email:retry"
+DEAD_LETTER_KEY = "email:dead"
+PROCESSING_KEY = "email:processing:{worker_id}"
+HEARTBEAT_KEY = "email:worker:{worker_id}"
+WORKERS_KEY = "email:workers"
+SENT_KEY_PREFIX = "email:sent:"
+# How long a sent idempotency key keeps duplicates of its job from sending
+SENT_KEY_TTL = 7 * 24 * 60 * 60
+
+# EmailService methods a job may call
+EMAIL_JOBS = (
+    "send_verification_email",
+    "send_password_reset_email",
+    "send_birthday_digest_email",
+)
+
+# Move due jobs from the retry set back onto the queue in one atomic step,
+# so two workers never promote the same job twice
+_PROMOTE_DUE_JOBS = """
+local jobs = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, job in ipairs(jobs) do
+    redis.call('ZREM', KEYS[1], job)
+    redis.call('RPUSH', KEYS[2], job)
+end
+return #jobs
+"""
+
+# Put the jobs of a worker whose heartbeat expired back at the head of the
+# queue, oldest first, and forget the worker
+_REQUEUE_ABANDONED_JOBS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return -1
+end
+local moved = 0
+while redis.call('LMOVE', KEYS[2], KEYS[3], 'RIGHT', 'LEFT') do
+    moved = moved + 1
+end
+redis.call('SREM', KEYS[4], ARGV[1])
+return moved
+"""
+
+
+class EmailQueue:
+    """Queue of emails waiting to be delivered by the email worker."""
+
+    @staticmethod
+    def _payload(job: str, args: tuple, key: str | None = None) -> str:
+        """Serialize a new job.
+
+        Args:
+            job (str): Name of the ``EmailService`` method that sends the email
+            args (tuple): JSON-serializable arguments for that method
+            key (str | None): Idempotency key shared by copies of the job
+
+        Returns:
+            str: JSON job document
+
+        Raises:
+            ValueError: If ``job`` is not a known email job
+        """
+        if job not in EMAIL_JOBS:
+            raise ValueError(f"Unknown email job: {job}")
+        return json.dumps(
+            {
+                "id": str(uuid.uuid4()),
+                "job": job,
+                "args": list(args),
+                "attempts": 0,
+                "enqueued_at": time.time(),
+                "key": key,
+            }
+        )
+
+    @staticmethod
+    async def enqueue(job: str, *args) -> bool:
+        """Add an email to the delivery queue.
+
+        Args:
+            job (str): Name of the ``EmailService`` method that sends the email
+            *args: JSON-serializable arguments for that method, starting with
+                the recipient's email address
+
+        Returns:
+            bool: True if the job was queued, False if Redis is unavailable
+
+        Raises:
+            ValueError: If ``job`` is not a known email job
+        """
+        payload = EmailQueue._payload(job, args)
+        try:
+            await RedisService.client().rpush(QUEUE_KEY, payload)
+            return True
+        except Exception as e:
+            logger.error(f"Could not queue {job} for {args[0]}: {e}")
+            return False
+
+    @staticmethod
+    async def enqueue_many(jobs: list[tuple], keys: list[str] | None = None) -> None:
+        """Add several emails to the delivery queue in one round trip.
+
+        Args:
+            jobs (list[tuple]): Job name followed by its arguments, per email
+            keys (list[str] | None): Idempotency key per email
+
+        Raises:
+            ValueError: If a job name is not a known email job
+            redis.RedisError: If Redis is unavailable
+        """
+        if not jobs:
+            return
+        keys = keys or [None] * len(jobs)
+        payloads = [
+            EmailQueue._payload(job, args, key) for (job, *args), key in zip(jobs, keys)
+        ]
+        await RedisService.client().rpush(QUEUE_KEY, *payloads)
+
+    @staticmethod
+    async def promote_due_retries(limit: int = 100) -> int:
+        """Move retries whose backoff has elapsed back onto the queue.
+
+        Args:
+            limit (int): Maximum number of jobs to move
+
+        Returns:
+            int: Number of jobs moved
+        """
+        return await RedisService.client().eval(
+            _PROMOTE_DUE_JOBS, 2, RETRY_KEY, QUEUE_KEY, time.time(), limit
+        )
+
+    @staticmethod
+    async def heartbeat(worker_id: str) -> None:
+        """Register a worker and mark it as alive.
+
+        The worker must call this more often than
+        ``EMAIL_WORKER_HEARTBEAT_SECONDS``, or its processing list is
+        requeued by the next worker that starts.
+
+        Args:
+            worker_id (str): Unique id of the worker process
+        """
+        async with RedisService.client().pipeline(transaction=False) as pipe:
+            pipe.sadd(WORKERS_KEY, worker_id)
+            pipe.set(
+                HEARTBEAT_KEY.format(worker_id=worker_id),
+                1,
+                ex=settings.EMAIL_WORKER_HEARTBEAT_SECONDS,
+            )
+            await pipe.execute()
+
+    @staticmethod
+    async def stop_heartbeat(worker_id: str) -> None:
+        """Mark a stopped worker as gone.
+
+        Jobs still in its processing list are requeued by the next worker
+        that starts.
+
+        Args:
+            worker_id (str): Unique id of the worker process
+        """
+        await RedisService.client().delete(HEARTBEAT_KEY.format(worker_id=worker_id))
+
+    @staticmethod
+    async def requeue_abandoned() -> int:
+        """Put the jobs of workers that stopped mid-send back onto the queue.
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        client = RedisService.client()
+        requeued = 0
+        for worker_id in await client.smembers(WORKERS_KEY):
+            if isinstance(worker_id, bytes):
+                worker_id = worker_id.decode()
+            moved = await client.eval(
+                _REQUEUE_ABANDONED_JOBS,
+                4,
+                HEARTBEAT_KEY.format(worker_id=worker_id),
+                PROCESSING_KEY.format(worker_id=worker_id),
+                QUEUE_KEY,
+                WORKERS_KEY,
+                worker_id,
+            )
+            requeued += max(moved, 0)
+        return requeued
+
+    @staticmethod
+    async def dequeue(
+        worker_id: str, timeout: float = 1, max_jobs: int = 1
+    ) -> list[bytes]:
+        """Move jobs from the queue to the worker's processing list.
+
+        Waits for the first job if the queue is empty. The jobs stay in the
+        processing list until ``process`` removes them.
+
+        Args:
+            worker_id (str): Unique id of the worker process
+            timeout (float): Seconds to wait for a job
+            max_jobs (int): Maximum number of jobs to take
+
+        Returns:
+            list[bytes]: Raw job payloads, empty if no job arrived in time
+        """
+        client = RedisService.client()
+        processing_key = PROCESSING_KEY.format(worker_id=worker_id)
+        item = await client.blmove(QUEUE_KEY, processing_key, timeout, "LEFT", "RIGHT")
+        if item is None:
+            return []
+        items = [item]
+        while len(items) < max_jobs:
+            item = await client.lmove(QUEUE_KEY, processing_key, "LEFT", "RIGHT")
+            if item is None:
+                break
+            items.append(item)
+        return items
+
+    @staticmethod
+    async def process(
+        payload: bytes, worker_id: str, email_service: EmailService
+    ) -> bool:
+        """Deliver a dequeued job and remove it from the processing list.
+
+        A job that could neither be sent nor rescheduled stays in the
+        processing list, to be requeued once the worker stops.
+
+        Args:
+            payload (bytes): Raw job payload returned by ``dequeue``
+            worker_id (str): Unique id of the worker process
+            email_service (EmailService): Service used to send the email
+
+        Returns:
+            bool: True if the email was sent or a copy of the job sent it
+        """
+        sent = await EmailQueue.deliver(json.loads(payload), email_service)
+        await RedisService.client().lrem(
+            PROCESSING_KEY.format(worker_id=worker_id), 1, payload
+        )
+        return sent
+
+    @staticmethod
+    def retry_delay(attempts: int) -> float:
+        """Get the backoff before the next attempt of a job.
+
+        Args:
+            attempts (int): Number of failed attempts so far
+
+        Returns:
+            float: Delay in seconds, doubling with every attempt
+        """
+        return min(
+            settings.EMAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+            settings.EMAIL_RETRY_MAX_DELAY,
+        )
+
+    @staticmethod
+    async def fail(job: dict, error: Exception) -> bool:
+        """Schedule a failed job for retry, or dead-letter it.
+
+        Args:
+            job (dict): Job payload
+            error (Exception): Error raised by the failed attempt
+
+        Returns:
+            bool: True if the job will be retried, False if it was dead-lettered
+        """
+        job = {**job, "attempts": job["attempts"] + 1, "last_error": repr(error)}
+        client = RedisService.client()
+        if job["attempts"] >= settings.EMAIL_MAX_ATTEMPTS:
+            await client.rpush(DEAD_LETTER_KEY, json.dumps(job))
+            return False
+        due = time.time() + EmailQueue.retry_delay(job["attempts"])
+        await client.zadd(RETRY_KEY, {json.dumps(job): due})
+        return True
+
+    @staticmethod
+    async def deliver(job: dict, email_service: EmailService) -> bool:
+        """Send the email described by a job.
+
+        A job with an idempotency key is skipped if a copy of it was sent
+        already. The key is marked as sent only after the email went out, so
+        a failed or interrupted send never blocks the retry.
+
+        Failures are handed to ``fail`` so the job is retried later.
+
+        Args:
+            job (dict): Job payload
+            email_service (EmailService): Service used to send the email
+
+        Returns:
+            bool: True if the email was sent or a copy of the job sent it
+
+        Raises:
+            redis.RedisError: If the failed job could not be rescheduled
+        """
+        sent_key = SENT_KEY_PREFIX + job["key"] if job.get("key") else None
+        try:
+            if job["job"] not in EMAIL_JOBS:
+                raise ValueError(f"Unknown email job: {job['job']}")
+            if sent_key is not None and await RedisService.client().exists(sent_key):
+                logger.info(f"Email job {job['id']} was already sent as {job['key']}")
+                return True
+            await getattr(email_service, job["job"])(*job["args"])
+        except Exception as e:
+            try:
+                retried = await EmailQueue.fail(job, e)
+            except Exception as redis_error:
+                logger.error(
+                    f"Could not reschedule email job {json.dumps(job)}: {redis_error}"
+                )
+                raise
+            logger.warning(
+                f"Email job {job['id']} failed on attempt {job['attempts'] + 1}"
+                f" ({'will retry' if retried else 'dead-lettered'}): {e}"
+            )
+            return False
+        if sent_key is not None:
+            try:
+                await RedisService.client().set(sent_key, job["id"], ex=SENT_KEY_TTL)
+            except Exception as e:
+                # The email is out: retrying it for a missing mark would send
+                # it twice
+                logger.warning(f"Could not mark {job['key']} as sent: {e}")
+        return True
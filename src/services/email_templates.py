@@ -0,0 +1,94 @@
+"""Email templates for the Contacts API.
+
+This module renders the plain-text and HTML bodies of outgoing emails from
+the Jinja2 templates in ``src/templates/email``. Templates are compiled once
+and kept in memory, so rendering a message only runs the compiled code.
+"""
+
+from datetime import date
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+from src.conf.config import settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+
+def format_birthday(value: str) -> str:
+    """Format an ISO birthday as month and day, e.g. ``May 01``.
+
+    Args:
+        value (str): ISO-formatted date
+
+    Returns:
+        str: Month name and day of month
+    """
+    return date.fromisoformat(value).strftime("%B %d")
+
+
+class EmailTemplates:
+    """Cache of compiled email templates.
+
+    Each email is a pair of templates, ``<name>.txt`` and ``<name>.html``.
+    HTML templates are autoescaped.
+    """
+
+    # Class-level Jinja2 environment (singleton)
+    _environment: Environment | None = None
+
+    @classmethod
+    def environment(cls) -> Environment:
+        """Get or create the Jinja2 environment.
+
+        Returns:
+            Environment: Environment with the application globals
+        """
+        if cls._environment is None:
+            environment = Environment(
+                loader=FileSystemLoader(TEMPLATES_DIR),
+                autoescape=select_autoescape(["html"]),
+                undefined=StrictUndefined,
+                # Templates do not change at runtime: never stat the files
+                # again and never evict a compiled template
+                auto_reload=False,
+                cache_size=-1,
+                trim_blocks=True,
+                lstrip_blocks=True,
+            )
+            environment.globals.update(
+                base_url=settings.APP_BASE_URL.rstrip("/"),
+                app_name=settings.MAIL_FROM_NAME,
+            )
+            environment.filters["birthday"] = format_birthday
+            cls._environment = environment
+        return cls._environment
+
+    @classmethod
+    def preload(cls) -> int:
+        """Compile every email template ahead of the first message.
+
+        Returns:
+            int: Number of templates compiled
+        """
+        environment = cls.environment()
+        names = environment.list_templates(extensions=["txt", "html"])
+        for name in names:
+            environment.get_template(name)
+        return len(names)
+
+    @classmethod
+    def render(cls, name: str, **context) -> tuple[str, str]:
+        """Render both variants of an email.
+
+        Args:
+            name (str): Template name without extension
+            **context: Template variables
+
+        Returns:
+            tuple[str, str]: Plain-text and HTML body
+        """
+        environment = cls.environment()
+        text = environment.get_template(f"{name}.txt").render(context)
+        html = environment.get_template(f"{name}.html").render(context)
+        return text, html
@@ -0,0 +1,71 @@
+"""Gravatar fallback avatars for the Contacts API.
+
+Users who have not uploaded an avatar get their Gravatar URL instead. The
+URL only depends on the email address, so it is computed once, stored in
+``avatar_url`` and served from the cached user like an uploaded avatar;
+nothing is hashed or fetched at request time.
+"""
+
+import logging
+
+from libgravatar import Gravatar
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repository.user_repository import UserRepository
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class GravatarService:
+    """Service for computing and backfilling Gravatar avatar URLs."""
+
+    @staticmethod
+    def url(email: str) -> str:
+        """Get the Gravatar image URL of an email address.
+
+        Args:
+            email (str): Email address
+
+        Returns:
+            str: Image URL, showing ``GRAVATAR_DEFAULT`` for unknown emails
+        """
+        return Gravatar(email).get_image(
+            size=settings.GRAVATAR_SIZE, default=settings.GRAVATAR_DEFAULT
+        )
+
+    @classmethod
+    async def backfill(cls, batch_size: int) -> int:
+        """Give every user without an avatar their Gravatar URL.
+
+        Users are processed in ID order, one transaction per batch, so the
+        job holds no long transaction and can be interrupted and run again.
+        Cached users of each batch are invalidated after it commits.
+
+        Args:
+            batch_size (int): Number of users updated per transaction
+
+        Returns:
+            int: Number of users updated
+        """
+        updated = 0
+        last_id = 0
+        while True:
+            async with sessionmanager.session() as db:
+                repository = UserRepository(db)
+                users = await repository.get_without_avatar(last_id, batch_size)
+                if not users:
+                    return updated
+                await repository.set_missing_avatar_urls(
+                    {user_id: cls.url(email) for user_id, email in users}
+                )
+            try:
+                await RedisService.client().delete(
+                    *(f"user:{email}" for _, email in users)
+                )
+            except Exception as e:
+                logger.warning(f"Could not invalidate cached users: {e}")
+            updated += len(users)
+            last_id = users[-1][0]
+            logger.info(f"Gravatar backfill: {updated} users updated")
@@ -0,0 +1,167 @@
+"""Avatar image processing for the Contacts API.
+
+This module turns uploaded images into fixed-size square WebP thumbnails.
+Decoding and encoding are CPU-bound, so they run in a pool of worker
+processes rather than on the event loop or in threads that would contend
+for the GIL. Re-encoding also drops all metadata (EXIF, GPS, ICC), after
+the EXIF orientation has been applied.
+
+Hashing and reading the upload run in a worker thread. An upload spooled to
+disk is passed to the worker process by its path, so the server never holds
+all of it in memory.
+
+Results are addressed by the SHA-256 of the uploaded bytes: the URLs
+produced for an image are cached under its digest, so uploading the same
+image again neither re-processes nor re-uploads it.
+"""
+
+import asyncio
+import hashlib
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO
+
+from PIL import Image, ImageOps
+
+from src.conf.config import settings
+
+# Thumbnail edge lengths in pixels, smallest first
+THUMBNAIL_SIZES = sorted(
+    int(size) for size in settings.AVATAR_THUMBNAIL_SIZES.split(",") if size.strip()
+)
+
+
+def make_thumbnails(
+    source: bytes | str, sizes: list[int], quality: int, max_pixels: int
+) -> dict[int, bytes]:
+    """Decode an image and encode square WebP thumbnails of it.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+
+    Args:
+        source (bytes | str): Encoded source image, or the path of its file
+        sizes (list[int]): Thumbnail edge lengths in pixels
+        quality (int): WebP quality, 0 to 100
+        max_pixels (int): Largest source image, in pixels, that is decoded
+
+    Returns:
+        dict[int, bytes]: WebP thumbnail per edge length
+
+    Raises:
+        PIL.UnidentifiedImageError: If the data is not a decodable image
+        Image.DecompressionBombError: If the image has too many pixels
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        # Opening only reads the header: refuse huge images before decoding
+        if image.width * image.height > max_pixels:
+            raise Image.DecompressionBombError(
+                f"Image has {image.width * image.height} pixels, limit is {max_pixels}"
+            )
+        # Let JPEG decode at a reduced scale when the source is much larger
+        # than the biggest thumbnail
+        image.draft("RGB", (max(sizes), max(sizes)))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    thumbnails = {}
+    for size in sizes:
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        # A freshly built image carries no EXIF or ICC data into the output
+        thumbnail.save(output, "WEBP", quality=quality, method=4)
+        thumbnails[size] = output.getvalue()
+    return thumbnails
+
+
+class ImageProcessor:
+    """Process pool that builds avatar thumbnails."""
+
+    # Class-level process pool, created on first use
+    _executor: ProcessPoolExecutor | None = None
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        """Get or create the worker process pool.
+
+        Workers are spawned rather than forked, so they never inherit locks
+        held by the server's threads.
+
+        Returns:
+            ProcessPoolExecutor: Pool with ``AVATAR_PROCESS_WORKERS`` processes
+        """
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(
+                max_workers=settings.AVATAR_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return cls._executor
+
+    @staticmethod
+    async def digest(file: BinaryIO) -> str:
+        """Hash a file's content in a worker thread and rewind it.
+
+        Args:
+            file (BinaryIO): File positioned at its start
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        digest = await asyncio.to_thread(hashlib.file_digest, file, "sha256")
+        file.seek(0)
+        return digest.hexdigest()
+
+    @classmethod
+    async def thumbnails(cls, file: BinaryIO) -> dict[int, bytes]:
+        """Build the avatar thumbnails of an image in a worker process.
+
+        A file with a path on disk is opened by the worker itself; other
+        files are read in a worker thread and their bytes are sent over.
+
+        Args:
+            file (BinaryIO): Image file positioned at its start
+
+        Returns:
+            dict[int, bytes]: WebP thumbnail per size in ``THUMBNAIL_SIZES``
+
+        Raises:
+            OSError: If the file is not a decodable image, e.g. a
+                ``PIL.UnidentifiedImageError`` or a truncated file
+            Image.DecompressionBombError: If the image has too many pixels
+            BrokenProcessPool: If a worker died; the pool is replaced for
+                the next call
+        """
+        path = getattr(file, "name", None)
+        if isinstance(path, str):
+            # Flush buffered writes so the worker sees the whole file
+            await asyncio.to_thread(file.flush)
+            source = path
+        else:
+            source = await asyncio.to_thread(file.read)
+        loop = asyncio.get_running_loop()
+        executor = cls._get_executor()
+        try:
+            return await loop.run_in_executor(
+                executor,
+                make_thumbnails,
+                source,
+                THUMBNAIL_SIZES,
+                settings.AVATAR_WEBP_QUALITY,
+                settings.AVATAR_MAX_PIXELS,
+            )
+        except BrokenProcessPool:
+            # A worker died, e.g. killed out of memory on a hostile image.
+            # A broken pool refuses all further work, so drop it unless a
+            # concurrent call already did.
+            if cls._executor is executor:
+                cls.shutdown()
+            raise
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the worker processes."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
@@ -0,0 +1,128 @@
+"""Image upload handling for the Contacts API.
+
+This module copies uploaded images into spooled temporary files chunk by
+chunk. Images up to ``AVATAR_SPOOL_MAX_SIZE`` stay in memory; larger ones
+are moved to a named temporary file on disk, after which a request holds
+one chunk of the upload in memory at a time, and image processing can read
+the file by its path. Writes to disk run in a worker thread so they do not
+block the event loop. An upload is rejected as soon as it grows past the
+size limit. The image format is taken from the file's magic bytes rather
+than the client's content type.
+"""
+
+import asyncio
+import io
+from tempfile import NamedTemporaryFile
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile, status
+
+from src.conf.config import settings
+
+# Leading bytes of the supported image formats
+IMAGE_SIGNATURES: tuple[tuple[bytes, str], ...] = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+# Number of leading bytes needed to recognize any supported format
+SNIFF_LENGTH = 12
+
+
+def sniff_image_type(header: bytes) -> str | None:
+    """Detect an image format from the first bytes of a file.
+
+    Args:
+        header (bytes): At least the first ``SNIFF_LENGTH`` bytes of the file
+
+    Returns:
+        str | None: MIME type of the image, None if it is not a supported image
+    """
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+    # WebP is a RIFF container: "RIFF", 4 bytes of size, then "WEBP"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def roll_over(spool: io.BytesIO, chunk: bytes) -> BinaryIO:
+    """Move an in-memory spool to a named temporary file.
+
+    Args:
+        spool (io.BytesIO): Upload received so far
+        chunk (bytes): Next chunk of the upload
+
+    Returns:
+        BinaryIO: Temporary file holding the spool followed by the chunk
+    """
+    file = NamedTemporaryFile()
+    try:
+        file.write(spool.getbuffer())
+        file.write(chunk)
+    except BaseException:
+        file.close()
+        raise
+    spool.close()
+    return file
+
+
+async def spool_image(file: UploadFile) -> tuple[BinaryIO, str]:
+    """Copy an uploaded image into memory or a temporary file.
+
+    Args:
+        file (UploadFile): Uploaded file
+
+    Returns:
+        tuple[BinaryIO, str]: File positioned at its start, and the image
+        MIME type sniffed from its content. The caller closes it.
+
+    Raises:
+        HTTPException: If the upload exceeds ``AVATAR_MAX_BYTES`` or is not
+            a supported image
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File must not exceed {settings.AVATAR_MAX_BYTES} bytes",
+    )
+    not_an_image = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an image"
+    )
+    # Trust a declared size only to reject early, never to accept
+    if file.size is not None and file.size > settings.AVATAR_MAX_BYTES:
+        raise too_large
+
+    spool: BinaryIO = io.BytesIO()
+    try:
+        header = b""
+        mime_type = None
+        size = 0
+        while chunk := await file.read(settings.AVATAR_UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > settings.AVATAR_MAX_BYTES:
+                raise too_large
+            if mime_type is None:
+                header += chunk[: SNIFF_LENGTH - len(header)]
+                if len(header) >= SNIFF_LENGTH:
+                    mime_type = sniff_image_type(header)
+                    if mime_type is None:
+                        raise not_an_image
+            if size <= settings.AVATAR_SPOOL_MAX_SIZE:
+                spool.write(chunk)
+            elif isinstance(spool, io.BytesIO):
+                spool = await asyncio.to_thread(roll_over, spool, chunk)
+            else:
+                await asyncio.to_thread(spool.write, chunk)
+        if mime_type is None:
+            # Files shorter than SNIFF_LENGTH
+            mime_type = sniff_image_type(header)
+            if mime_type is None:
+                raise not_an_image
+        spool.seek(0)
+        return spool, mime_type
+    except BaseException:
+        spool.close()
+        raise
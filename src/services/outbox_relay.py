@@ -0,0 +1,87 @@
+"""Outbox relay for the Contacts API.
+
+This module moves email jobs from the ``outbox`` table to the email queue.
+Jobs are written to the outbox in the same transaction as the change that
+causes them, so a crash can no longer lose an email. Relaying is
+at-least-once: messages are queued before the transaction marking them
+processed commits, so a crash in between queues them again on the next
+run. Each job carries its outbox ID as idempotency key, and the email
+worker sends only the first copy. The relay runs on a short interval in
+every API process; row locks keep concurrent relays from handing over the
+same message.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repository.outbox import OutboxRepository
+from src.services.email_queue import EmailQueue
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class OutboxRelay:
+    """Service for relaying outbox messages to the email queue."""
+
+    @staticmethod
+    async def relay_batch(limit: int) -> int:
+        """Hand one batch of pending outbox messages to the email queue.
+
+        The batch is claimed, queued and marked processed in one transaction.
+        If queuing fails, the transaction rolls back and the messages stay
+        pending for the next run. If the commit fails after queuing, the
+        messages are queued again later under the same idempotency keys.
+
+        Args:
+            limit (int): Maximum number of messages to relay
+
+        Returns:
+            int: Number of messages relayed
+        """
+        async with sessionmanager.session() as db:
+            repository = OutboxRepository(db)
+            messages = await repository.claim_pending(limit)
+            if not messages:
+                await db.rollback()
+                return 0
+            await EmailQueue.enqueue_many(
+                [(message.job, *message.payload) for message in messages],
+                keys=[f"outbox:{message.id}" for message in messages],
+            )
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            await repository.mark_processed([message.id for message in messages], now)
+            await db.commit()
+            return len(messages)
+
+    @staticmethod
+    async def run() -> int:
+        """Relay pending outbox messages until the outbox is drained.
+
+        Returns:
+            int: Number of messages relayed
+        """
+        relayed = 0
+        try:
+            while True:
+                count = await OutboxRelay.relay_batch(settings.OUTBOX_BATCH_SIZE)
+                relayed += count
+                if count < settings.OUTBOX_BATCH_SIZE:
+                    return relayed
+        except Exception as e:
+            logger.error(f"Outbox relay failed after {relayed} messages: {e}")
+            return relayed
+
+    @staticmethod
+    async def purge() -> int:
+        """Delete messages processed longer than the retention period ago.
+
+        Returns:
+            int: Number of deleted messages
+        """
+        before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            days=settings.OUTBOX_RETENTION_DAYS
+        )
+        async with sessionmanager.session() as db:
+            return await OutboxRepository(db).purge_processed(before)
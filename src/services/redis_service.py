@@ -1,17 +1,28 @@
 """Redis service for caching.
 
 This module provides Redis caching functionality for the application.
+
+Cached values are stored as pickled bytes prefixed with a one-byte header
+that tells whether the payload is compressed. Values whose serialized size
+exceeds ``settings.REDIS_COMPRESSION_THRESHOLD`` are compressed with zstd.
+Values written before the header was introduced (plain pickles) are still
+readable.
 """
 
 import json
 import pickle
 from typing import Any, Optional, TypeVar, Generic
 import redis.asyncio as redis
+import zstandard
 
 from src.conf.config import settings
 
 T = TypeVar("T")
 
+# Value header flags
+_RAW = b"\x00"
+_ZSTD = b"\x01"
+
 
 class RedisService:
     """Service for interacting with Redis cache.
@@ -23,6 +34,9 @@ class RedisService:
     # Class-level redis client (singleton)
     _redis_client = None
 
+    _compressor = zstandard.ZstdCompressor(level=settings.REDIS_COMPRESSION_LEVEL)
+    _decompressor = zstandard.ZstdDecompressor()
+
     @classmethod
     def _get_client(cls):
         """Get or initialize the Redis client.
@@ -39,6 +53,51 @@ class RedisService:
             )
         return cls._redis_client
 
+    @classmethod
+    def client(cls) -> redis.Redis:
+        """Get the shared Redis client for commands beyond get/set/delete.
+
+        Values passed through it are stored as given, without the cache
+        serialization.
+
+        Returns:
+            redis.Redis: Redis client instance
+        """
+        return cls._get_client()
+
+    @classmethod
+    def _serialize(cls, value: Any) -> bytes:
+        """Serialize a value and compress it if it is large enough.
+
+        Args:
+            value (Any): Value to serialize
+
+        Returns:
+            bytes: Header byte followed by the (possibly compressed) pickle
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) < settings.REDIS_COMPRESSION_THRESHOLD:
+            return _RAW + data
+        return _ZSTD + cls._compressor.compress(data)
+
+    @classmethod
+    def _deserialize(cls, data: bytes) -> Any:
+        """Deserialize a value previously produced by ``_serialize``.
+
+        Args:
+            data (bytes): Raw bytes stored in Redis
+
+        Returns:
+            Any: Deserialized value
+        """
+        header, payload = data[:1], data[1:]
+        if header == _ZSTD:
+            return pickle.loads(cls._decompressor.decompress(payload))
+        if header == _RAW:
+            return pickle.loads(payload)
+        # Legacy value stored without a header
+        return pickle.loads(data)
+
     @classmethod
     async def get(cls, key: str) -> dict | str | int | None:
         """Get a value from the cache.
@@ -53,7 +112,7 @@ class RedisService:
         if data is None:
             return None
         try:
-            return pickle.loads(data)
+            return cls._deserialize(data)
         except Exception:
             return None
 
@@ -70,7 +129,7 @@ class RedisService:
             bool: True if successful, False otherwise
         """
         try:
-            serialized_data = pickle.dumps(value)
+            serialized_data = cls._serialize(value)
             if ttl is None:
                 ttl = settings.REDIS_USER_CACHE_TTL
             await cls._get_client().set(key, serialized_data, ex=ttl)
@@ -78,6 +137,29 @@ class RedisService:
         except Exception:
             return False
 
+    @classmethod
+    async def add(cls, key: str, value: Any, ttl: int | None = None) -> bool:
+        """Set a value in the cache only if the key does not exist yet.
+
+        Args:
+            key (str): Cache key
+            value (Any): Value to cache
+            ttl (Optional[int]): Time to live in seconds
+
+        Returns:
+            bool: True if the value was stored, False if the key already
+            exists or Redis is unavailable
+        """
+        try:
+            serialized_data = cls._serialize(value)
+            if ttl is None:
+                ttl = settings.REDIS_USER_CACHE_TTL
+            return bool(
+                await cls._get_client().set(key, serialized_data, ex=ttl, nx=True)
+            )
+        except Exception:
+            return False
+
     @classmethod
     async def delete(cls, key: str) -> bool:
         """Delete a value from the cache.
@@ -94,6 +176,15 @@ class RedisService:
         except Exception:
             return False
 
+    @classmethod
+    async def ping(cls) -> bool:
+        """Check the Redis connection, opening it if needed.
+
+        Returns:
+            bool: True if Redis answered the ping
+        """
+        return await cls._get_client().ping()
+
     @classmethod
     async def close(cls):
         """Close the Redis connection."""
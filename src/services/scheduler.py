@@ -0,0 +1,46 @@
+"""Scheduled background jobs for the Contacts API.
+
+This module configures the APScheduler scheduler started with the application.
+"""
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from src.conf.config import settings
+from src.services.birthday_digest import BirthdayDigestService
+from src.services.outbox_relay import OutboxRelay
+
+
+def create_scheduler() -> AsyncIOScheduler:
+    """Create the scheduler with all enabled jobs.
+
+    Returns:
+        AsyncIOScheduler: Scheduler that still needs to be started
+    """
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        OutboxRelay.run,
+        IntervalTrigger(seconds=settings.OUTBOX_RELAY_INTERVAL_SECONDS),
+        id="outbox_relay",
+        coalesce=True,
+        max_instances=1,
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        OutboxRelay.purge,
+        CronTrigger(hour=3, minute=30),
+        id="outbox_purge",
+        coalesce=True,
+        replace_existing=True,
+    )
+    if settings.BIRTHDAY_DIGEST_ENABLED:
+        scheduler.add_job(
+            BirthdayDigestService.run,
+            CronTrigger(hour=settings.BIRTHDAY_DIGEST_HOUR, minute=0),
+            id="birthday_digest",
+            coalesce=True,
+            misfire_grace_time=3600,
+            replace_existing=True,
+        )
+    return scheduler
@@ -0,0 +1,170 @@
+"""Pool of persistent SMTP connections.
+
+Opening an SMTP session costs a TCP connect, a TLS handshake and an AUTH
+exchange before the first message can be sent. This module keeps
+authenticated sessions open and reuses them for many messages.
+"""
+
+import asyncio
+import contextlib
+from email.message import EmailMessage
+
+import aiosmtplib
+
+
+class _PooledConnection:
+    """An SMTP client together with the number of messages it has sent."""
+
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.sent = 0
+
+
+class SMTPConnectionPool:
+    """Bounded pool of authenticated SMTP sessions.
+
+    At most ``size`` sessions are open at a time. A session is replaced after
+    ``max_messages_per_connection`` messages, since many servers limit how
+    much one session may send, and whenever a send fails on it.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        start_tls: bool = False,
+        validate_certs: bool = True,
+        size: int = 4,
+        max_messages_per_connection: int = 100,
+        timeout: float = 30,
+    ):
+        """Initialize the pool. Connections are opened on first use.
+
+        Args:
+            hostname (str): SMTP server hostname
+            port (int): SMTP server port
+            username (str): Login username, empty to skip authentication
+            password (str): Login password
+            use_tls (bool): Connect with implicit TLS
+            start_tls (bool): Upgrade the connection with STARTTLS
+            validate_certs (bool): Whether to validate server certificates
+            size (int): Maximum number of open connections
+            max_messages_per_connection (int): Messages sent on a connection
+                before it is replaced
+            timeout (float): Network timeout in seconds
+        """
+        self._client_options = {
+            "hostname": hostname,
+            "port": port,
+            "username": username or None,
+            "password": password or None,
+            "use_tls": use_tls,
+            "start_tls": start_tls,
+            "validate_certs": validate_certs,
+            "timeout": timeout,
+        }
+        self._max_messages = max_messages_per_connection
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: list[_PooledConnection] = []
+        self.connections_opened = 0
+
+    async def _connect(self) -> _PooledConnection:
+        """Open and authenticate a new SMTP session.
+
+        Returns:
+            _PooledConnection: Connected session
+        """
+        client = aiosmtplib.SMTP(**self._client_options)
+        await client.connect()
+        self.connections_opened += 1
+        return _PooledConnection(client)
+
+    @staticmethod
+    async def _discard(connection: _PooledConnection) -> None:
+        """Close a session, ignoring errors from an already broken one.
+
+        Args:
+            connection (_PooledConnection): Session to close
+        """
+        with contextlib.suppress(Exception):
+            await connection.client.quit()
+        connection.client.close()
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        """Borrow a connected session from the pool.
+
+        The session goes back to the pool when the block exits normally and
+        is closed if the block raises.
+
+        Yields:
+            _PooledConnection: Connected session
+        """
+        async with self._semaphore:
+            connection = None
+            while self._idle and connection is None:
+                connection = self._idle.pop()
+                if not connection.client.is_connected:
+                    connection = None
+            if connection is None:
+                connection = await self._connect()
+            try:
+                yield connection
+            except BaseException:
+                await self._discard(connection)
+                raise
+            if connection.sent >= self._max_messages:
+                await self._discard(connection)
+            else:
+                self._idle.append(connection)
+
+    async def send_many(self, messages: list[EmailMessage]) -> None:
+        """Send messages over pooled sessions.
+
+        If the server drops a session, for example an idle one it has timed
+        out, sending resumes on a fresh session. Two drops in a row without
+        progress are treated as a real failure.
+
+        Args:
+            messages (list[EmailMessage]): Messages to send
+
+        Raises:
+            aiosmtplib.SMTPException: If a message cannot be sent
+        """
+        next_message = 0
+        can_retry = True
+        while next_message < len(messages):
+            try:
+                async with self.connection() as connection:
+                    while (
+                        next_message < len(messages)
+                        and connection.sent < self._max_messages
+                    ):
+                        await connection.client.send_message(messages[next_message])
+                        connection.sent += 1
+                        next_message += 1
+                        can_retry = True
+            except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+                if not can_retry:
+                    raise
+                can_retry = False
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send a single message over a pooled session.
+
+        Args:
+            message (EmailMessage): Message to send
+
+        Raises:
+            aiosmtplib.SMTPException: If the message cannot be sent
+        """
+        await self.send_many([message])
+
+    async def close(self) -> None:
+        """Close all idle sessions."""
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await self._discard(connection)
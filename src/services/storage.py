@@ -0,0 +1,186 @@
+"""Avatar storage backends for the Contacts API.
+
+Avatar files are content-addressed: their names contain the SHA-256 of the
+uploaded image, so a stored file never changes and may be cached forever.
+The backend is chosen with ``AVATAR_STORAGE_BACKEND``:
+
+- ``cloudinary`` uploads files to Cloudinary, which serves them from its CDN
+- ``local`` writes files under ``AVATAR_STORAGE_DIR``, served by the API
+  itself, for deployments that cannot reach Cloudinary
+"""
+
+import asyncio
+import functools
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from src.conf.config import settings
+from src.services.cloud_image import CloudImage
+
+# Stored file names: content digest, thumbnail size and extension
+AVATAR_NAME = re.compile(r"^[0-9a-f]{64}_\d+\.webp$")
+
+
+class AvatarStorage(ABC):
+    """Interface of an avatar storage backend."""
+
+    #: Backend name, as set in ``AVATAR_STORAGE_BACKEND``
+    name: str
+
+    @abstractmethod
+    async def save(self, name: str, data: bytes) -> str:
+        """Store a file.
+
+        Args:
+            name (str): File name, matching ``AVATAR_NAME``
+            data (bytes): File content
+
+        Returns:
+            str: Public URL of the file
+
+        Raises:
+            TimeoutError: If the backend did not answer in time
+        """
+
+    @abstractmethod
+    async def delete(self, name: str) -> None:
+        """Delete a file if it exists.
+
+        Args:
+            name (str): File name
+
+        Raises:
+            TimeoutError: If the backend did not answer in time
+        """
+
+
+class CloudinaryStorage(AvatarStorage):
+    """Avatar storage on Cloudinary."""
+
+    name = "cloudinary"
+
+    @staticmethod
+    def public_id(name: str) -> str:
+        """Get the Cloudinary public ID of a file.
+
+        Args:
+            name (str): File name
+
+        Returns:
+            str: Public ID, without the extension Cloudinary adds itself
+        """
+        return f"ContactsApp/avatars/{Path(name).stem}"
+
+    async def save(self, name: str, data: bytes) -> str:
+        """Upload a file to Cloudinary.
+
+        Args:
+            name (str): File name
+            data (bytes): File content
+
+        Returns:
+            str: Cloudinary delivery URL of the file
+        """
+        result = await CloudImage.upload(data, public_id=self.public_id(name))
+        return result["secure_url"]
+
+    async def delete(self, name: str) -> None:
+        """Delete a file from Cloudinary.
+
+        Args:
+            name (str): File name
+        """
+        await CloudImage.delete(self.public_id(name))
+
+
+class LocalStorage(AvatarStorage):
+    """Avatar storage in a local directory, served by ``GET /api/avatars``."""
+
+    name = "local"
+
+    def __init__(self, root: str | Path):
+        """Initialize the storage.
+
+        Args:
+            root (str | Path): Directory the files are written to
+        """
+        self.root = Path(root)
+
+    def path(self, name: str) -> Path:
+        """Get the path of a stored file.
+
+        Args:
+            name (str): File name
+
+        Returns:
+            Path: Path under the storage directory
+
+        Raises:
+            ValueError: If the name is not a valid avatar file name
+        """
+        if not AVATAR_NAME.match(name):
+            raise ValueError(f"Invalid avatar file name: {name}")
+        return self.root / name
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Write a file atomically, so readers never see a partial file.
+
+        Args:
+            path (Path): Destination path
+            data (bytes): File content
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    async def save(self, name: str, data: bytes) -> str:
+        """Write a file to the storage directory.
+
+        Args:
+            name (str): File name
+            data (bytes): File content
+
+        Returns:
+            str: URL of the file under ``APP_BASE_URL``
+        """
+        path = self.path(name)
+        # The name is derived from the content: an existing file is identical
+        if not path.exists():
+            await asyncio.to_thread(self._write, path, data)
+        return f"{settings.APP_BASE_URL.rstrip('/')}/api/avatars/{name}"
+
+    async def delete(self, name: str) -> None:
+        """Delete a file from the storage directory.
+
+        Args:
+            name (str): File name
+        """
+        await asyncio.to_thread(self.path(name).unlink, missing_ok=True)
+
+
+@functools.cache
+def get_storage() -> AvatarStorage:
+    """Get the configured avatar storage backend.
+
+    Returns:
+        AvatarStorage: Backend selected by ``AVATAR_STORAGE_BACKEND``
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if settings.AVATAR_STORAGE_BACKEND == CloudinaryStorage.name:
+        return CloudinaryStorage()
+    if settings.AVATAR_STORAGE_BACKEND == LocalStorage.name:
+        return LocalStorage(settings.AVATAR_STORAGE_DIR)
+    raise ValueError(
+        f"Unknown avatar storage backend: {settings.AVATAR_STORAGE_BACKEND}"
+    )
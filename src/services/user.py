@@ -3,15 +3,28 @@
 This module provides functionality for managing user profiles and avatars.
 """
 
+import asyncio
+import logging
+from typing import BinaryIO
+
 from fastapi import UploadFile, HTTPException, status
+from PIL import Image
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.services.avatar_jobs import DONE, FAILED, PROCESSING, AvatarJobs
 from src.services.auth import AuthService
 from src.repository.user_repository import UserRepository
-from src.services.cloud_image import CloudImage
+from src.services.image_processing import ImageProcessor
+from src.services.image_upload import spool_image
+from src.services.redis_service import RedisService
+from src.services.storage import get_storage
 from src.models.base import User, UserRole
 
+logger = logging.getLogger("uvicorn.error")
+
 
 class UserService:
     """Service for managing user profiles.
@@ -27,15 +40,13 @@ class UserService:
         """
         self.repository = UserRepository(db)
 
-    async def update_avatar(self, user: User, file: UploadFile) -> User:
-        """Update a user's avatar image.
+    @staticmethod
+    def check_avatar_upload(user: User, file: UploadFile):
+        """Check that a user may upload a file as their avatar.
 
         Args:
-            user (User): User to update
-            file (UploadFile): Image file to upload
-
-        Returns:
-            User: Updated user data with new avatar URL
+            user (User): User uploading the avatar
+            file (UploadFile): Uploaded file
 
         Raises:
             HTTPException: If file is not an image or user lacks permission
@@ -52,16 +63,154 @@ class UserService:
                 status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an image"
             )
 
-        public_id = f"ContactsApp/{user.id}"
+    async def update_avatar(self, user: User, file: UploadFile) -> User:
+        """Update a user's avatar image.
+
+        Args:
+            user (User): User to update
+            file (UploadFile): Image file to upload
+
+        Returns:
+            User: Updated user data with new avatar URL
 
-        content = await file.read()
+        Raises:
+            HTTPException: If file is not an image or too large, user lacks
+                permission or the upload times out
+        """
+        self.check_avatar_upload(user, file)
 
-        result = await CloudImage.upload(content, public_id=public_id)
+        image, _ = await spool_image(file)
+        try:
+            avatar_url = await self.process_avatar(image)
+        finally:
+            image.close()
 
-        updated_user = await self.repository.update_avatar(user, result["secure_url"])
+        # The current user may come from the cache and not be in the session
+        stored_user = await self.repository.get_by_id(user.id)
+        if stored_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+        updated_user = await self.repository.update_avatar(stored_user, avatar_url)
         await AuthService.invalidate_user_cache(user.email)
         return updated_user
 
+    async def submit_avatar(
+        self, user: User, file: UploadFile
+    ) -> tuple[dict, BinaryIO]:
+        """Accept an avatar image for processing after the response is sent.
+
+        The file is checked and spooled before returning, so invalid uploads
+        are still rejected right away. The caller hands the job and the
+        spooled image to ``run_avatar_job``.
+
+        Args:
+            user (User): User to update
+            file (UploadFile): Image file to upload
+
+        Returns:
+            tuple[dict, BinaryIO]: Pending job state, and the
+            spooled image the job owns
+
+        Raises:
+            HTTPException: If file is not an image or too large, user lacks
+                permission or the job cannot be recorded
+        """
+        self.check_avatar_upload(user, file)
+
+        image, _ = await spool_image(file)
+        job = await AvatarJobs.create(user.id)
+        if job is None:
+            image.close()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Asynchronous avatar uploads are unavailable",
+            )
+        return job, image
+
+    @staticmethod
+    async def run_avatar_job(job: dict, email: str, image: BinaryIO):
+        """Process an accepted avatar and store the new URL.
+
+        Runs after the response was sent, so it uses its own database
+        session. The outcome is recorded in the job state.
+
+        Args:
+            job (dict): Pending job state
+            email (str): Email of the user whose avatar is processed
+            image (BinaryIO): Spooled image, closed when the job ends
+        """
+        try:
+            job = await AvatarJobs.update(job, status=PROCESSING)
+            avatar_url = await UserService.process_avatar(image)
+            async with sessionmanager.session() as db:
+                user = await db.get(User, job["user_id"])
+                if user is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="User not found",
+                    )
+                await UserRepository(db).update_avatar(user, avatar_url)
+            await AuthService.invalidate_user_cache(email)
+            await AvatarJobs.update(job, status=DONE, avatar_url=avatar_url)
+        except HTTPException as e:
+            await AvatarJobs.update(job, status=FAILED, error=e.detail)
+        except Exception as e:
+            logger.exception(f"Avatar job {job['id']} failed: {e}")
+            await AvatarJobs.update(
+                job, status=FAILED, error="Avatar processing failed"
+            )
+        finally:
+            image.close()
+
+    @staticmethod
+    async def process_avatar(image: BinaryIO) -> str:
+        """Build and store the thumbnails of an avatar image.
+
+        Thumbnails are named after the SHA-256 of the image, and their URLs
+        are cached by it, so an image that was processed before is neither
+        processed nor stored again.
+
+        Args:
+            image (BinaryIO): Image file positioned at its start
+
+        Returns:
+            str: URL of the largest thumbnail
+
+        Raises:
+            HTTPException: If the image cannot be decoded or the storage
+                backend times out
+        """
+        storage = get_storage()
+        digest = await ImageProcessor.digest(image)
+        cache_key = f"avatar:{storage.name}:{digest}"
+        urls = await RedisService.get(cache_key)
+        if urls is None:
+            try:
+                thumbnails = await ImageProcessor.thumbnails(image)
+            except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+                # Pillow reports unreadable, truncated and malformed images
+                # with these, UnidentifiedImageError being an OSError
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File must be an image",
+                )
+            try:
+                stored = await asyncio.gather(
+                    *(
+                        storage.save(f"{digest}_{size}.webp", thumbnail)
+                        for size, thumbnail in thumbnails.items()
+                    )
+                )
+            except TimeoutError:
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail="Avatar upload timed out",
+                )
+            urls = dict(zip(thumbnails, stored))
+            await RedisService.set(cache_key, urls, ttl=settings.AVATAR_DEDUP_TTL)
+        return urls[max(urls)]
+
     async def update_user_role(self, user_id: int, role: UserRole) -> User:
         """Update a user's role.
 
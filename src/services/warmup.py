@@ -0,0 +1,99 @@
+"""Startup warm-up for the Contacts API.
+
+This module prepares the application before it serves requests: it opens
+database pool connections, connects to Redis, compiles the hot repository
+statements and builds the OpenAPI schema, so the first requests after a
+deploy do not pay for it.
+"""
+
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repository.contacts import ContactsRepository
+from src.repository.user_repository import UserRepository
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger("uvicorn.error")
+
+# User id that never exists; the warm-up queries only need to be compiled
+WARMUP_USER_ID = 0
+
+
+class WarmupService:
+    """Service for warming up the application on startup.
+
+    Each step is best-effort: a failing step is logged and the remaining
+    steps still run, so a missing dependency does not block startup.
+    """
+
+    @staticmethod
+    async def open_db_connections() -> None:
+        """Open database pool connections."""
+        opened = await sessionmanager.prewarm(settings.WARMUP_DB_CONNECTIONS)
+        logger.info(f"Warm-up: opened {opened} database connections")
+
+    @staticmethod
+    async def ping_redis() -> None:
+        """Open the Redis connection.
+
+        Raises:
+            TimeoutError: If Redis does not answer within
+                ``HEALTH_CHECK_TIMEOUT`` seconds
+        """
+        await asyncio.wait_for(RedisService.ping(), settings.HEALTH_CHECK_TIMEOUT)
+
+    @staticmethod
+    async def compile_statements() -> None:
+        """Run the hot repository queries so their SQL is compiled and cached.
+
+        The queries run once on the primary and once on every read replica,
+        for a user that does not exist.
+        """
+        async with sessionmanager.session() as session:
+            await UserRepository(session).get_by_email("")
+            await ContactsRepository(session).get_contact(0, WARMUP_USER_ID)
+        for _ in range(max(sessionmanager.replica_count, 1)):
+            async with sessionmanager.read_session() as session:
+                repository = ContactsRepository(session)
+                await repository.get_contacts(0, 1, None, None, None, WARMUP_USER_ID)
+                await repository.get_contacts(
+                    0, 1, "warmup", "warmup", "warmup", WARMUP_USER_ID
+                )
+                await repository.get_upcoming_birthdays(WARMUP_USER_ID)
+
+    @staticmethod
+    async def build_openapi(app: FastAPI) -> None:
+        """Build and cache the OpenAPI schema.
+
+        Args:
+            app (FastAPI): Application whose schema to build
+        """
+        app.openapi()
+
+    @classmethod
+    async def run(cls, app: FastAPI) -> None:
+        """Run all warm-up steps.
+
+        Args:
+            app (FastAPI): Application to warm up
+        """
+        steps = [
+            ("database connections", cls.open_db_connections),
+            ("redis", cls.ping_redis),
+            ("statements", cls.compile_statements),
+            ("openapi", lambda: cls.build_openapi(app)),
+        ]
+        for name, step in steps:
+            start = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                logger.warning(f"Warm-up step '{name}' failed: {e}")
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            logger.info(f"Warm-up step '{name}' finished in {elapsed:.1f} ms")
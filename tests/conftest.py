@@ -1,18 +1,22 @@
 import asyncio
+from contextlib import contextmanager
 from typing import Generator, Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from main import app
 from src.models.base import Base, User, UserRole
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db
+from src.database.instrumentation import assert_max_queries, instrument_engine
 from src.services.auth import AuthService
 from src.services.redis_service import RedisService
+from src.conf.config import settings
 
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
@@ -25,6 +29,8 @@ engine = create_async_engine(
 TestingSessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
+instrument_engine(engine)
+
 
 test_user = {
     "username": "deadpool",
@@ -33,6 +39,15 @@ test_user = {
 }
 
 
+@pytest.fixture(scope="session", autouse=True)
+def mail_from():
+    """Give emails a sender when MAIL_FROM is not set in the environment."""
+    with patch.object(
+        settings, "MAIL_FROM", settings.MAIL_FROM or "noreply@example.com"
+    ):
+        yield
+
+
 # Mock Redis Service methods
 @pytest.fixture(scope="module", autouse=True)
 def mock_redis_service():
@@ -48,6 +63,12 @@ def mock_redis_service():
         redis_cache[key] = value
         return True
 
+    async def mock_add(key: str, value: Any, ttl: int = None) -> bool:
+        if key in redis_cache:
+            return False
+        redis_cache[key] = value
+        return True
+
     async def mock_delete(key: str) -> bool:
         if key in redis_cache:
             del redis_cache[key]
@@ -63,6 +84,8 @@ def mock_redis_service():
         RedisService, "get", new=AsyncMock(side_effect=mock_get)
     ), patch.object(
         RedisService, "set", new=AsyncMock(side_effect=mock_set)
+    ), patch.object(
+        RedisService, "add", new=AsyncMock(side_effect=mock_add)
     ), patch.object(
         RedisService, "delete", new=AsyncMock(side_effect=mock_delete)
     ), patch.object(
@@ -107,6 +130,7 @@ def client() -> Generator[TestClient]:
                 raise
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     yield TestClient(app)
 
@@ -117,3 +141,35 @@ async def get_token():
         auth_service = AuthService(session)
         token = auth_service.create_access_token(test_user.get("email"))
     return token
+
+
+@pytest.fixture
+def count_statements():
+    """Get a context manager collecting SQL statements run on the test engine."""
+
+    @contextmanager
+    def counter() -> Generator[list[str]]:
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(
+                engine.sync_engine, "before_cursor_execute", before_cursor_execute
+            )
+
+    return counter
+
+
+@pytest.fixture
+def query_budget():
+    """Get a context manager failing when a block exceeds its query budget."""
+
+    def budget(max_queries: int):
+        return assert_max_queries(engine, max_queries)
+
+    return budget
@@ -0,0 +1,85 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from src.conf.config import settings
+from src.database.db import DatabaseSessionManager
+from src.database.instrumentation import (
+    assert_max_queries,
+    normalize_sql,
+    statement_registry,
+    track_queries,
+)
+
+
+@pytest.fixture
+def manager(tmp_path) -> DatabaseSessionManager:
+    return DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path / 'sql.db'}")
+
+
+def test_normalize_sql() -> None:
+    statement = (
+        "SELECT contacts.id FROM contacts\n"
+        "WHERE contacts.user_id = $1 AND contacts.first_name = 'John' "
+        "AND contacts.id IN (?, ?, ?) LIMIT 10"
+    )
+
+    assert normalize_sql(statement) == (
+        "SELECT contacts.id FROM contacts WHERE contacts.user_id = ? "
+        "AND contacts.first_name = ? AND contacts.id IN (...) LIMIT ?"
+    )
+
+
+def test_normalize_sql_keeps_casts() -> None:
+    assert normalize_sql("SELECT :id::text") == "SELECT ?::text"
+
+
+@pytest.mark.asyncio
+async def test_track_queries_counts_statements(manager: DatabaseSessionManager):
+    with track_queries() as stats:
+        async with manager.session() as session:
+            await session.execute(text("SELECT 1"))
+            await session.execute(text("SELECT 2"))
+
+    assert stats.count == 2
+    assert stats.statements == {"SELECT ?": 2}
+    assert any(entry["statement"] == "SELECT ?" for entry in statement_registry.top())
+
+
+@pytest.mark.asyncio
+async def test_slow_query_is_logged(
+    manager: DatabaseSessionManager, monkeypatch, caplog
+):
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="src.database.sql"):
+        async with manager.session() as session:
+            await session.execute(text("SELECT 42"))
+
+    assert "Slow query" in caplog.text
+    assert "SELECT ?" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_is_reported(
+    manager: DatabaseSessionManager, monkeypatch, caplog
+):
+    monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+
+    with caplog.at_level(logging.WARNING, logger="src.database.sql"):
+        with track_queries("GET /api/contacts"):
+            async with manager.session() as session:
+                for contact_id in range(3):
+                    await session.execute(text("SELECT :id"), {"id": contact_id})
+
+    assert "Possible N+1 in GET /api/contacts: 3 executions of SELECT ?" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_assert_max_queries(manager: DatabaseSessionManager):
+    with pytest.raises(AssertionError, match="at most 1 queries, ran 2"):
+        with assert_max_queries(manager._engine, 1):
+            async with manager.session() as session:
+                await session.execute(text("SELECT 1"))
+                await session.execute(text("SELECT 2"))
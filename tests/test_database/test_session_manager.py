@@ -0,0 +1,168 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db import DatabaseSessionManager, get_db, get_read_db
+from src.services.redis_service import RedisService
+
+
+@pytest.fixture
+def primary_url(tmp_path) -> str:
+    return f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+
+
+@pytest.fixture
+def replica_urls(tmp_path) -> list[str]:
+    return [f"sqlite+aiosqlite:///{tmp_path / f'replica_{i}.db'}" for i in range(2)]
+
+
+@pytest.fixture
+def manager(primary_url: str, replica_urls: list[str]) -> DatabaseSessionManager:
+    return DatabaseSessionManager(
+        primary_url, replica_urls=replica_urls, read_your_writes_seconds=60
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_session_without_replicas_uses_primary(primary_url: str):
+    manager = DatabaseSessionManager(primary_url)
+
+    async with manager.read_session(user_id=1) as session:
+        assert session.bind is manager._engine
+
+
+@pytest.mark.asyncio
+async def test_read_session_round_robin(manager: DatabaseSessionManager):
+    binds = []
+    for _ in range(4):
+        async with manager.read_session(user_id=1) as session:
+            binds.append(session.bind)
+
+    replicas = manager._replica_engines
+    assert binds == [replicas[0], replicas[1], replicas[0], replicas[1]]
+
+
+@pytest.mark.asyncio
+async def test_read_session_least_connections(
+    primary_url: str, replica_urls: list[str]
+):
+    manager = DatabaseSessionManager(
+        primary_url, replica_urls=replica_urls, replica_strategy="least_connections"
+    )
+    replicas = manager._replica_engines
+
+    async with replicas[0].connect():
+        async with manager.read_session(user_id=1) as session:
+            assert session.bind is replicas[1]
+
+
+@pytest.mark.asyncio
+async def test_pinned_user_reads_from_primary(manager: DatabaseSessionManager):
+    await manager.pin_to_primary(1)
+
+    async with manager.read_session(user_id=1) as session:
+        assert session.bind is manager._engine
+    async with manager.read_session(user_id=2) as session:
+        assert session.bind in manager._replica_engines
+
+
+@pytest.mark.asyncio
+async def test_pin_is_seen_by_other_processes(
+    manager: DatabaseSessionManager, primary_url: str, replica_urls: list[str]
+):
+    # A second manager stands in for another worker process
+    other = DatabaseSessionManager(primary_url, replica_urls=replica_urls)
+
+    await manager.pin_to_primary(3)
+
+    assert await other.is_pinned(3) is True
+    assert await other.is_pinned(4) is False
+
+
+@pytest.mark.asyncio
+async def test_pin_expires_with_window(manager: DatabaseSessionManager):
+    with patch.object(RedisService, "set", new=AsyncMock(return_value=True)) as set_:
+        await manager.pin_to_primary(5)
+
+    set_.assert_awaited_once_with("db:pinned:5", True, ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_no_pin_without_window(primary_url: str, replica_urls: list[str]):
+    manager = DatabaseSessionManager(
+        primary_url, replica_urls=replica_urls, read_your_writes_seconds=0
+    )
+    await manager.pin_to_primary(6)
+
+    assert await manager.is_pinned(6) is False
+
+
+@pytest.mark.asyncio
+async def test_unknown_pin_reads_from_primary(manager: DatabaseSessionManager):
+    with patch.object(
+        RedisService, "get", new=AsyncMock(side_effect=ConnectionError("down"))
+    ):
+        assert await manager.is_pinned(7) is True
+
+
+def test_unknown_replica_strategy(primary_url: str):
+    with pytest.raises(ValueError):
+        DatabaseSessionManager(primary_url, replica_strategy="random")
+
+
+@pytest.mark.asyncio
+async def test_session_acquires_connection_lazily(manager: DatabaseSessionManager):
+    async with manager.session() as session:
+        assert "connection_used" not in session.info
+        await session.execute(text("SELECT 1"))
+        assert session.info["connection_used"] is True
+
+
+def test_session_stats(manager: DatabaseSessionManager):
+    manager.record_request(used_db=True)
+    manager.record_request(used_db=False)
+
+    assert manager.session_stats() == {"requests": 2, "requests_without_db": 1}
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_connections(manager: DatabaseSessionManager):
+    opened = await manager.prewarm(2)
+
+    # Two connections on the primary and on each of the two replicas
+    assert opened == 6
+    assert manager._engine.pool.checkedin() == 2
+
+
+def test_dependencies_route_reads_and_pin_after_writes(
+    manager: DatabaseSessionManager, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr("src.database.db.sessionmanager", manager)
+
+    def authenticate(request: Request, user: int):
+        request.state.current_user = SimpleNamespace(id=user)
+
+    app = FastAPI(dependencies=[Depends(authenticate)])
+
+    @app.get("/read")
+    async def read(db: AsyncSession = Depends(get_read_db)):
+        await db.execute(text("SELECT 1"))
+        return "primary" if db.bind is manager._engine else "replica"
+
+    @app.post("/write")
+    async def write(db: AsyncSession = Depends(get_db)):
+        await db.execute(text("SELECT 1"))
+
+    client = TestClient(app)
+    assert client.get("/read?user=8").json() == "replica"
+
+    assert client.post("/write?user=8").status_code == 200
+
+    # The writer reads its own writes; other users still use the replicas
+    assert client.get("/read?user=8").json() == "primary"
+    assert client.get("/read?user=9").json() == "replica"
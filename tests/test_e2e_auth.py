@@ -1,10 +1,11 @@
-from unittest.mock import AsyncMock
 from datetime import UTC, datetime, timedelta, timezone
 
 import pytest
 from sqlalchemy import select
 
-from src.models.base import User
+from src.models.base import OutboxMessage, User
+from src.services.auth import AuthService
+from src.services.redis_service import RedisService
 from tests.conftest import TestingSessionLocal
 
 user_data = {
@@ -14,31 +15,40 @@ user_data = {
 }
 
 
-def test_register(client, monkeypatch):
-    mock_send_email = AsyncMock()
-    monkeypatch.setattr(
-        "src.services.email.EmailService.send_verification_email", mock_send_email
-    )
+async def outbox_jobs(email: str, job: str) -> list[list]:
+    """Get the payloads of the outbox messages of a job sent to an email."""
+    async with TestingSessionLocal() as session:
+        messages = await session.execute(
+            select(OutboxMessage).where(OutboxMessage.job == job)
+        )
+        return [
+            message.payload
+            for message in messages.scalars()
+            if message.payload[0] == email
+        ]
+
+
+@pytest.mark.asyncio
+async def test_register(client):
     response = client.post("api/auth/register", json=user_data)
     assert response.status_code == 201, response.text
     data = response.json()
     assert data["username"] == user_data["username"]
     assert data["email"] == user_data["email"]
     assert "hashed_password" not in data
-    assert "avatar_url" in data
-    mock_send_email.assert_called_once()
-    email, username, token = mock_send_email.call_args[0]
+    assert data["avatar_url"].startswith("https://www.gravatar.com/avatar/")
 
+    # The verification email is recorded in the outbox with the user
+    jobs = await outbox_jobs(user_data["email"], "send_verification_email")
+    assert len(jobs) == 1
+    email, username, token = jobs[0]
     assert email == user_data["email"]
     assert username == user_data["username"]
     assert isinstance(token, str)
 
 
-def test_repeat_register_email(client, monkeypatch):
-    mock_send_email = AsyncMock()
-    monkeypatch.setattr(
-        "src.services.email.EmailService.send_verification_email", mock_send_email
-    )
+@pytest.mark.asyncio
+async def test_repeat_register_email(client):
     user_copy = user_data.copy()
     user_copy["username"] = "kot_leapold"
     response = client.post("api/auth/register", json=user_copy)
@@ -46,6 +56,10 @@ def test_repeat_register_email(client, monkeypatch):
     data = response.json()
     assert data["detail"] == "Email already registered"
 
+    # The failed insert rolled back its outbox message too
+    jobs = await outbox_jobs(user_data["email"], "send_verification_email")
+    assert len(jobs) == 1
+
 
 def test_not_confirmed_login(client):
     login_data = {
@@ -121,10 +135,10 @@ def test_validation_error_login(client):
 
 @pytest.mark.asyncio
 async def test_request_password_reset(client, monkeypatch):
-    # Mock email sending
-    mock_send_email = AsyncMock()
-    monkeypatch.setattr(
-        "src.services.email.EmailService.send_password_reset_email", mock_send_email
+    # Start outside the coalescing window of any earlier request
+    await RedisService.delete(AuthService.password_reset_key(user_data["email"]))
+    sent_before = len(
+        await outbox_jobs(user_data["email"], "send_password_reset_email")
     )
 
     # Request password reset for existing user
@@ -138,9 +152,10 @@ async def test_request_password_reset(client, monkeypatch):
         == "If your email is registered, you will receive a password reset link"
     )
 
-    # Verify email was sent
-    mock_send_email.assert_called_once()
-    email, username, token = mock_send_email.call_args[0]
+    # Verify the email was recorded in the outbox
+    jobs = await outbox_jobs(user_data["email"], "send_password_reset_email")
+    assert len(jobs) == sent_before + 1
+    email, username, token = jobs[-1]
     assert email == user_data["email"]
     assert username == user_data["username"]
     assert isinstance(token, str)
@@ -163,13 +178,7 @@ async def test_request_password_reset(client, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_request_password_reset_nonexistent_user(client, monkeypatch):
-    # Mock email sending
-    mock_send_email = AsyncMock()
-    monkeypatch.setattr(
-        "src.services.email.EmailService.send_password_reset_email", mock_send_email
-    )
-
+async def test_request_password_reset_nonexistent_user(client):
     # Request password reset for non-existent user
     request_data = {"email": "nonexistent@example.com"}
     response = client.post("api/auth/request-password-reset", json=request_data)
@@ -182,8 +191,66 @@ async def test_request_password_reset_nonexistent_user(client, monkeypatch):
         == "If your email is registered, you will receive a password reset link"
     )
 
-    # Verify no email was sent
-    mock_send_email.assert_not_called()
+    # Verify no email was recorded
+    assert (
+        await outbox_jobs("nonexistent@example.com", "send_password_reset_email") == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeat_password_reset_is_coalesced(
+    client, monkeypatch, count_statements
+):
+    reset_token = await test_request_password_reset(client, monkeypatch)
+    sent = len(await outbox_jobs(user_data["email"], "send_password_reset_email"))
+
+    # A repeat request within the window neither writes nor sends an email
+    with count_statements() as statements:
+        response = client.post(
+            "api/auth/request-password-reset", json={"email": user_data["email"]}
+        )
+    assert response.status_code == 200, response.text
+    assert (
+        response.json()["message"]
+        == "If your email is registered, you will receive a password reset link"
+    )
+    assert statements == []
+    jobs = await outbox_jobs(user_data["email"], "send_password_reset_email")
+    assert len(jobs) == sent
+
+    # The pending token stays valid
+    async with TestingSessionLocal() as session:
+        db_user = await session.execute(
+            select(User).where(User.email == user_data["email"])
+        )
+        assert db_user.scalar_one().reset_password_token == reset_token
+
+
+@pytest.mark.asyncio
+async def test_unknown_email_reset_is_cached(client, count_statements):
+    email = "unknown-reset@example.com"
+    response = client.post("api/auth/request-password-reset", json={"email": email})
+    assert response.status_code == 200, response.text
+
+    # The repeat request is answered from the negative cache
+    with count_statements() as statements:
+        response = client.post("api/auth/request-password-reset", json={"email": email})
+    assert response.status_code == 200, response.text
+    assert (
+        response.json()["message"]
+        == "If your email is registered, you will receive a password reset link"
+    )
+    assert statements == []
+
+    # Registering the email forgets the negative result
+    response = client.post(
+        "api/auth/register",
+        json={"username": "latecomer", "email": email, "password": "12345678"},
+    )
+    assert response.status_code == 201, response.text
+    response = client.post("api/auth/request-password-reset", json={"email": email})
+    assert response.status_code == 200, response.text
+    assert len(await outbox_jobs(email, "send_password_reset_email")) == 1
 
 
 @pytest.mark.asyncio
@@ -243,3 +310,50 @@ async def test_reset_password_expired_token(client, monkeypatch):
     assert response.status_code == 400, response.text
     data = response.json()
     assert data["detail"] == "Reset token has expired"
+
+
+@pytest.mark.asyncio
+async def test_auth_flow_statement_counts(client, count_statements):
+    new_user = {
+        "username": "counter",
+        "email": "counter@example.com",
+        "password": "12345678",
+    }
+
+    # Register: INSERT ... RETURNING plus the outbox INSERT
+    with count_statements() as statements:
+        response = client.post("api/auth/register", json=new_user)
+    assert response.status_code == 201, response.text
+    assert len(statements) == 2, statements
+
+    async with TestingSessionLocal() as session:
+        db_user = await session.execute(
+            select(User).where(User.email == new_user["email"])
+        )
+        verification_token = db_user.scalar_one().verification_token
+
+    # Verify email: one UPDATE ... RETURNING
+    with count_statements() as statements:
+        response = client.get(f"api/auth/verify/{verification_token}")
+    assert response.status_code == 200, response.text
+    assert len(statements) == 1, statements
+
+    # Request password reset: UPDATE ... RETURNING plus the outbox INSERT
+    with count_statements() as statements:
+        response = client.post(
+            "api/auth/request-password-reset", json={"email": new_user["email"]}
+        )
+    assert response.status_code == 200, response.text
+    assert len(statements) == 2, statements
+    [[_, _, reset_token]] = await outbox_jobs(
+        new_user["email"], "send_password_reset_email"
+    )
+
+    # Reset password: one UPDATE ... RETURNING
+    with count_statements() as statements:
+        response = client.post(
+            f"api/auth/reset-password/{reset_token}",
+            json={"token": reset_token, "password": "newpassword123"},
+        )
+    assert response.status_code == 200, response.text
+    assert len(statements) == 1, statements
@@ -1,6 +1,11 @@
 from datetime import date, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List
+import pytest
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from src.conf.config import settings
+from src.schemas.contact import ContactFieldsResponse, ContactResponse
 
 contact_data: Dict[str, str] = {
     "first_name": "John",
@@ -65,6 +70,174 @@ def test_get_contact(client: TestClient, get_token: str) -> None:
     assert data["email"] == new_contact_data["email"]
 
 
+def test_list_contacts(
+    client: TestClient,
+    get_token: str,
+    query_budget,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "SQL_QUERY_COUNT_HEADER", True)
+    headers = {"Authorization": f"Bearer {get_token}"}
+    # Warm the user cache so only the list query is left
+    client.get("api/contacts/", headers=headers)
+
+    with query_budget(1):
+        response = client.get("api/contacts/", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["X-DB-Query-Count"] == "1"
+    data = response.json()
+    assert isinstance(data, list)
+    assert len(data) > 0
+    assert set(data[0]) == {"id", *contact_data}
+    assert response.headers["content-type"] == "application/json"
+
+    # The unvalidated rows serialize exactly like validated responses
+    expected = TypeAdapter(List[ContactResponse]).validate_python(data)
+    assert data == [contact.model_dump(mode="json") for contact in expected]
+
+
+def test_list_contacts_with_sparse_fields(client: TestClient, get_token: str) -> None:
+    headers = {"Authorization": f"Bearer {get_token}"}
+    full = client.get("api/contacts/", headers=headers).json()
+
+    response = client.get(
+        "api/contacts/?fields=first_name,last_name,phone", headers=headers
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data == [
+        {key: contact[key] for key in ("id", "first_name", "last_name", "phone")}
+        for contact in full
+    ]
+
+    response = client.get("api/contacts/?fields=first_name,secret", headers=headers)
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Unknown contact fields: secret"
+
+    # The documented schema allows the fields that were left out
+    TypeAdapter(List[ContactFieldsResponse]).validate_python(data)
+    schema = client.get("/openapi.json").json()["components"]["schemas"]
+    assert schema["ContactFieldsResponse"]["required"] == ["id"]
+
+
+def test_list_contacts_total_count(client: TestClient, get_token: str) -> None:
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contacts = client.get("api/contacts/?limit=100", headers=headers).json()
+
+    response = client.get("api/contacts/?count=exact&limit=1", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["X-Total-Count"] == str(len(contacts))
+    assert "X-Total-Count-Estimated" not in response.headers
+    assert len(response.json()) == 1
+
+    # Writes keep the per-user counter in step, upserts included
+    new_contact = {**contact_data, "email": "counted@example.com"}
+    created = client.post("api/contacts/", json=new_contact, headers=headers).json()
+    upsert_data = {key: value for key, value in contact_data.items() if key != "email"}
+    for _ in range(2):
+        client.put(
+            "api/contacts/by-email/counted.sync@example.com",
+            json=upsert_data,
+            headers=headers,
+        )
+    response = client.get("api/contacts/?count=exact", headers=headers)
+    assert response.headers["X-Total-Count"] == str(len(contacts) + 2)
+
+    client.delete(f"api/contacts/{created['id']}", headers=headers)
+    response = client.get("api/contacts/?count=estimate", headers=headers)
+    assert response.headers["X-Total-Count"] == str(len(contacts) + 1)
+
+
+def test_filtered_total_count_is_cached(client: TestClient, get_token: str) -> None:
+    headers = {"Authorization": f"Bearer {get_token}"}
+    url = "api/contacts/?email=filtered.count&envelope=true"
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"items": [], "total": 0, "estimated": False}
+    assert response.headers["X-Total-Count"] == "0"
+
+    new_contact = {**contact_data, "email": "filtered.count@example.com"}
+    client.post("api/contacts/", json=new_contact, headers=headers)
+
+    # The count is served from the cache until it expires
+    response = client.get(url, headers=headers)
+    page = response.json()
+    assert [contact["email"] for contact in page["items"]] == [new_contact["email"]]
+    assert page["total"] == 0
+
+
+def test_upcoming_birthdays_match_response_model(
+    client: TestClient, get_token: str
+) -> None:
+    headers = {"Authorization": f"Bearer {get_token}"}
+    birthday = date.today() + timedelta(days=2)
+    response = client.post(
+        "api/contacts/",
+        json={
+            **contact_data,
+            "email": "birthday.soon@example.com",
+            "birthday": str(birthday.replace(year=1992)),
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+
+    response = client.get("api/contacts/birthdays", headers=headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert "birthday.soon@example.com" in {contact["email"] for contact in data}
+    expected = TypeAdapter(List[ContactResponse]).validate_python(data)
+    assert data == [contact.model_dump(mode="json") for contact in expected]
+
+
+def test_query_count_header_is_off_by_default(
+    client: TestClient, get_token: str
+) -> None:
+    response = client.get(
+        "api/contacts/", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == 200, response.text
+    assert "X-DB-Query-Count" not in response.headers
+
+
+def test_upsert_contact_by_email(
+    client: TestClient, get_token: str, query_budget
+) -> None:
+    headers = {"Authorization": f"Bearer {get_token}"}
+    email = "crm.sync@example.com"
+    upsert_data = {key: value for key, value in contact_data.items() if key != "email"}
+
+    response = client.put(
+        f"api/contacts/by-email/{email}", json=upsert_data, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    created = response.json()
+    assert created["email"] == email
+    assert created["first_name"] == contact_data["first_name"]
+
+    # Pushing the record again updates it in place with a single statement
+    with query_budget(1):
+        response = client.put(
+            f"api/contacts/by-email/{email}",
+            json={**upsert_data, "first_name": "Johnny"},
+            headers=headers,
+        )
+    assert response.status_code == 200, response.text
+    updated = response.json()
+    assert updated["id"] == created["id"]
+    assert updated["first_name"] == "Johnny"
+
+
+def test_upsert_contact_by_invalid_email(client: TestClient, get_token: str) -> None:
+    response = client.put(
+        "api/contacts/by-email/not-an-email",
+        json={key: value for key, value in contact_data.items() if key != "email"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 422, response.text
+
+
 # def test_get_contacts(client: TestClient, get_token: str) -> None:
 #     response = client.get(
 #         "api/contacts/", headers={"Authorization": f"Bearer {get_token}"}
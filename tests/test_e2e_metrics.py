@@ -0,0 +1,65 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.conf.config import settings
+from src.services.redis_service import RedisService
+
+
+def test_db_pool_stats_unauthorized(client: TestClient) -> None:
+    response = client.get("api/metrics/db-pool")
+    assert response.status_code == 401, response.text
+
+
+def test_db_pool_stats(client: TestClient, get_token: str) -> None:
+    response = client.get(
+        "api/metrics/db-pool", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["pool_class"] == "InstrumentedQueuePool"
+    for key in ("size", "checked_out", "overflow", "wait_time_avg_ms", "timeouts"):
+        assert key in data
+
+
+def test_db_session_stats(client: TestClient, get_token: str) -> None:
+    response = client.get(
+        "api/metrics/db-sessions", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["requests"] >= data["requests_without_db"] >= 0
+
+
+def test_readiness(client: TestClient) -> None:
+    with patch.object(RedisService, "ping", new=AsyncMock(return_value=True)):
+        response = client.get("api/readiness")
+    assert response.status_code == 200, response.text
+    assert response.json() == {"status": "ready"}
+
+
+def test_readiness_with_hung_redis(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "HEALTH_CHECK_TIMEOUT", 0.01)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    with patch.object(RedisService, "ping", new=hang):
+        response = client.get("api/readiness")
+    assert response.status_code == 503, response.text
+    assert response.json()["detail"] == "Unavailable: redis"
+
+
+def test_sql_stats(client: TestClient, get_token: str) -> None:
+    headers = {"Authorization": f"Bearer {get_token}"}
+    client.get("api/contacts/", headers=headers)
+
+    response = client.get("api/metrics/sql?limit=5", headers=headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert 0 < len(data) <= 5
+    assert {"statement", "count", "avg_ms", "max_ms", "total_ms"} <= set(data[0])
@@ -1,7 +1,17 @@
 from unittest.mock import AsyncMock
+import contextlib
+import hashlib
 import pytest
 import io
 from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import select
+
+from src.conf.config import settings
+from src.models.base import User
+from src.services.avatar_jobs import AvatarJobs
+from src.services.storage import get_storage
+from tests.conftest import TestingSessionLocal, test_user
 
 
 def test_update_avatar_unauthorized(client: TestClient):
@@ -35,13 +45,20 @@ def test_update_avatar_success(
     client: TestClient, get_token: str, monkeypatch: pytest.MonkeyPatch
 ):
     """Test successfully updating a user's avatar."""
+    uploaded = {}
+
+    async def upload(file, public_id=None):
+        uploaded[public_id] = file
+        return {"secure_url": f"https://example.com/{public_id}.webp"}
+
     # Mock the CloudImage.upload method
-    mock_cloud_upload = AsyncMock()
-    mock_cloud_upload.return_value = {"secure_url": "https://example.com/avatar.jpg"}
+    mock_cloud_upload = AsyncMock(side_effect=upload)
     monkeypatch.setattr("src.services.cloud_image.CloudImage.upload", mock_cloud_upload)
 
     # Create a test image
-    test_image_content = b"test image content"
+    output = io.BytesIO()
+    Image.new("RGB", (400, 300), "purple").save(output, "JPEG")
+    test_image_content = output.getvalue()
 
     # Make the request
     response = client.patch(
@@ -58,12 +75,199 @@ def test_update_avatar_success(
     assert "id" in data
     assert "username" in data
     assert "email" in data
-    assert data["avatar_url"] == "https://example.com/avatar.jpg"
+    # Verify a thumbnail per size was uploaded, under the image's digest
+    digest = hashlib.sha256(test_image_content).hexdigest()
+    assert sorted(uploaded) == [
+        f"ContactsApp/avatars/{digest}_256",
+        f"ContactsApp/avatars/{digest}_64",
+    ]
+    assert (
+        data["avatar_url"]
+        == f"https://example.com/ContactsApp/avatars/{digest}_256.webp"
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_avatar_of_cached_user_is_stored(
+    client: TestClient, get_token: str, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that an avatar set while the user is cached reaches the database."""
+    monkeypatch.setattr(
+        "src.services.cloud_image.CloudImage.upload",
+        AsyncMock(return_value={"secure_url": "https://example.com/cached.webp"}),
+    )
+    headers = {"Authorization": f"Bearer {get_token}"}
+    # Warm the user cache, so the upload authenticates from it
+    client.get("api/auth/me", headers=headers)
+
+    output = io.BytesIO()
+    Image.new("RGB", (300, 300), "teal").save(output, "PNG")
+    response = client.patch(
+        "api/users/avatar",
+        files={"file": ("avatar.png", io.BytesIO(output.getvalue()), "image/png")},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+
+    async with TestingSessionLocal() as db:
+        user = await db.scalar(select(User).where(User.email == test_user["email"]))
+    assert user.avatar_url == "https://example.com/cached.webp"
+    # Fields missing from the cache are left as they were
+    assert user.password
+
+
+def test_update_avatar_too_large(
+    client: TestClient, get_token: str, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that an avatar over the size limit is rejected."""
+    monkeypatch.setattr("src.conf.config.settings.AVATAR_MAX_BYTES", 1024)
+    response = client.patch(
+        "api/users/avatar",
+        files={
+            "file": (
+                "big.png",
+                io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\0" * 2048),
+                "image/png",
+            )
+        },
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 413, response.text
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """Store avatars in a temporary directory instead of Cloudinary."""
+    monkeypatch.setattr(settings, "AVATAR_STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "AVATAR_STORAGE_DIR", str(tmp_path))
+    get_storage.cache_clear()
+    yield tmp_path
+    get_storage.cache_clear()
+
+
+def test_update_avatar_local_storage(client: TestClient, get_token: str, local_storage):
+    """Test uploading an avatar to local storage and fetching it back."""
+    output = io.BytesIO()
+    Image.new("RGB", (400, 300), "teal").save(output, "PNG")
+    content = output.getvalue()
+    digest = hashlib.sha256(content).hexdigest()
+
+    response = client.patch(
+        "api/users/avatar",
+        files={"file": ("avatar.png", io.BytesIO(content), "image/png")},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    avatar_url = response.json()["avatar_url"]
+    assert avatar_url == f"{settings.APP_BASE_URL}/api/avatars/{digest}_256.webp"
+    assert sorted(path.name for path in local_storage.iterdir()) == [
+        f"{digest}_256.webp",
+        f"{digest}_64.webp",
+    ]
+
+    response = client.get(avatar_url.removeprefix(settings.APP_BASE_URL))
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["cache-control"] == (
+        f"public, max-age={settings.AVATAR_CACHE_MAX_AGE}, immutable"
+    )
+    with Image.open(io.BytesIO(response.content)) as avatar:
+        assert avatar.size == (256, 256)
+
+
+@pytest.mark.parametrize("name", [f"{'0' * 64}_256.webp", "..%2Fmain.py", "x.webp"])
+def test_get_missing_avatar(client: TestClient, local_storage, name: str):
+    """Test that unknown or malformed avatar names are not found."""
+    response = client.get(f"api/avatars/{name}")
+    assert response.status_code == 404, response.text
+
+
+@pytest.fixture
+def job_sessions(monkeypatch: pytest.MonkeyPatch):
+    """Run background avatar jobs against the test database."""
+
+    @contextlib.asynccontextmanager
+    async def session():
+        async with TestingSessionLocal() as db:
+            yield db
+
+    monkeypatch.setattr("src.services.user.sessionmanager.session", session)
+
+
+def test_update_avatar_async(
+    client: TestClient, get_token: str, local_storage, job_sessions
+):
+    """Test accepting an avatar with 202 and following its job to the end."""
+    output = io.BytesIO()
+    Image.new("RGB", (300, 300), "olive").save(output, "PNG")
+    digest = hashlib.sha256(output.getvalue()).hexdigest()
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    response = client.patch(
+        "api/users/avatar?mode=async",
+        files={"file": ("avatar.png", io.BytesIO(output.getvalue()), "image/png")},
+        headers=headers,
+    )
+    assert response.status_code == 202, response.text
+    job = response.json()
+    assert job["status"] == "pending"
+    assert job["avatar_url"] is None
+    assert response.headers["location"].endswith(f"/api/users/avatar/jobs/{job['id']}")
+
+    # The test client returns once the background task has finished
+    response = client.get(f"api/users/avatar/jobs/{job['id']}", headers=headers)
+    assert response.status_code == 200, response.text
+    job = response.json()
+    assert job["status"] == "done", job
+    assert job["avatar_url"].endswith(f"/api/avatars/{digest}_256.webp")
+
+    response = client.get("api/auth/me", headers=headers)
+    assert response.json()["avatar_url"] == job["avatar_url"]
+
+
+def test_update_avatar_async_failure(
+    client: TestClient, get_token: str, local_storage, job_sessions
+):
+    """Test that a job whose image cannot be decoded is reported as failed."""
+    headers = {"Authorization": f"Bearer {get_token}"}
+    # PNG signature, but no decodable image behind it
+    content = b"\x89PNG\r\n\x1a\n" + b"\0" * 64
+
+    response = client.patch(
+        "api/users/avatar?mode=async",
+        files={"file": ("avatar.png", io.BytesIO(content), "image/png")},
+        headers=headers,
+    )
+    assert response.status_code == 202, response.text
+
+    response = client.get(
+        f"api/users/avatar/jobs/{response.json()['id']}", headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"] == "File must be an image"
+
+
+def test_update_avatar_async_rejects_invalid_upload_right_away(
+    client: TestClient, get_token: str
+):
+    """Test that async mode still checks the upload before accepting it."""
+    response = client.patch(
+        "api/users/avatar?mode=async",
+        files={"file": ("notes.txt", io.BytesIO(b"plain text"), "image/png")},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 400, response.text
+
+
+@pytest.mark.asyncio
+async def test_get_avatar_job_of_another_user(client: TestClient, get_token: str):
+    """Test that jobs are only visible to the user who started them."""
+    job = await AvatarJobs.create(user_id=999999)
+    headers = {"Authorization": f"Bearer {get_token}"}
 
-    # Verify the mock was called
-    mock_cloud_upload.assert_called_once()
+    response = client.get(f"api/users/avatar/jobs/{job['id']}", headers=headers)
+    assert response.status_code == 404, response.text
 
-    # Verify the file content was passed to the mock
-    file_content, kwargs = mock_cloud_upload.call_args
-    assert kwargs["public_id"].startswith("ContactsApp/")
-    assert file_content[0] == test_image_content
+    response = client.get("api/users/avatar/jobs/unknown", headers=headers)
+    assert response.status_code == 404, response.text
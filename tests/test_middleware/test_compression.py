@@ -0,0 +1,191 @@
+import gzip
+import json
+import zlib
+
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.middleware.compression import (
+    CompressionMiddleware,
+    CompressionResponder,
+    choose_encoding,
+)
+
+ROWS = [{"id": i, "first_name": f"Contact {i}", "notes": "x" * 40} for i in range(100)]
+ENCODINGS = ["zstd", "br", "gzip"]
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/rows")
+    def rows():
+        return ROWS
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    def image():
+        return Response(b"\0" * 2000, media_type="image/webp")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(
+            gzip.compress(b"x" * 2000),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.get("/export")
+    def export():
+        lines = (json.dumps(row) + "\n" for row in ROWS)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    return app
+
+
+@pytest.fixture
+def app_client() -> TestClient:
+    return TestClient(make_app())
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "zstd"),
+        ("*;q=0.5, gzip", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(accept_encoding: str, expected: str | None):
+    assert choose_encoding(accept_encoding, ENCODINGS) == expected
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_large_json_is_compressed(app_client: TestClient, encoding: str):
+    response = app_client.get("/rows", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    # httpx decodes the body; the raw size is the compressed one
+    assert int(response.headers["content-length"]) < len(response.content) / 4
+    assert response.json() == ROWS
+
+
+def test_compressed_body_round_trips(app_client: TestClient):
+    with app_client.stream("GET", "/rows", headers={"Accept-Encoding": "gzip"}) as r:
+        raw = b"".join(r.iter_raw())
+
+    assert json.loads(gzip.decompress(raw)) == ROWS
+    assert int(r.headers["content-length"]) == len(raw)
+
+
+@pytest.mark.parametrize("path", ["/small", "/image", "/encoded"])
+def test_other_responses_are_left_alone(app_client: TestClient, path: str):
+    with app_client.stream("GET", path, headers={"Accept-Encoding": "br"}) as r:
+        raw = b"".join(r.iter_raw())
+
+    assert r.headers.get("content-encoding") == ("gzip" if path == "/encoded" else None)
+    assert int(r.headers["content-length"]) == len(raw)
+
+
+def test_client_without_accept_encoding_gets_identity(app_client: TestClient):
+    response = app_client.get("/rows", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == ROWS
+
+
+def test_streamed_ndjson_is_compressed(app_client: TestClient):
+    response = app_client.get("/export", headers={"Accept-Encoding": "zstd"})
+
+    assert response.headers["content-encoding"] == "zstd"
+    assert "content-length" not in response.headers
+    assert [json.loads(line) for line in response.text.splitlines()] == ROWS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ENCODINGS)
+async def test_each_streamed_chunk_is_decodable_on_arrival(encoding: str):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = CompressionMiddleware(None, minimum_size=500)
+    responder = CompressionResponder(middleware, encoding, send)
+    await responder.send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/x-ndjson")],
+        }
+    )
+    lines = [json.dumps(row).encode() + b"\n" for row in ROWS[:3]]
+    for line in lines:
+        await responder.send(
+            {"type": "http.response.body", "body": line, "more_body": True}
+        )
+    await responder.send({"type": "http.response.body", "body": b""})
+
+    decompressor = {
+        "zstd": zstandard.ZstdDecompressor().decompressobj(),
+        "br": brotli.Decompressor(),
+        "gzip": zlib.decompressobj(16 + zlib.MAX_WBITS),
+    }[encoding]
+    decompress = getattr(decompressor, "process", None) or decompressor.decompress
+    # Every chunk decodes to exactly the line sent with it
+    for line, message in zip(lines, sent[1:]):
+        assert decompress(message["body"]) == line
+    assert (b"content-encoding", encoding.encode()) in sent[0]["headers"]
+
+
+@pytest.mark.asyncio
+async def test_strong_etag_is_weakened():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    responder = CompressionResponder(CompressionMiddleware(None), "gzip", send)
+    await responder.send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain"),
+                (b"etag", b'"abc"'),
+                (b"content-length", b"4096"),
+            ],
+        }
+    )
+    await responder.send({"type": "http.response.body", "body": b"a" * 4096})
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"etag"] == b'W/"abc"'
+    assert gzip.decompress(sent[1]["body"]) == b"a" * 4096
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        CompressionMiddleware(None, encodings=["deflate"])
+
+
+def test_openapi_schema_is_compressed(client: TestClient):
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()["info"]["title"] == "Contacts API"
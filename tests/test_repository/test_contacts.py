@@ -2,8 +2,10 @@ import pytest
 from datetime import date, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, Mock
 from src.models.base import Contact, User
-from src.schemas.contact import ContactCreate, ContactUpdate
+from src.schemas.contact import ContactCreate, ContactUpdate, ContactUpsert
 from src.repository.contacts import ContactsRepository
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import asyncpg
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.exceptions.contact import ContactAlreadyExists
 
@@ -97,32 +99,93 @@ async def test_create_contact_duplicate_email(
 
 
 @pytest.mark.asyncio
-async def test_get_contacts(
+async def test_upsert_contact_by_email(
     mock_session: AsyncSession,
     test_user: User,
     contacts_repository: ContactsRepository,
 ):
-    # Create test contacts
-    expected_contacts = [
-        Contact(
-            id=i + 1,
-            first_name=f"User{i}",
-            last_name=f"Test{i}",
-            email=f"user{i}@test.com",
-            phone=f"123456789{i}",
+    mock_session.get_bind = Mock(return_value=Mock(dialect=postgresql.dialect()))
+    stored_contact = {
+        "id": 1,
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "john@example.com",
+        "phone": "1234567890",
+        "birthday": date(1990, 1, 1),
+        "additional_data": None,
+    }
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.one.return_value = stored_contact
+    mock_session.execute.return_value = mock_result
+
+    result = await contacts_repository.upsert_contact_by_email(
+        "john@example.com",
+        ContactUpsert(
+            first_name="John",
+            last_name="Doe",
+            phone="1234567890",
             birthday=date(1990, 1, 1),
-            user_id=test_user.id,
+        ),
+        test_user.id,
+    )
+
+    assert result == stored_contact
+    statement = mock_session.execute.call_args[0][0]
+    sql = str(statement.compile(dialect=mock_session.get_bind().dialect))
+    assert "ON CONFLICT (user_id, email) DO UPDATE" in sql
+    assert "RETURNING" in sql
+    mock_session.add.assert_not_called()
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_upsert_contact_by_email_needs_on_conflict(
+    mock_session: AsyncSession,
+    test_user: User,
+    contacts_repository: ContactsRepository,
+):
+    mock_session.get_bind = Mock(return_value=Mock(dialect=Mock()))
+    mock_session.get_bind().dialect.name = "mssql"
+
+    with pytest.raises(NotImplementedError, match="mssql"):
+        await contacts_repository.upsert_contact_by_email(
+            "john@example.com",
+            ContactUpsert(
+                first_name="John",
+                last_name="Doe",
+                phone="1234567890",
+                birthday=date(1990, 1, 1),
+            ),
+            test_user.id,
         )
+
+    mock_session.execute.assert_not_called()
+    mock_session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_contacts(
+    mock_session: AsyncSession,
+    test_user: User,
+    contacts_repository: ContactsRepository,
+):
+    # Create test contact rows
+    expected_contacts = [
+        {
+            "id": i + 1,
+            "first_name": f"User{i}",
+            "last_name": f"Test{i}",
+            "email": f"user{i}@test.com",
+            "phone": f"123456789{i}",
+            "birthday": date(1990, 1, 1),
+            "additional_data": None,
+        }
         for i in range(3)
     ]
 
     # Setup proper mock chain
-    mock_scalars = MagicMock()
-    mock_all = MagicMock(return_value=expected_contacts)
-    mock_scalars.all = mock_all
-
-    mock_result = AsyncMock()
-    mock_result.scalars = MagicMock(return_value=mock_scalars)
+    mock_result = MagicMock()
+    mock_result.mappings = MagicMock(return_value=expected_contacts)
 
     mock_session.execute = AsyncMock(return_value=mock_result)
 
@@ -136,19 +199,113 @@ async def test_get_contacts(
         user_id=test_user.id,
     )
 
-    # Verify query building
+    # Verify query selects only the response columns, without joining users
     mock_session.execute.assert_called_once()
+    query = str(mock_session.execute.call_args[0][0])
+    assert "users" not in query
 
     # Assertions on result
     assert len(result) == 3
     for i, contact in enumerate(result):
-        assert contact.id == i + 1
-        assert contact.first_name == f"User{i}"
-        assert contact.last_name == f"Test{i}"
-        assert contact.email == f"user{i}@test.com"
-        assert contact.phone == f"123456789{i}"
-        assert contact.birthday == date(1990, 1, 1)
-        assert contact.user_id == test_user.id
+        assert contact["id"] == i + 1
+        assert contact["first_name"] == f"User{i}"
+        assert contact["last_name"] == f"Test{i}"
+        assert contact["email"] == f"user{i}@test.com"
+        assert contact["phone"] == f"123456789{i}"
+        assert contact["birthday"] == date(1990, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_count_contacts(
+    mock_session: AsyncSession,
+    test_user: User,
+    contacts_repository: ContactsRepository,
+):
+    mock_result = MagicMock()
+    mock_result.scalar_one.return_value = 5
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    result = await contacts_repository.count_contacts(
+        first_name="User", last_name=None, email=None, user_id=test_user.id
+    )
+
+    assert result == 5
+    query = str(mock_session.execute.call_args[0][0])
+    assert "count(*)" in query
+    assert "LIMIT" not in query
+
+
+@pytest.mark.asyncio
+async def test_estimate_contacts_uses_driver_parameters(
+    mock_session: AsyncSession,
+    test_user: User,
+    contacts_repository: ContactsRepository,
+):
+    mock_session.get_bind = Mock(return_value=Mock(dialect=asyncpg.dialect()))
+    mock_result = MagicMock()
+    mock_result.scalar_one.return_value = '[{"Plan": {"Plan Rows": 123456}}]'
+    connection = AsyncMock()
+    connection.exec_driver_sql = AsyncMock(return_value=mock_result)
+    mock_session.connection = AsyncMock(return_value=connection)
+
+    result = await contacts_repository.estimate_contacts(
+        first_name="O'Brien:%", last_name=None, email=None, user_id=test_user.id
+    )
+
+    assert result == 123456
+    statement, parameters = connection.exec_driver_sql.call_args[0]
+    assert statement.startswith("EXPLAIN (FORMAT JSON) SELECT contacts.id")
+    # Filter values are passed as driver parameters, never inlined
+    assert "Brien" not in statement
+    assert parameters == (test_user.id, "%O'Brien:%%")
+
+
+@pytest.mark.asyncio
+async def test_estimate_contacts_is_unavailable_elsewhere(
+    mock_session: AsyncSession,
+    test_user: User,
+    contacts_repository: ContactsRepository,
+):
+    mock_session.get_bind = Mock(return_value=Mock(dialect=Mock()))
+    mock_session.get_bind.return_value.dialect.name = "sqlite"
+
+    result = await contacts_repository.estimate_contacts(
+        first_name=None, last_name=None, email="@", user_id=test_user.id
+    )
+
+    assert result is None
+    mock_session.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_selects_only_requested_fields(
+    mock_session: AsyncSession,
+    test_user: User,
+    contacts_repository: ContactsRepository,
+):
+    mock_result = MagicMock()
+    mock_result.mappings = MagicMock(return_value=[])
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    await contacts_repository.get_contacts(
+        skip=0,
+        limit=10,
+        first_name="User",
+        last_name=None,
+        email=None,
+        user_id=test_user.id,
+        fields=["id", "first_name", "phone"],
+    )
+
+    query = mock_session.execute.call_args[0][0]
+    assert [column.key for column in query.selected_columns] == [
+        "id",
+        "first_name",
+        "phone",
+    ]
+    # Filters still apply to columns that are not returned
+    assert "contacts.additional_data" not in str(query)
+    assert "first_name" in str(query.whereclause)
 
 
 @pytest.mark.asyncio
@@ -274,62 +431,61 @@ async def test_delete_contact(
 async def test_get_upcoming_birthdays(
     mock_session: AsyncSession, test_user: User, contacts_repository: ContactsRepository
 ):
-    # Create test contacts with upcoming birthdays
+    # Create test contact rows with upcoming birthdays
     today = datetime.now().date()
 
     expected_contacts = [
-        Contact(
-            id=1,
-            first_name="Today",
-            last_name="Birthday",
-            email="today@example.com",
-            phone="1234567890",
-            birthday=today,
-            user_id=test_user.id,
-        ),
-        Contact(
-            id=2,
-            first_name="Tomorrow",
-            last_name="Birthday",
-            email="tomorrow@example.com",
-            phone="0987654321",
-            birthday=today + timedelta(days=1),
-            user_id=test_user.id,
-        ),
-        Contact(
-            id=3,
-            first_name="NextWeek",
-            last_name="Birthday",
-            email="nextweek@example.com",
-            phone="5555555555",
-            birthday=today + timedelta(days=7),
-            user_id=test_user.id,
-        ),
+        {
+            "id": 1,
+            "first_name": "Today",
+            "last_name": "Birthday",
+            "email": "today@example.com",
+            "phone": "1234567890",
+            "birthday": today,
+            "additional_data": None,
+        },
+        {
+            "id": 2,
+            "first_name": "Tomorrow",
+            "last_name": "Birthday",
+            "email": "tomorrow@example.com",
+            "phone": "0987654321",
+            "birthday": today + timedelta(days=1),
+            "additional_data": None,
+        },
+        {
+            "id": 3,
+            "first_name": "NextWeek",
+            "last_name": "Birthday",
+            "email": "nextweek@example.com",
+            "phone": "5555555555",
+            "birthday": today + timedelta(days=7),
+            "additional_data": None,
+        },
     ]
 
     # Setup mock chain
-    mock_scalars = MagicMock()
-    mock_all = MagicMock(return_value=expected_contacts)
-    mock_scalars.all = mock_all
-
-    mock_result = AsyncMock()
-    mock_result.scalars = MagicMock(return_value=mock_scalars)
+    mock_result = MagicMock()
+    mock_result.mappings = MagicMock(return_value=expected_contacts)
 
     mock_session.execute = AsyncMock(return_value=mock_result)
 
     # Execute get_upcoming_birthdays
-    result = await contacts_repository.get_upcoming_birthdays()
+    result = await contacts_repository.get_upcoming_birthdays(test_user.id)
 
-    # Verify
+    # Verify the query is limited to the user's contacts
     mock_session.execute.assert_called_once()
+    query = mock_session.execute.call_args[0][0]
+    assert "contacts.user_id" in str(query)
+    assert "users" not in str(query)
 
     # Assertions on result
     assert len(result) == 3
-    assert result[0].first_name == "Today"
-    assert result[1].first_name == "Tomorrow"
-    assert result[2].first_name == "NextWeek"
+    assert result[0]["first_name"] == "Today"
+    assert result[1]["first_name"] == "Tomorrow"
+    assert result[2]["first_name"] == "NextWeek"
 
     # Check birthdays are within the expected range (today to today+7)
     for contact in result:
-        assert contact.birthday >= today
-        assert contact.birthday <= today + timedelta(days=7)
+        assert contact["birthday"] >= today
+        assert contact["birthday"] <= today + timedelta(days=7)
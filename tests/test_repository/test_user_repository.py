@@ -1,7 +1,8 @@
 import pytest
+from datetime import datetime
 from unittest.mock import AsyncMock, Mock
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.models.base import User
+from src.models.base import OutboxMessage, User
 from src.repository.user_repository import UserRepository
 
 
@@ -32,6 +33,21 @@ def user_repository(mock_session: AsyncSession):
     return UserRepository(mock_session)
 
 
+@pytest.mark.asyncio
+async def test_get_by_id(
+    mock_session: AsyncSession, test_user: User, user_repository: UserRepository
+):
+    # Setup mock
+    mock_session.get.return_value = test_user
+
+    # Execute
+    result = await user_repository.get_by_id(test_user.id)
+
+    # Verify
+    assert result is test_user
+    mock_session.get.assert_called_once_with(User, test_user.id)
+
+
 @pytest.mark.asyncio
 async def test_get_by_email(
     mock_session: AsyncSession, test_user: User, user_repository: UserRepository
@@ -118,7 +134,7 @@ async def test_create(mock_session: AsyncSession, user_repository: UserRepositor
     # Verify
     mock_session.add.assert_called_once()
     mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once()
+    mock_session.refresh.assert_not_called()
 
     # Since we're not mocking the User creation, we need to verify the data differently
     assert isinstance(result, User)
@@ -128,6 +144,28 @@ async def test_create(mock_session: AsyncSession, user_repository: UserRepositor
     assert result.verification_token == user_data["verification_token"]
 
 
+@pytest.mark.asyncio
+async def test_create_with_outbox_job(
+    mock_session: AsyncSession, user_repository: UserRepository
+):
+    user_data = {
+        "username": "new_user",
+        "email": "new@example.com",
+        "password": "hashed_password",
+        "verification_token": "new_token",
+    }
+
+    await user_repository.create(user_data, outbox_job="send_verification_email")
+
+    # User and outbox message are committed together
+    assert mock_session.add.call_count == 2
+    message = mock_session.add.call_args_list[1][0][0]
+    assert isinstance(message, OutboxMessage)
+    assert message.job == "send_verification_email"
+    assert message.payload == ["new@example.com", "new_user", "new_token"]
+    mock_session.commit.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_update(
     mock_session: AsyncSession, test_user: User, user_repository: UserRepository
@@ -155,4 +193,67 @@ async def test_update_avatar(
     # Verify
     assert result.avatar_url == new_avatar_url
     mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once_with(test_user)
+    mock_session.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_verify_email_token(
+    mock_session: AsyncSession, test_user: User, user_repository: UserRepository
+):
+    # Setup mock
+    mock_result = Mock()
+    mock_result.scalar_one_or_none.return_value = test_user
+    mock_session.execute.return_value = mock_result
+
+    # Execute
+    result = await user_repository.verify_email_token(test_user.verification_token)
+
+    # Verify: a single UPDATE ... RETURNING, no refresh
+    assert result is test_user
+    mock_session.execute.assert_called_once()
+    mock_session.commit.assert_called_once()
+    mock_session.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_set_reset_password_token_unknown_email(
+    mock_session: AsyncSession, user_repository: UserRepository
+):
+    # Setup mock
+    mock_result = Mock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_session.execute.return_value = mock_result
+
+    # Execute
+    result = await user_repository.set_reset_password_token(
+        "nonexistent@example.com",
+        "token",
+        datetime(2030, 1, 1),
+        outbox_job="send_password_reset_email",
+    )
+
+    # Verify: nothing is recorded for an unknown email
+    assert result is None
+    mock_session.execute.assert_called_once()
+    mock_session.add.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reset_password_by_token(
+    mock_session: AsyncSession, test_user: User, user_repository: UserRepository
+):
+    # Setup mock
+    mock_result = Mock()
+    mock_result.scalar_one_or_none.return_value = test_user
+    mock_session.execute.return_value = mock_result
+
+    # Execute
+    result = await user_repository.reset_password_by_token(
+        "reset_token", "new_hashed_password", datetime(2025, 1, 1)
+    )
+
+    # Verify
+    assert result is test_user
+    mock_session.execute.assert_called_once()
+    mock_session.commit.assert_called_once()
+    mock_session.refresh.assert_not_called()
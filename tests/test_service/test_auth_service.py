@@ -0,0 +1,43 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.base import UserRole
+from src.services.auth import AuthService
+from src.services.redis_service import RedisService
+
+
+@pytest.fixture
+def mock_session() -> AsyncSession:
+    session = AsyncMock(spec=AsyncSession)
+    session.add = MagicMock()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_from_cache_skips_db(mock_session: AsyncSession):
+    token = AuthService(mock_session).create_access_token("cached@example.com")
+    cached_user_info = {
+        "id": 7,
+        "username": "cached",
+        "role": UserRole.USER,
+        "email_verified": True,
+        "avatar_url": None,
+        "created_at": datetime(2025, 1, 1),
+    }
+    request = MagicMock()
+
+    with patch.object(
+        RedisService, "get", new=AsyncMock(return_value=cached_user_info)
+    ):
+        user = await AuthService.get_current_user(request, token, mock_session)
+
+    assert user.id == 7
+    assert user.email == "cached@example.com"
+    assert request.state.current_user is user
+    # The cached user is read-only and stays out of the session
+    mock_session.add.assert_not_called()
+    mock_session.execute.assert_not_called()
+    mock_session.refresh.assert_not_called()
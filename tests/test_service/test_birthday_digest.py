@@ -0,0 +1,166 @@
+import contextlib
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.conf.config import settings
+from src.database.instrumentation import assert_max_queries
+from src.models.base import Base, Contact, User
+from src.repository.contacts import ContactsRepository
+from src.services.birthday_digest import BirthdayDigestService
+from src.services.email_queue import EmailQueue
+from src.services.redis_service import RedisService
+
+TODAY = date(2025, 12, 28)
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'digest.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        for user_id in (1, 2):
+            session.add(
+                User(
+                    id=user_id,
+                    username=f"user{user_id}",
+                    email=f"user{user_id}@example.com",
+                    password="password",
+                )
+            )
+        birthdays = {
+            "Newyear": (1, date(1990, 1, 2)),
+            "Soon": (1, date(1985, 12, 30)),
+            "Later": (1, date(1990, 1, 10)),
+            "Past": (2, date(1990, 12, 1)),
+            "Today": (2, date(2000, 12, 28)),
+        }
+        for i, (name, (user_id, birthday)) in enumerate(birthdays.items()):
+            session.add(
+                Contact(
+                    first_name=name,
+                    last_name="Doe",
+                    email=f"contact{i}@example.com",
+                    phone="1234567890",
+                    birthday=birthday,
+                    user_id=user_id,
+                )
+            )
+        await session.commit()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(engine):
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def redis_client():
+    lock = MagicMock()
+    lock.acquire = AsyncMock(return_value=True)
+    lock.release = AsyncMock()
+    client = MagicMock()
+    client.lock.return_value = lock
+    client.exists = AsyncMock(return_value=0)
+    client.set = AsyncMock()
+    with patch.object(RedisService, "client", return_value=client):
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_across_new_year(session_maker):
+    async with session_maker() as session:
+        contacts = await ContactsRepository(session).get_upcoming_birthdays(
+            1, today=TODAY
+        )
+
+    assert sorted(contact["first_name"] for contact in contacts) == [
+        "Newyear",
+        "Soon",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_digests_are_grouped_by_user_in_one_query(engine, session_maker):
+    async with session_maker() as session:
+        with assert_max_queries(engine, 1):
+            digests = [
+                digest
+                async for digest in BirthdayDigestService.iter_digests(
+                    session, TODAY, 7
+                )
+            ]
+
+    assert digests == [
+        {
+            "user_id": 1,
+            "email": "user1@example.com",
+            "username": "user1",
+            "contacts": [
+                {"first_name": "Soon", "last_name": "Doe", "birthday": "1985-12-30"},
+                {"first_name": "Newyear", "last_name": "Doe", "birthday": "1990-01-02"},
+            ],
+        },
+        {
+            "user_id": 2,
+            "email": "user2@example.com",
+            "username": "user2",
+            "contacts": [
+                {"first_name": "Today", "last_name": "Doe", "birthday": "2000-12-28"},
+            ],
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_queues_digests_in_batches(session_maker, redis_client, monkeypatch):
+    monkeypatch.setattr(settings, "BIRTHDAY_DIGEST_BATCH_SIZE", 1)
+
+    @contextlib.asynccontextmanager
+    async def read_session():
+        async with session_maker() as session:
+            yield session
+
+    with patch(
+        "src.services.birthday_digest.sessionmanager.read_session", new=read_session
+    ), patch.object(EmailQueue, "enqueue_many", new=AsyncMock()) as enqueue_many:
+        queued = await BirthdayDigestService.run(today=TODAY)
+
+    assert queued == 2
+    batches = [call.args[0] for call in enqueue_many.await_args_list if call.args[0]]
+    assert [job[:3] for [job] in batches] == [
+        ("send_birthday_digest_email", "user1@example.com", "user1"),
+        ("send_birthday_digest_email", "user2@example.com", "user2"),
+    ]
+    keys = [key for call in enqueue_many.await_args_list for key in call.kwargs["keys"]]
+    assert keys == ["digest:2025-12-28:1", "digest:2025-12-28:2"]
+    redis_client.set.assert_awaited_once()
+    redis_client.lock.return_value.release.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_skips_when_locked(redis_client):
+    redis_client.lock.return_value.acquire.return_value = False
+
+    with patch.object(EmailQueue, "enqueue_many", new=AsyncMock()) as enqueue_many:
+        assert await BirthdayDigestService.run(today=TODAY) == 0
+
+    enqueue_many.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_skips_finished_day(redis_client):
+    redis_client.exists.return_value = 1
+
+    with patch.object(EmailQueue, "enqueue_many", new=AsyncMock()) as enqueue_many:
+        assert await BirthdayDigestService.run(today=TODAY) == 0
+
+    enqueue_many.assert_not_called()
+    redis_client.lock.return_value.release.assert_awaited_once()
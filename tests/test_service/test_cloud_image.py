@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.conf.config import settings
+from src.services.cloud_image import CloudImage
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor():
+    CloudImage.shutdown()
+    yield
+    CloudImage.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_upload_runs_off_the_event_loop(monkeypatch):
+    calls = []
+
+    def fake_upload(file, **options):
+        calls.append((threading.current_thread().name, options))
+        time.sleep(0.05)
+        return {"secure_url": "https://example.com/avatar.jpg"}
+
+    monkeypatch.setattr("cloudinary.uploader.upload", fake_upload)
+
+    # The loop keeps running other tasks while the upload blocks its thread
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    result = await CloudImage.upload(b"image", public_id="ContactsApp/1")
+    task.cancel()
+
+    assert result == {"secure_url": "https://example.com/avatar.jpg"}
+    assert ticks > 2
+    [(thread_name, options)] = calls
+    assert thread_name.startswith("cloudinary")
+    assert options == {
+        "public_id": "ContactsApp/1",
+        "timeout": settings.CLOUDINARY_TIMEOUT,
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_capped(monkeypatch):
+    monkeypatch.setattr(settings, "CLOUDINARY_MAX_CONCURRENCY", 2)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_destroy(public_id, **options):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return {"result": "ok"}
+
+    monkeypatch.setattr("cloudinary.uploader.destroy", fake_destroy)
+
+    results = await asyncio.gather(
+        *(CloudImage.delete(f"ContactsApp/{i}") for i in range(6))
+    )
+
+    assert results == [{"result": "ok"}] * 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_upload_times_out(monkeypatch):
+    monkeypatch.setattr(settings, "CLOUDINARY_TIMEOUT", 0.05)
+    monkeypatch.setattr(
+        "cloudinary.uploader.upload", lambda file, **options: time.sleep(0.5)
+    )
+
+    with pytest.raises(TimeoutError):
+        await CloudImage.upload(b"image")
@@ -9,6 +9,7 @@ from src.repository.contacts import ContactsRepository
 from src.models.base import Contact, User
 from src.schemas.contact import ContactCreate, ContactUpdate
 from src.exceptions.contact import ContactAlreadyExists
+from src.services.redis_service import RedisService
 
 
 @pytest.fixture
@@ -109,11 +110,83 @@ async def test_get_contacts(contacts_service: ContactsService, test_user: User)
 
     # Verify
     contacts_service.repository.get_contacts.assert_called_once_with(
-        0, 10, "Test", "User", "test", test_user.id
+        0, 10, "Test", "User", "test", test_user.id, None
     )
     assert result == expected_contacts
 
 
+@pytest.mark.asyncio
+async def test_count_contacts_unfiltered_reads_the_counter(
+    contacts_service: ContactsService, test_user: User
+) -> None:
+    contacts_service.repository.get_contacts_count.return_value = 42
+
+    result = await contacts_service.count_contacts(
+        None, None, None, test_user.id, estimate=True
+    )
+
+    assert result == (42, False)
+    contacts_service.repository.count_contacts.assert_not_called()
+    contacts_service.repository.estimate_contacts.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_count_contacts_filtered_is_cached(
+    contacts_service: ContactsService, test_user: User
+) -> None:
+    contacts_service.repository.count_contacts.return_value = 3
+    await RedisService.delete(
+        ContactsService.count_cache_key(test_user.id, "Jo", None, None, False)
+    )
+
+    first = await contacts_service.count_contacts("Jo", None, None, test_user.id)
+    second = await contacts_service.count_contacts("Jo", None, None, test_user.id)
+
+    assert first == second == (3, False)
+    contacts_service.repository.count_contacts.assert_awaited_once_with(
+        "Jo", None, None, test_user.id
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "estimate, expected",
+    [(None, (7, False)), (5, (7, False)), (2_000_000, (2_000_000, True))],
+)
+async def test_count_contacts_estimate_only_for_large_results(
+    contacts_service: ContactsService,
+    test_user: User,
+    estimate: int | None,
+    expected: tuple,
+) -> None:
+    contacts_service.repository.estimate_contacts.return_value = estimate
+    contacts_service.repository.count_contacts.return_value = 7
+    await RedisService.delete(
+        ContactsService.count_cache_key(test_user.id, None, None, "@", True)
+    )
+
+    result = await contacts_service.count_contacts(
+        None, None, "@", test_user.id, estimate=True
+    )
+
+    assert result == expected
+
+
+def test_parse_fields() -> None:
+    assert ContactsService.parse_fields(None) is None
+    # Response order, with the ID always included
+    assert ContactsService.parse_fields(" phone,first_name ,phone") == [
+        "id",
+        "first_name",
+        "phone",
+    ]
+
+    with pytest.raises(HTTPException) as exc_info:
+        ContactsService.parse_fields("first_name,password,user_id")
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Unknown contact fields: password, user_id"
+
+
 @pytest.mark.asyncio
 async def test_get_upcoming_birthdays(
     contacts_service: ContactsService, test_user: User
@@ -146,7 +219,9 @@ async def test_get_upcoming_birthdays(
     result = await contacts_service.get_upcoming_birthdays(test_user.id)
 
     # Verify
-    contacts_service.repository.get_upcoming_birthdays.assert_called_once()
+    contacts_service.repository.get_upcoming_birthdays.assert_called_once_with(
+        test_user.id
+    )
     assert result == expected_contacts
 
 
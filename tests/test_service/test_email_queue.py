@@ -0,0 +1,279 @@
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.conf.config import settings
+from src.services.email_queue import (
+    DEAD_LETTER_KEY,
+    HEARTBEAT_KEY,
+    PROCESSING_KEY,
+    QUEUE_KEY,
+    RETRY_KEY,
+    SENT_KEY_PREFIX,
+    WORKERS_KEY,
+    EmailQueue,
+)
+from src.services.redis_service import RedisService
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    client.rpush = AsyncMock()
+    client.zadd = AsyncMock()
+    client.blmove = AsyncMock()
+    client.lmove = AsyncMock()
+    client.lrem = AsyncMock()
+    client.exists = AsyncMock(return_value=0)
+    client.set = AsyncMock()
+    with patch.object(RedisService, "client", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def job() -> dict:
+    return {
+        "id": "job-1",
+        "job": "send_verification_email",
+        "args": ["test@example.com", "test_user", "token"],
+        "attempts": 0,
+        "enqueued_at": time.time(),
+    }
+
+
+@pytest.mark.asyncio
+async def test_enqueue(redis_client):
+    queued = await EmailQueue.enqueue(
+        "send_verification_email", "test@example.com", "test_user", "token"
+    )
+
+    assert queued is True
+    key, payload = redis_client.rpush.call_args[0]
+    assert key == QUEUE_KEY
+    job = json.loads(payload)
+    assert job["job"] == "send_verification_email"
+    assert job["args"] == ["test@example.com", "test_user", "token"]
+    assert job["attempts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_false_when_redis_is_down(redis_client):
+    redis_client.rpush.side_effect = ConnectionError("Redis is down")
+
+    queued = await EmailQueue.enqueue(
+        "send_password_reset_email", "test@example.com", "test_user", "token"
+    )
+
+    assert queued is False
+
+
+@pytest.mark.asyncio
+async def test_enqueue_unknown_job(redis_client):
+    with pytest.raises(ValueError):
+        await EmailQueue.enqueue("send_spam", "test@example.com", "test_user", "x")
+    redis_client.rpush.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_dequeue_moves_batch_to_processing_list(redis_client, job):
+    payloads = [json.dumps({**job, "id": f"job-{i}"}).encode() for i in range(3)]
+    redis_client.blmove.return_value = payloads[0]
+    redis_client.lmove.side_effect = [*payloads[1:], None]
+
+    assert await EmailQueue.dequeue("worker-1", timeout=1, max_jobs=10) == payloads
+
+    processing_key = PROCESSING_KEY.format(worker_id="worker-1")
+    redis_client.blmove.assert_awaited_once_with(
+        QUEUE_KEY, processing_key, 1, "LEFT", "RIGHT"
+    )
+    assert redis_client.lmove.await_count == 3
+    redis_client.lmove.assert_awaited_with(QUEUE_KEY, processing_key, "LEFT", "RIGHT")
+
+
+@pytest.mark.asyncio
+async def test_dequeue_timeout(redis_client):
+    redis_client.blmove.return_value = None
+
+    assert await EmailQueue.dequeue("worker-1", timeout=1, max_jobs=10) == []
+    redis_client.lmove.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_processed_job_leaves_processing_list(redis_client, job):
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock()
+    payload = json.dumps(job).encode()
+
+    assert await EmailQueue.process(payload, "worker-1", email_service) is True
+
+    redis_client.lrem.assert_awaited_once_with(
+        PROCESSING_KEY.format(worker_id="worker-1"), 1, payload
+    )
+
+
+@pytest.mark.asyncio
+async def test_rescheduled_job_leaves_processing_list(redis_client, job):
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock(
+        side_effect=ConnectionError("SMTP is down")
+    )
+    payload = json.dumps(job).encode()
+
+    assert await EmailQueue.process(payload, "worker-1", email_service) is False
+
+    redis_client.zadd.assert_awaited_once()
+    redis_client.lrem.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unscheduled_job_stays_in_processing_list(redis_client, job):
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock(
+        side_effect=ConnectionError("SMTP is down")
+    )
+    redis_client.zadd.side_effect = ConnectionError("Redis is down")
+
+    with pytest.raises(ConnectionError):
+        await EmailQueue.process(json.dumps(job).encode(), "worker-1", email_service)
+
+    redis_client.lrem.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_requeue_abandoned_jobs(redis_client):
+    redis_client.smembers = AsyncMock(return_value={b"dead", b"alive"})
+    redis_client.eval = AsyncMock(
+        side_effect=lambda script, n, heartbeat, *args: (
+            2 if heartbeat == HEARTBEAT_KEY.format(worker_id="dead") else -1
+        )
+    )
+
+    assert await EmailQueue.requeue_abandoned() == 2
+
+    calls = {call.args[2]: call.args[3:] for call in redis_client.eval.await_args_list}
+    assert calls[HEARTBEAT_KEY.format(worker_id="dead")] == (
+        PROCESSING_KEY.format(worker_id="dead"),
+        QUEUE_KEY,
+        WORKERS_KEY,
+        "dead",
+    )
+
+
+def test_retry_delay_doubles_up_to_limit(monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_RETRY_BASE_DELAY", 30)
+    monkeypatch.setattr(settings, "EMAIL_RETRY_MAX_DELAY", 100)
+
+    assert [EmailQueue.retry_delay(n) for n in range(1, 5)] == [30, 60, 100, 100]
+
+
+@pytest.mark.asyncio
+async def test_deliver_sends_email(redis_client, job):
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock()
+
+    assert await EmailQueue.deliver(job, email_service) is True
+
+    email_service.send_verification_email.assert_awaited_once_with(
+        "test@example.com", "test_user", "token"
+    )
+    redis_client.zadd.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_keyed_job_is_sent_once(redis_client, job):
+    sent = {}
+
+    async def set_key(key, value, ex=None):
+        sent[key] = value
+
+    redis_client.exists = AsyncMock(side_effect=lambda key: int(key in sent))
+    redis_client.set = AsyncMock(side_effect=set_key)
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock()
+    job["key"] = "outbox:1"
+
+    # A second copy of the job, as queued by a repeated relay
+    assert await EmailQueue.deliver(job, email_service) is True
+    assert await EmailQueue.deliver({**job, "id": "job-2"}, email_service) is True
+
+    email_service.send_verification_email.assert_awaited_once()
+    assert sent == {f"{SENT_KEY_PREFIX}outbox:1": "job-1"}
+
+
+@pytest.mark.asyncio
+async def test_failed_keyed_job_is_not_marked_sent(redis_client, job):
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock(
+        side_effect=ConnectionError("SMTP is down")
+    )
+    job["key"] = "outbox:1"
+
+    assert await EmailQueue.deliver(job, email_service) is False
+
+    redis_client.set.assert_not_called()
+    [payload] = redis_client.zadd.call_args[0][1]
+    assert json.loads(payload)["key"] == "outbox:1"
+
+
+@pytest.mark.asyncio
+async def test_sent_job_is_not_retried_when_marking_fails(redis_client, job):
+    redis_client.set.side_effect = ConnectionError("Redis is down")
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock()
+    job["key"] = "outbox:1"
+
+    assert await EmailQueue.deliver(job, email_service) is True
+
+    redis_client.zadd.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_is_retried_with_backoff(redis_client, job):
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock(
+        side_effect=ConnectionError("SMTP is down")
+    )
+
+    assert await EmailQueue.deliver(job, email_service) is False
+
+    key, mapping = redis_client.zadd.call_args[0]
+    assert key == RETRY_KEY
+    [(payload, due)] = mapping.items()
+    retried = json.loads(payload)
+    assert retried["attempts"] == 1
+    assert "SMTP is down" in retried["last_error"]
+    assert due == pytest.approx(time.time() + EmailQueue.retry_delay(1), abs=5)
+
+
+@pytest.mark.asyncio
+async def test_exhausted_job_is_dead_lettered(redis_client, job):
+    job["attempts"] = settings.EMAIL_MAX_ATTEMPTS - 1
+
+    retried = await EmailQueue.fail(job, ConnectionError("SMTP is down"))
+
+    assert retried is False
+    redis_client.zadd.assert_not_called()
+    key, payload = redis_client.rpush.call_args[0]
+    assert key == DEAD_LETTER_KEY
+    assert json.loads(payload)["attempts"] == settings.EMAIL_MAX_ATTEMPTS
+
+
+@pytest.mark.asyncio
+async def test_enqueue_many_uses_one_round_trip(redis_client):
+    await EmailQueue.enqueue_many(
+        [
+            ("send_birthday_digest_email", f"user{i}@example.com", f"user{i}", [])
+            for i in range(3)
+        ]
+    )
+
+    redis_client.rpush.assert_awaited_once()
+    key, *payloads = redis_client.rpush.call_args[0]
+    assert key == QUEUE_KEY
+    assert [json.loads(payload)["args"][0] for payload in payloads] == [
+        "user0@example.com",
+        "user1@example.com",
+        "user2@example.com",
+    ]
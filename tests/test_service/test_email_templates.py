@@ -0,0 +1,71 @@
+import pytest
+
+from src.conf.config import settings
+from src.services.email import EmailService
+from src.services.email_templates import EmailTemplates
+
+
+@pytest.fixture(autouse=True)
+def fresh_environment(monkeypatch):
+    monkeypatch.setattr(settings, "APP_BASE_URL", "https://contacts.example.com/")
+    monkeypatch.setattr(EmailTemplates, "_environment", None)
+
+
+def test_preload_compiles_all_templates():
+    assert EmailTemplates.preload() == 8
+
+
+def test_verification_links_use_base_url():
+    text, html = EmailTemplates.render(
+        "verification", username="test_user", token="abc123"
+    )
+
+    link = "https://contacts.example.com/api/auth/verify/abc123"
+    assert link in text
+    assert f'href="{link}"' in html
+    assert "Hi test_user," in text
+
+
+def test_html_variant_is_escaped():
+    text, html = EmailTemplates.render(
+        "password_reset", username="<script>alert(1)</script>", token="abc123"
+    )
+
+    assert "<script>" in text
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_birthday_digest():
+    contacts = [
+        {"first_name": "John", "last_name": "Doe", "birthday": "1990-05-01"},
+        {"first_name": "Jane", "last_name": "Smith", "birthday": "1985-05-03"},
+    ]
+
+    text, html = EmailTemplates.render(
+        "birthday_digest", username="test_user", contacts=contacts
+    )
+
+    assert "- John Doe: May 01\n- Jane Smith: May 03\n" in text
+    assert "<li>Jane Smith: May 03</li>" in html
+
+
+def test_rendered_message_has_both_variants():
+    message = EmailService.render_message(
+        "test@example.com",
+        "Verify your email",
+        "verification",
+        username="test_user",
+        token="abc123",
+    )
+
+    assert message["To"] == "test@example.com"
+    assert message.get_body(("plain",)).get_content().startswith("Hi test_user,")
+    assert "abc123" in message.get_body(("html",)).get_content()
+
+
+def test_message_without_sender_is_refused(monkeypatch):
+    monkeypatch.setattr(settings, "MAIL_FROM", "")
+
+    with pytest.raises(ValueError):
+        EmailService.build_message("test@example.com", "Hi", "Hi", "<p>Hi</p>")
@@ -0,0 +1,79 @@
+import contextlib
+import hashlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.conf.config import settings
+from src.models.base import Base, User
+from src.services.gravatar import GravatarService
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        session.add_all(
+            User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="hashed",
+                # Every third user has uploaded an avatar
+                avatar_url="https://example.com/own.webp" if i % 3 == 0 else None,
+            )
+            for i in range(10)
+        )
+        await session.commit()
+
+    @contextlib.asynccontextmanager
+    async def session():
+        async with session_maker() as db:
+            yield db
+
+    with patch("src.services.gravatar.sessionmanager.session", new=session):
+        yield session_maker
+    await engine.dispose()
+
+
+def test_url_is_derived_from_the_normalized_email():
+    digest = hashlib.md5(b"user@example.com").hexdigest()
+
+    url = GravatarService.url(" User@Example.com ")
+
+    assert url.startswith(f"https://www.gravatar.com/avatar/{digest}?")
+    assert f"size={settings.GRAVATAR_SIZE}" in url
+    assert f"default={settings.GRAVATAR_DEFAULT}" in url
+
+
+@pytest.mark.asyncio
+async def test_backfill_sets_missing_avatars_in_batches(session_maker):
+    client = MagicMock()
+    client.delete = AsyncMock()
+
+    with patch("src.services.gravatar.RedisService.client", return_value=client):
+        updated = await GravatarService.backfill(batch_size=4)
+
+    assert updated == 6
+    # Two batches of missing avatars, each followed by one cache invalidation
+    assert client.delete.await_count == 2
+    invalidated = [key for call in client.delete.await_args_list for key in call.args]
+    assert len(invalidated) == 6
+
+    async with session_maker() as session:
+        users = (await session.execute(select(User).order_by(User.id))).scalars()
+        for i, user in enumerate(users):
+            if i % 3 == 0:
+                assert user.avatar_url == "https://example.com/own.webp"
+            else:
+                assert user.avatar_url == GravatarService.url(user.email)
+                assert f"user:{user.email}" in invalidated
+
+    # Running it again finds nothing to do
+    with patch("src.services.gravatar.RedisService.client", return_value=client):
+        assert await GravatarService.backfill(batch_size=4) == 0
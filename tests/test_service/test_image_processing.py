@@ -0,0 +1,81 @@
+import hashlib
+import io
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, patch
+
+import pytest
+from PIL import Image
+
+from src.services.image_processing import ImageProcessor, make_thumbnails
+
+
+def encode(image: Image.Image, format: str, **params) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format, **params)
+    return output.getvalue()
+
+
+def test_thumbnails_are_square_webp_without_metadata():
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    # Orientation 6: the stored pixels must be rotated 90 degrees to display
+    exif[0x0112] = 6
+    source = encode(Image.new("RGB", (400, 100), "red"), "JPEG", exif=exif)
+
+    thumbnails = make_thumbnails(source, [64, 256], 80, 10_000_000)
+
+    assert sorted(thumbnails) == [64, 256]
+    for size, data in thumbnails.items():
+        with Image.open(io.BytesIO(data)) as thumbnail:
+            assert thumbnail.format == "WEBP"
+            assert thumbnail.size == (size, size)
+            assert not thumbnail.getexif()
+            assert "icc_profile" not in thumbnail.info
+
+
+def test_transparency_is_kept():
+    source = encode(Image.new("RGBA", (100, 100), (0, 0, 0, 0)), "PNG")
+
+    [data] = make_thumbnails(source, [64], 80, 10_000_000).values()
+
+    with Image.open(io.BytesIO(data)) as thumbnail:
+        assert thumbnail.mode == "RGBA"
+        assert thumbnail.getpixel((0, 0))[3] == 0
+
+
+def test_thumbnails_from_file_path(tmp_path):
+    path = tmp_path / "avatar.png"
+    path.write_bytes(encode(Image.new("RGB", (100, 100), "blue"), "PNG"))
+
+    [data] = make_thumbnails(str(path), [64], 80, 10_000_000).values()
+
+    with Image.open(io.BytesIO(data)) as thumbnail:
+        assert thumbnail.size == (64, 64)
+
+
+@pytest.mark.asyncio
+async def test_digest_rewinds_file():
+    file = io.BytesIO(b"image")
+
+    assert await ImageProcessor.digest(file) == hashlib.sha256(b"image").hexdigest()
+    assert file.tell() == 0
+
+
+def test_oversized_image_is_refused_before_decoding():
+    source = encode(Image.new("L", (2000, 2000)), "PNG")
+
+    with pytest.raises(Image.DecompressionBombError):
+        make_thumbnails(source, [64], 80, 1_000_000)
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_is_replaced():
+    broken = Mock()
+    broken.submit.side_effect = BrokenProcessPool("A worker died")
+
+    with patch.object(ImageProcessor, "_executor", broken):
+        with pytest.raises(BrokenProcessPool):
+            await ImageProcessor.thumbnails(io.BytesIO(b"image"))
+
+        assert ImageProcessor._executor is None
+        broken.shutdown.assert_called_once()
@@ -0,0 +1,47 @@
+import asyncio
+import io
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import UploadFile
+
+from src.conf.config import settings
+from src.services.image_upload import sniff_image_type, spool_image
+
+
+@pytest.mark.parametrize(
+    "header, mime_type",
+    [
+        (b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01", "image/jpeg"),
+        (b"\x89PNG\r\n\x1a\n\x00\x00\x00\r", "image/png"),
+        (b"GIF89a\x01\x00\x01\x00\x80\x00", "image/gif"),
+        (b"RIFF\x24\x00\x00\x00WEBPVP8 ", "image/webp"),
+        (b"RIFF\x24\x00\x00\x00WAVEfmt ", None),
+        (b"<svg xmlns='h", None),
+        (b"", None),
+    ],
+)
+def test_sniff_image_type(header: bytes, mime_type: str | None):
+    assert sniff_image_type(header) == mime_type
+
+
+@pytest.mark.asyncio
+async def test_spool_writes_past_memory_limit_in_a_thread(monkeypatch):
+    monkeypatch.setattr(settings, "AVATAR_UPLOAD_CHUNK_SIZE", 64)
+    monkeypatch.setattr(settings, "AVATAR_SPOOL_MAX_SIZE", 100)
+    content = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+    file = MagicMock(spec=UploadFile)
+    file.size = None
+    file.read = AsyncMock(side_effect=io.BytesIO(content).read)
+
+    with patch.object(asyncio, "to_thread", wraps=asyncio.to_thread) as to_thread:
+        spool, mime_type = await spool_image(file)
+
+    with spool:
+        assert spool.read() == content
+        # Image processing opens a file on disk by its path
+        with open(spool.name, "rb") as on_disk:
+            assert on_disk.read() == content
+    assert mime_type == "image/png"
+    # Only the first chunk fits in memory; the rest is written from a thread
+    assert to_thread.await_count == len(content) // 64
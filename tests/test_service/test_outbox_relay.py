@@ -0,0 +1,95 @@
+import contextlib
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.conf.config import settings
+from src.models.base import Base, OutboxMessage
+from src.services.email_queue import EmailQueue
+from src.services.outbox_relay import OutboxRelay
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        session.add_all(
+            OutboxMessage(
+                job="send_verification_email",
+                payload=[f"user{i}@example.com", f"user{i}", f"token{i}"],
+            )
+            for i in range(5)
+        )
+        await session.commit()
+
+    @contextlib.asynccontextmanager
+    async def session():
+        async with session_maker() as db:
+            yield db
+
+    with patch("src.services.outbox_relay.sessionmanager.session", new=session):
+        yield session_maker
+    await engine.dispose()
+
+
+async def pending_count(session_maker) -> int:
+    async with session_maker() as session:
+        result = await session.execute(
+            select(OutboxMessage).where(OutboxMessage.processed_at.is_(None))
+        )
+        return len(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_run_drains_outbox_in_batches(session_maker, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_BATCH_SIZE", 2)
+
+    with patch.object(EmailQueue, "enqueue_many", new=AsyncMock()) as enqueue_many:
+        relayed = await OutboxRelay.run()
+
+    assert relayed == 5
+    assert [len(call.args[0]) for call in enqueue_many.await_args_list] == [2, 2, 1]
+    assert enqueue_many.await_args_list[0].args[0][0] == (
+        "send_verification_email",
+        "user0@example.com",
+        "user0",
+        "token0",
+    )
+    # Each job is keyed by its outbox message, so a repeated relay is harmless
+    keys = [key for call in enqueue_many.await_args_list for key in call.kwargs["keys"]]
+    assert len(set(keys)) == 5
+    assert all(key.startswith("outbox:") for key in keys)
+    assert await pending_count(session_maker) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_enqueue_keeps_messages_pending(session_maker):
+    with patch.object(
+        EmailQueue,
+        "enqueue_many",
+        new=AsyncMock(side_effect=ConnectionError("Redis is down")),
+    ):
+        relayed = await OutboxRelay.run()
+
+    assert relayed == 0
+    assert await pending_count(session_maker) == 5
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_old_processed_messages(session_maker, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_RETENTION_DAYS", 7)
+    async with session_maker() as session:
+        messages = (await session.execute(select(OutboxMessage))).scalars().all()
+        messages[0].processed_at = datetime.now() - timedelta(days=30)
+        messages[1].processed_at = datetime.now()
+        await session.commit()
+
+    assert await OutboxRelay.purge() == 1
+    assert await pending_count(session_maker) == 3
@@ -0,0 +1,46 @@
+import pickle
+
+import pytest
+
+from src.conf.config import settings
+from src.services.redis_service import RedisService
+
+
+@pytest.fixture
+def contacts_payload() -> list[dict]:
+    return [
+        {
+            "id": i,
+            "first_name": f"John{i}",
+            "last_name": "Doe",
+            "email": f"john{i}@example.com",
+            "phone": "1234567890",
+            "birthday": "1990-01-01",
+            "additional_data": "Met at the conference",
+        }
+        for i in range(500)
+    ]
+
+
+def test_small_value_is_not_compressed():
+    data = RedisService._serialize({"id": 1, "username": "test_user"})
+
+    assert data[:1] == b"\x00"
+    assert RedisService._deserialize(data) == {"id": 1, "username": "test_user"}
+
+
+def test_large_value_is_compressed(contacts_payload: list[dict]):
+    raw = pickle.dumps(contacts_payload, protocol=pickle.HIGHEST_PROTOCOL)
+    assert len(raw) >= settings.REDIS_COMPRESSION_THRESHOLD
+
+    data = RedisService._serialize(contacts_payload)
+
+    assert data[:1] == b"\x01"
+    assert len(data) < len(raw)
+    assert RedisService._deserialize(data) == contacts_payload
+
+
+def test_legacy_value_without_header_is_readable():
+    legacy = pickle.dumps({"id": 1, "role": "USER"})
+
+    assert RedisService._deserialize(legacy) == {"id": 1, "role": "USER"}
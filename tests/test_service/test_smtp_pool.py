@@ -0,0 +1,107 @@
+import socket
+
+import aiosmtplib
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+from src.services.email import EmailService
+from src.services.smtp_pool import SMTPConnectionPool
+
+
+class CountingHandler(Sink):
+    def __init__(self):
+        self.messages = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = CountingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def make_pool(controller: Controller, **kwargs) -> SMTPConnectionPool:
+    return SMTPConnectionPool(
+        hostname=controller.hostname,
+        port=controller.port,
+        use_tls=False,
+        **kwargs,
+    )
+
+
+def make_messages(count: int) -> list:
+    return [
+        EmailService.build_message(f"user{i}@example.com", "Hello", "Hi", "<p>Hi</p>")
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_messages_reuse_one_connection(smtp_server):
+    controller, handler = smtp_server
+    pool = make_pool(controller)
+
+    for message in make_messages(5):
+        await pool.send(message)
+    await pool.close()
+
+    assert handler.messages == 5
+    assert pool.connections_opened == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_is_replaced_after_message_limit(smtp_server):
+    controller, handler = smtp_server
+    pool = make_pool(controller, max_messages_per_connection=2)
+
+    await EmailService(pool).send_messages(make_messages(5))
+    await pool.close()
+
+    assert handler.messages == 5
+    assert pool.connections_opened == 3
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_server_drops_connection(smtp_server):
+    controller, handler = smtp_server
+    pool = make_pool(controller)
+    await pool.send(make_messages(1)[0])
+
+    # Simulate the server timing out the idle session
+    async with pool.connection() as connection:
+        connection.client.transport.close()
+    await pool.send(make_messages(1)[0])
+    await pool.close()
+
+    assert handler.messages == 2
+    assert pool.connections_opened == 2
+
+
+@pytest.mark.asyncio
+async def test_send_is_retried_on_fresh_connection(smtp_server, monkeypatch):
+    controller, handler = smtp_server
+    pool = make_pool(controller)
+    await pool.send(make_messages(1)[0])
+    async with pool.connection() as connection:
+        stale_client = connection.client
+
+    async def disconnected(*args, **kwargs):
+        raise aiosmtplib.SMTPServerDisconnected("Server not connected")
+
+    # The server dropped the session without the client noticing yet
+    monkeypatch.setattr(stale_client, "send_message", disconnected)
+    await pool.send(make_messages(1)[0])
+    await pool.close()
+
+    assert handler.messages == 2
+    assert pool.connections_opened == 2
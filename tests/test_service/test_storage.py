@@ -0,0 +1,53 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.conf.config import settings
+from src.services.cloud_image import CloudImage
+from src.services.storage import CloudinaryStorage, LocalStorage, get_storage
+
+NAME = f"{'ab' * 32}_64.webp"
+
+
+@pytest.mark.asyncio
+async def test_local_storage_save_and_delete(tmp_path):
+    storage = LocalStorage(tmp_path / "avatars")
+
+    url = await storage.save(NAME, b"webp data")
+
+    assert url == f"{settings.APP_BASE_URL}/api/avatars/{NAME}"
+    assert (tmp_path / "avatars" / NAME).read_bytes() == b"webp data"
+    # Only the finished file is left behind
+    assert [path.name for path in (tmp_path / "avatars").iterdir()] == [NAME]
+
+    await storage.delete(NAME)
+    await storage.delete(NAME)
+    assert not (tmp_path / "avatars" / NAME).exists()
+
+
+@pytest.mark.parametrize("name", ["../secret.webp", "avatar.webp", NAME + ".exe"])
+def test_local_storage_rejects_other_names(tmp_path, name: str):
+    with pytest.raises(ValueError):
+        LocalStorage(tmp_path).path(name)
+
+
+@pytest.mark.asyncio
+async def test_cloudinary_storage_uses_avatar_public_ids():
+    upload = AsyncMock(return_value={"secure_url": "https://cdn.example.com/a.webp"})
+    with patch.object(CloudImage, "upload", new=upload):
+        url = await CloudinaryStorage().save(NAME, b"webp data")
+
+    assert url == "https://cdn.example.com/a.webp"
+    upload.assert_awaited_once_with(
+        b"webp data", public_id=f"ContactsApp/avatars/{'ab' * 32}_64"
+    )
+
+
+def test_unknown_backend_is_rejected(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "AVATAR_STORAGE_BACKEND", "ftp")
+    get_storage.cache_clear()
+    try:
+        with pytest.raises(ValueError):
+            get_storage()
+    finally:
+        get_storage.cache_clear()
@@ -1,16 +1,43 @@
+import io
+import itertools
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import UploadFile, HTTPException
+from PIL import Image
 
 from src.services.user import UserService
 from src.repository.user_repository import UserRepository
 from src.models.base import User, UserRole
 from src.services.cloud_image import CloudImage
+from src.conf.config import settings
+
+PNG_CONTENT = b"\x89PNG\r\n\x1a\n" + b"fake image content"
+
+# Every generated image gets its own color, so no two tests share a digest
+_colors = itertools.count(1)
+
+
+def make_png(size: tuple[int, int] = (300, 200)) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", size, (next(_colors), 100, 150)).save(output, "PNG")
+    return output.getvalue()
+
+
+def make_upload(content: bytes, content_type: str = "image/png") -> MagicMock:
+    file = MagicMock(spec=UploadFile)
+    file.filename = "avatar.png"
+    file.content_type = content_type
+    file.size = None
+    file.read = AsyncMock(side_effect=io.BytesIO(content).read)
+    return file
 
 
 @pytest.fixture
-def mock_repository() -> AsyncMock:
-    return AsyncMock(spec=UserRepository)
+def mock_repository(test_user: User) -> AsyncMock:
+    repository = AsyncMock(spec=UserRepository)
+    repository.get_by_id.return_value = test_user
+    return repository
 
 
 @pytest.fixture
@@ -34,11 +61,7 @@ def test_user() -> User:
 
 @pytest.fixture
 def mock_image_file() -> MagicMock:
-    file = MagicMock(spec=UploadFile)
-    file.filename = "avatar.jpg"
-    file.content_type = "image/jpeg"
-    file.read = AsyncMock(return_value=b"fake image content")
-    return file
+    return make_upload(make_png())
 
 
 @pytest.mark.asyncio
@@ -47,11 +70,16 @@ async def test_update_avatar_success(
 ) -> None:
     # Setup
     new_avatar_url: str = "http://example.com/new_avatar.jpg"
+    mock_image_file.read.side_effect = io.BytesIO(make_png((640, 480))).read
+
+    uploaded = {}
+
+    async def upload(file, public_id=None):
+        uploaded[public_id] = file
+        return {"secure_url": f"http://example.com/{public_id}.webp"}
 
     # Mock CloudImage.upload
-    with patch.object(
-        CloudImage, "upload", new=AsyncMock(return_value={"secure_url": new_avatar_url})
-    ):
+    with patch.object(CloudImage, "upload", new=AsyncMock(side_effect=upload)):
         # Mock repository update_avatar
         updated_user: User = User(
             id=test_user.id,
@@ -65,15 +93,140 @@ async def test_update_avatar_success(
         # Execute
         result: User = await user_service.update_avatar(test_user, mock_image_file)
 
-        # Verify
-        mock_image_file.read.assert_called_once()
+        # Verify: one square WebP thumbnail per size, the largest becomes
+        # the avatar
+        [(small_id, small), (large_id, large)] = sorted(
+            uploaded.items(), key=lambda item: len(item[1])
+        )
+        assert small_id.startswith("ContactsApp/avatars/")
+        assert small_id.endswith("_64")
+        assert large_id.endswith("_256")
+        for data, size in ((small, 64), (large, 256)):
+            with Image.open(io.BytesIO(data)) as thumbnail:
+                assert thumbnail.format == "WEBP"
+                assert thumbnail.size == (size, size)
         user_service.repository.update_avatar.assert_called_once_with(
-            test_user, new_avatar_url
+            test_user, f"http://example.com/{large_id}.webp"
         )
         assert result == updated_user
         assert result.avatar_url == new_avatar_url
 
 
+@pytest.mark.asyncio
+async def test_same_avatar_is_not_processed_twice(
+    user_service: UserService, test_user: User
+) -> None:
+    content = make_png()
+    upload = AsyncMock(return_value={"secure_url": "http://example.com/a.webp"})
+
+    with patch.object(CloudImage, "upload", new=upload):
+        await user_service.update_avatar(test_user, make_upload(content))
+        assert upload.await_count == 2
+
+        with patch(
+            "src.services.user.ImageProcessor.thumbnails", new=AsyncMock()
+        ) as thumbnails:
+            await user_service.update_avatar(test_user, make_upload(content))
+
+    thumbnails.assert_not_called()
+    assert upload.await_count == 2
+    user_service.repository.update_avatar.assert_called_with(
+        test_user, "http://example.com/a.webp"
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_avatar_undecodable_image(
+    user_service: UserService, test_user: User
+) -> None:
+    # Valid PNG signature, corrupt content
+    file = make_upload(make_png()[:40])
+
+    with patch.object(CloudImage, "upload", new=AsyncMock()) as upload:
+        with pytest.raises(HTTPException) as exc_info:
+            await user_service.update_avatar(test_user, file)
+
+    assert exc_info.value.status_code == 400
+    upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_avatar_truncated_image(
+    user_service: UserService, test_user: User
+) -> None:
+    output = io.BytesIO()
+    Image.effect_noise((300, 200), 64).save(output, "JPEG")
+    # Header and part of the scan data: Pillow fails with "image file is truncated"
+    file = make_upload(output.getvalue()[:2000], "image/jpeg")
+
+    with patch.object(CloudImage, "upload", new=AsyncMock()) as upload:
+        with pytest.raises(HTTPException) as exc_info:
+            await user_service.update_avatar(test_user, file)
+
+    assert exc_info.value.status_code == 400
+    upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_avatar_upload_timeout(
+    user_service: UserService, test_user: User, mock_image_file: MagicMock
+) -> None:
+    with patch.object(CloudImage, "upload", new=AsyncMock(side_effect=TimeoutError)):
+        with pytest.raises(HTTPException) as exc_info:
+            await user_service.update_avatar(test_user, mock_image_file)
+
+    assert exc_info.value.status_code == 504
+    user_service.repository.update_avatar.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_avatar_too_large(
+    user_service: UserService, test_user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "AVATAR_MAX_BYTES", 100)
+    monkeypatch.setattr(settings, "AVATAR_UPLOAD_CHUNK_SIZE", 16)
+    file = make_upload(PNG_CONTENT + b"\0" * 1000)
+
+    with patch.object(CloudImage, "upload", new=AsyncMock()) as upload:
+        with pytest.raises(HTTPException) as exc_info:
+            await user_service.update_avatar(test_user, file)
+
+    assert exc_info.value.status_code == 413
+    # Reading stopped at the first chunk past the limit
+    assert file.read.await_count == 7
+    upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_avatar_declared_size_too_large(
+    user_service: UserService, test_user: User
+) -> None:
+    file = make_upload(PNG_CONTENT)
+    file.size = settings.AVATAR_MAX_BYTES + 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        await user_service.update_avatar(test_user, file)
+
+    assert exc_info.value.status_code == 413
+    file.read.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_avatar_content_is_not_an_image(
+    user_service: UserService, test_user: User
+) -> None:
+    # The content type claims an image, the bytes say otherwise
+    file = make_upload(b"%PDF-1.7 not an image at all", content_type="image/png")
+
+    with patch.object(CloudImage, "upload", new=AsyncMock()) as upload:
+        with pytest.raises(HTTPException) as exc_info:
+            await user_service.update_avatar(test_user, file)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "File must be an image"
+    upload.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_update_avatar_invalid_file_type(
     user_service: UserService, test_user: User
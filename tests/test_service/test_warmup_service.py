@@ -0,0 +1,56 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+
+from src.conf.config import settings
+from src.services.redis_service import RedisService
+from src.services.warmup import WarmupService
+
+
+@pytest.fixture
+def warmup_steps():
+    with patch.object(
+        WarmupService, "open_db_connections", new=AsyncMock()
+    ) as open_db_connections, patch.object(
+        WarmupService, "ping_redis", new=AsyncMock()
+    ) as ping_redis, patch.object(
+        WarmupService, "compile_statements", new=AsyncMock()
+    ) as compile_statements:
+        yield open_db_connections, ping_redis, compile_statements
+
+
+@pytest.mark.asyncio
+async def test_run_runs_every_step(warmup_steps) -> None:
+    app = FastAPI()
+
+    await WarmupService.run(app)
+
+    assert app.openapi_schema is not None
+    for step in warmup_steps:
+        step.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_continues_after_failed_step(warmup_steps) -> None:
+    open_db_connections, ping_redis, compile_statements = warmup_steps
+    ping_redis.side_effect = ConnectionError("Redis is down")
+    app = FastAPI()
+
+    await WarmupService.run(app)
+
+    compile_statements.assert_awaited_once()
+    assert app.openapi_schema is not None
+
+
+@pytest.mark.asyncio
+async def test_ping_redis_times_out(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "HEALTH_CHECK_TIMEOUT", 0.01)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    with patch.object(RedisService, "ping", new=hang):
+        with pytest.raises(TimeoutError):
+            await WarmupService.ping_redis()